@@ -0,0 +1,28 @@
+"""Add data_version to tenants
+
+Revision ID: a8c3e6f1d2b9
+Revises: f3a7d1b6c084
+Create Date: 2026-10-17 00:04:51.902446
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c3e6f1d2b9'
+down_revision: Union[str, Sequence[str], None] = 'f3a7d1b6c084'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tenants', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tenants', 'data_version')
@@ -0,0 +1,30 @@
+"""Add updated_at to tasks
+
+Revision ID: b4f9d2e7a6c1
+Revises: a8c3e6f1d2b9
+Create Date: 2026-10-17 01:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f9d2e7a6c1'
+down_revision: Union[str, Sequence[str], None] = 'a8c3e6f1d2b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() is evaluated once for the whole statement, so on Postgres 11+ existing rows
+    # take it without a table rewrite, unlike backfilling from created_at
+    op.add_column('tasks', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'updated_at')
@@ -0,0 +1,45 @@
+"""Add tenant, project and assignee access path indexes
+
+Revision ID: c7d1e4a8b2f6
+Revises: 9b3e5f1a7c24
+Create Date: 2026-10-16 21:52:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d1e4a8b2f6'
+down_revision: Union[str, Sequence[str], None] = '9b3e5f1a7c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_tasks_project_id_created_at_id', 'tasks', ['project_id', 'created_at', 'id']),
+    ('ix_tasks_assignee_id', 'tasks', ['assignee_id']),
+    ('ix_projects_tenant_id_created_at_id', 'projects', ['tenant_id', 'created_at', 'id']),
+    ('ix_users_tenant_id', 'users', ['tenant_id']),
+    ('ix_project_users_user_id', 'project_users', ['user_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; it avoids
+    # locking out writes on large tables while the index builds.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+"""Add tasks_version to projects
+
+Revision ID: d6a1f8c3b7e2
+Revises: b4f9d2e7a6c1
+Create Date: 2026-10-17 09:41:18.604317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a1f8c3b7e2'
+down_revision: Union[str, Sequence[str], None] = 'b4f9d2e7a6c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('tasks_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'tasks_version')
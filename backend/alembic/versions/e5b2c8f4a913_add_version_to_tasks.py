@@ -0,0 +1,29 @@
+"""Add version to tasks
+
+Revision ID: e5b2c8f4a913
+Revises: c7d1e4a8b2f6
+Create Date: 2026-10-16 23:20:04.276811
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2c8f4a913'
+down_revision: Union[str, Sequence[str], None] = 'c7d1e4a8b2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant server default is a metadata-only change on Postgres 11+, so no table rewrite
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'version')
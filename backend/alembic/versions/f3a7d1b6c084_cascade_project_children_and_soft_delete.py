@@ -0,0 +1,56 @@
+"""Cascade project deletes to tasks and members; add projects.deleted_at
+
+Revision ID: f3a7d1b6c084
+Revises: e5b2c8f4a913
+Create Date: 2026-10-16 23:41:18.530127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7d1b6c084'
+down_revision: Union[str, Sequence[str], None] = 'e5b2c8f4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, constraint) pairs whose project_id foreign key gains ON DELETE CASCADE.
+# project_users was created with it, but databases built from the models were not.
+PROJECT_FOREIGN_KEYS = (
+    ('tasks', 'tasks_project_id_fkey'),
+    ('project_users', 'project_users_project_id_fkey'),
+)
+
+
+def _replace_foreign_key(table: str, name: str, on_delete: str) -> None:
+    # NOT VALID swaps the constraint without scanning the table under an exclusive lock;
+    # VALIDATE then checks existing rows while only blocking schema changes
+    op.execute(
+        f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}, "
+        f"ADD CONSTRAINT {name} FOREIGN KEY (project_id) REFERENCES projects (id) {on_delete} NOT VALID"
+    )
+    op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, name in PROJECT_FOREIGN_KEYS:
+        _replace_foreign_key(table, name, "ON DELETE CASCADE")
+    op.add_column('projects', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_deleted_at', 'projects', ['deleted_at'], unique=False,
+            postgresql_where=sa.text('deleted_at IS NOT NULL'), postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_projects_deleted_at', table_name='projects', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('projects', 'deleted_at')
+    # Only tasks lacked the cascade before this revision
+    _replace_foreign_key('tasks', 'tasks_project_id_fkey', "")
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import logging
+import tempfile
+from typing import IO, Iterator, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from domain.entities import User
+from .dependencies import get_bulk_provision_users_use_case_factory
+from .security import get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+CSV_MEDIA_TYPE = "text/csv"
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+# Uploads are spooled to disk past this size instead of being held in memory
+IMPORT_SPOOL_MAX_MEMORY = 1024 * 1024
+
+def _iter_csv_rows(upload: IO[bytes]) -> Iterator[Tuple[int, Optional[dict]]]:
+    reader = csv.DictReader(io.TextIOWrapper(upload, encoding="utf-8-sig", newline=""))
+    for row_number, row in enumerate(reader, start=1):
+        # Blank cells fall back to the column's default rather than failing validation
+        yield row_number, {key: value for key, value in row.items() if key and value}
+
+def _iter_ndjson_rows(upload: IO[bytes]) -> Iterator[Tuple[int, Optional[dict]]]:
+    row_number = 0
+    for line in upload:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield row_number, data if isinstance(data, dict) else None
+
+@router.post("/admin/users/import")
+async def import_users(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    use_case_factory=Depends(get_bulk_provision_users_use_case_factory)
+):
+    """
+    Provision users in the caller's tenant from a CSV (with a header row) or
+    NDJSON upload. Responds with one NDJSON result line per input row.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == CSV_MEDIA_TYPE:
+        iter_rows = _iter_csv_rows
+    elif content_type in NDJSON_MEDIA_TYPES:
+        iter_rows = _iter_ndjson_rows
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload must be text/csv or application/x-ndjson"
+        )
+
+    # The body has to be drained before the response starts streaming, so it is
+    # spooled rather than buffered whole; rows are parsed lazily as batches are written.
+    upload = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY, mode="w+b")
+    async for chunk in request.stream():
+        upload.write(chunk)
+    upload.seek(0)
+
+    tenant_id = current_user.tenant_id
+    logger.info(f"User import started by {current_user.email} for tenant {tenant_id}")
+
+    async def results():
+        try:
+            async with use_case_factory() as use_case:
+                async for result in use_case.execute(iter_rows(upload), tenant_id):
+                    yield json.dumps(result) + "\n"
+        except Exception as e:
+            # The status line is already sent, so the failure is reported in the stream.
+            # Rows reported before this line were committed.
+            logger.error(f"User import for tenant {tenant_id} aborted: {str(e)}", exc_info=True)
+            yield json.dumps({"status": "aborted", "error": "Import aborted; later rows were not processed"}) + "\n"
+        finally:
+            upload.close()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
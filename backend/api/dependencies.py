@@ -1,22 +1,177 @@
-from fastapi import Depends
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from fastapi import Depends, Request
+from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from infrastructure.database import get_db
+from core.cache import project_access_cache
+from core.config import settings
+from core.single_flight import SingleFlight
+from infrastructure.database import get_db, get_session_factory, ReadSessionLocal
 from infrastructure.repositories import (
     UserRepositoryImpl, TenantRepositoryImpl, ProjectRepositoryImpl, TaskRepositoryImpl
 )
 from infrastructure.project_user_repository import ProjectUserRepositoryImpl
+from infrastructure.unit_of_work import SqlAlchemyUnitOfWork
+from infrastructure.token_repository import TokenRevocationRepositoryImpl, RefreshTokenRepositoryImpl
 from domain.repositories import (
-    UserRepository, TenantRepository, ProjectRepository, TaskRepository, ProjectUserRepository
+    UserRepository, TenantRepository, ProjectRepository, TaskRepository, ProjectUserRepository,
+    TokenRevocationRepository, RefreshTokenRepository, UnitOfWork
+)
+from application.services import (
+    AsyncPasswordService, TokenRevocationFilter, LoginThrottle, ProjectPurgeWorker, TenantDirectory
+)
+from core.rate_limit import BucketPolicy, InMemoryRateLimitBackend, RateLimitBackend
+from core.primary_pins import InMemoryPrimaryPinStore, PrimaryPinStore
+from application.use_cases.user_management import (
+    RegisterUserUseCase, AuthenticateUserUseCase, ChangeUserRoleUseCase, BulkProvisionUsersUseCase
+)
+from application.use_cases.token_management import (
+    RevokeAccessTokenUseCase, RevokeUserTokensUseCase, IssueRefreshTokenUseCase,
+    RefreshAccessTokenUseCase, RevokeRefreshTokenUseCase
 )
-from application.use_cases.user_management import RegisterUserUseCase, AuthenticateUserUseCase
 from application.use_cases.project_management import (
-    CreateProjectUseCase, GetProjectsByTenantUseCase, GetProjectByIdUseCase, 
-    UpdateProjectUseCase, DeleteProjectUseCase, CreateTaskUseCase, 
-    GetTasksByProjectUseCase, UpdateTaskUseCase, DeleteTaskUseCase
+    CreateProjectUseCase, GetProjectsByTenantUseCase, GetProjectByIdUseCase, PurgeDeletedProjectsUseCase,
+    CheckProjectAccessUseCase,
+    UpdateProjectUseCase, DeleteProjectUseCase, CreateTaskUseCase, BulkCreateTasksUseCase,
+    BatchUpdateTasksUseCase, GetTasksByProjectUseCase, UpdateTaskUseCase, DeleteTaskUseCase
 )
 from application.use_cases.project_user_management import GetProjectUsersUseCase
 
+password_service = AsyncPasswordService(
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    rounds=settings.BCRYPT_ROUNDS or AsyncPasswordService.DEFAULT_ROUNDS,
+    # One floor for every worker; calibration only raises the cost of new hashes
+    rehash_below=settings.BCRYPT_ROUNDS or settings.BCRYPT_MIN_ROUNDS
+)
+
+import_password_service = AsyncPasswordService(
+    max_concurrency=settings.USER_IMPORT_HASH_WORKERS,
+    max_queue=settings.USER_IMPORT_BATCH_SIZE,
+    rounds=password_service.rounds,
+    # Concurrent imports share the pool; a batch waits for capacity instead of failing mid-stream
+    wait_when_busy=True
+)
+
+revocation_filter = TokenRevocationFilter(refresh_interval=settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+
+# Identical project and task listings running at the same time share one set of queries
+list_read_flights = SingleFlight()
+
+tenant_directory = TenantDirectory(refresh_interval=settings.TENANT_DIRECTORY_REFRESH_SECONDS)
+
+async def load_tenant_directory() -> None:
+    """Fill the tenant directory at startup, so the first requests already resolve from memory."""
+    async with get_session_factory()() as session:
+        await tenant_directory.refresh(TenantRepositoryImpl(session))
+
+def _build_rate_limit_backend() -> RateLimitBackend:
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "redis":
+        from infrastructure.redis_rate_limit import RedisRateLimitBackend
+        return RedisRateLimitBackend(settings.LOGIN_RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+login_throttle = LoginThrottle(
+    backend=_build_rate_limit_backend(),
+    ip_policy=BucketPolicy(settings.LOGIN_RATE_LIMIT_IP_BURST, settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE / 60),
+    email_policy=BucketPolicy(settings.LOGIN_RATE_LIMIT_EMAIL_BURST, settings.LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE / 60),
+    tenant_policy=BucketPolicy(settings.LOGIN_RATE_LIMIT_TENANT_BURST, settings.LOGIN_RATE_LIMIT_TENANT_PER_MINUTE / 60),
+    enabled=settings.LOGIN_RATE_LIMIT_ENABLED
+)
+
+@asynccontextmanager
+async def _purge_deleted_projects_use_case():
+    async with get_session_factory()() as session:
+        yield PurgeDeletedProjectsUseCase(
+            ProjectRepositoryImpl(session), SqlAlchemyUnitOfWork(session), settings.PROJECT_PURGE_BATCH_SIZE
+        )
+
+project_purge_worker = ProjectPurgeWorker(
+    _purge_deleted_projects_use_case,
+    batch_pause=settings.PROJECT_PURGE_BATCH_PAUSE_SECONDS,
+    idle_interval=settings.PROJECT_PURGE_IDLE_SECONDS
+)
+
+def get_password_service() -> AsyncPasswordService:
+    return password_service
+
+def get_import_password_service() -> AsyncPasswordService:
+    return import_password_service
+
+def get_revocation_filter() -> TokenRevocationFilter:
+    return revocation_filter
+
+def get_tenant_directory() -> TenantDirectory:
+    return tenant_directory
+
+def get_login_throttle() -> LoginThrottle:
+    return login_throttle
+
+# Read-your-writes: a successful write pins the writer's reads to the primary
+# for READ_YOUR_WRITES_SECONDS, long enough for the replica to catch up. Pins
+# are kept on the server, keyed by the tenant and subject in the bearer token,
+# so they do not depend on the client storing cookies. Other users of the
+# tenant keep reading from the replica.
+def _build_primary_pin_store() -> PrimaryPinStore:
+    if settings.READ_YOUR_WRITES_BACKEND == "redis":
+        from infrastructure.redis_primary_pins import RedisPrimaryPinStore
+        return RedisPrimaryPinStore(settings.READ_YOUR_WRITES_REDIS_URL)
+    return InMemoryPrimaryPinStore()
+
+primary_pins = _build_primary_pin_store()
+
+def read_replica_enabled() -> bool:
+    return ReadSessionLocal is not None
+
+def _pin_key(request: Request) -> str | None:
+    # Routing only: the signature is checked by get_current_user, and a write
+    # that reaches pin_to_primary has already been authenticated.
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except JWTError:
+        return None
+    tenant_id, subject = claims.get("tenant_id"), claims.get("sub")
+    return f"user:{tenant_id}:{subject}" if tenant_id and subject else None
+
+async def pin_to_primary(request: Request) -> None:
+    key = _pin_key(request)
+    if key:
+        await primary_pins.pin(key, settings.READ_YOUR_WRITES_SECONDS)
+
+async def is_pinned_to_primary(request: Request) -> bool:
+    key = _pin_key(request)
+    return key is not None and await primary_pins.is_pinned(key)
+
+async def get_read_db(request: Request, primary: AsyncSession = Depends(get_db)):
+    """Session for read-only use cases: the replica unless the caller is pinned to the primary."""
+    if not read_replica_enabled() or await is_pinned_to_primary(request):
+        yield primary
+        return
+    async with ReadSessionLocal() as session:
+        yield session
+
+async def get_read_session_factory(request: Request, primary_factory=Depends(get_session_factory)):
+    """Session factory for reads that outlive the request: the replica unless the caller is pinned."""
+    if not read_replica_enabled() or await is_pinned_to_primary(request):
+        return primary_factory
+    return ReadSessionLocal
+
+def _repository_opener(session_factory, repository_class):
+    """Opens a repository on a session of its own for each use, closed when the use ends."""
+    @asynccontextmanager
+    async def open_repository():
+        async with session_factory() as session:
+            yield repository_class(session)
+    return open_repository
+
+def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(db)
+
 def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserRepository:
     return UserRepositoryImpl(db)
 
@@ -32,28 +187,110 @@ def get_task_repository(db: AsyncSession = Depends(get_db)) -> TaskRepository:
 def get_project_user_repository(db: AsyncSession = Depends(get_db)) -> ProjectUserRepository:
     return ProjectUserRepositoryImpl(db)
 
+def get_read_project_repository(db: AsyncSession = Depends(get_read_db)) -> ProjectRepository:
+    return ProjectRepositoryImpl(db)
+
+def get_read_task_repository(db: AsyncSession = Depends(get_read_db)) -> TaskRepository:
+    return TaskRepositoryImpl(db)
+
+def get_read_project_user_repository(db: AsyncSession = Depends(get_read_db)) -> ProjectUserRepository:
+    return ProjectUserRepositoryImpl(db)
+
+def get_token_revocation_repository(db: AsyncSession = Depends(get_db)) -> TokenRevocationRepository:
+    return TokenRevocationRepositoryImpl(db)
+
+def get_refresh_token_repository(db: AsyncSession = Depends(get_db)) -> RefreshTokenRepository:
+    return RefreshTokenRepositoryImpl(db)
+
 def get_register_user_use_case(
     user_repo: UserRepository = Depends(get_user_repository),
-    tenant_repo: TenantRepository = Depends(get_tenant_repository)
+    password_service: AsyncPasswordService = Depends(get_password_service),
+    tenant_repo: TenantRepository = Depends(get_tenant_repository),
+    directory: TenantDirectory = Depends(get_tenant_directory)
 ) -> RegisterUserUseCase:
-    return RegisterUserUseCase(user_repo, tenant_repo)
+    return RegisterUserUseCase(user_repo, password_service, tenant_repo, directory)
 
 def get_authenticate_user_use_case(
-    user_repo: UserRepository = Depends(get_user_repository)
+    user_repo: UserRepository = Depends(get_user_repository),
+    password_service: AsyncPasswordService = Depends(get_password_service),
+    throttle: LoginThrottle = Depends(get_login_throttle)
 ) -> AuthenticateUserUseCase:
-    return AuthenticateUserUseCase(user_repo)
+    return AuthenticateUserUseCase(user_repo, password_service, throttle)
+
+def get_revoke_access_token_use_case(
+    revocation_repo: TokenRevocationRepository = Depends(get_token_revocation_repository),
+    token_filter: TokenRevocationFilter = Depends(get_revocation_filter)
+) -> RevokeAccessTokenUseCase:
+    return RevokeAccessTokenUseCase(revocation_repo, token_filter)
+
+def get_revoke_user_tokens_use_case(
+    revocation_repo: TokenRevocationRepository = Depends(get_token_revocation_repository),
+    token_filter: TokenRevocationFilter = Depends(get_revocation_filter)
+) -> RevokeUserTokensUseCase:
+    return RevokeUserTokensUseCase(revocation_repo, token_filter)
+
+def get_issue_refresh_token_use_case(
+    refresh_token_repo: RefreshTokenRepository = Depends(get_refresh_token_repository)
+) -> IssueRefreshTokenUseCase:
+    return IssueRefreshTokenUseCase(
+        refresh_token_repo,
+        lifetime=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        session_lifetime=timedelta(days=settings.REFRESH_SESSION_MAX_DAYS)
+    )
+
+def get_refresh_access_token_use_case(
+    refresh_token_repo: RefreshTokenRepository = Depends(get_refresh_token_repository)
+) -> RefreshAccessTokenUseCase:
+    return RefreshAccessTokenUseCase(refresh_token_repo, lifetime=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+
+def get_revoke_refresh_token_use_case(
+    refresh_token_repo: RefreshTokenRepository = Depends(get_refresh_token_repository)
+) -> RevokeRefreshTokenUseCase:
+    return RevokeRefreshTokenUseCase(refresh_token_repo)
+
+def get_change_user_role_use_case(
+    user_repo: UserRepository = Depends(get_user_repository),
+    revoke_user_tokens_use_case: RevokeUserTokensUseCase = Depends(get_revoke_user_tokens_use_case)
+) -> ChangeUserRoleUseCase:
+    return ChangeUserRoleUseCase(user_repo, revoke_user_tokens_use_case)
+
+def get_bulk_provision_users_use_case_factory(
+    session_factory=Depends(get_session_factory),
+    password_service: AsyncPasswordService = Depends(get_import_password_service)
+):
+    """
+    The import response is streamed after the request-scoped session has been
+    closed, so the use case gets a session of its own for the stream's lifetime.
+    """
+    @asynccontextmanager
+    async def factory():
+        async with session_factory() as session:
+            yield BulkProvisionUsersUseCase(
+                UserRepositoryImpl(session), password_service, settings.USER_IMPORT_BATCH_SIZE
+            )
+    return factory
 
 # Project Use Case Dependencies
 def get_create_project_use_case(
     project_repo: ProjectRepository = Depends(get_project_repository),
-    project_user_repo: ProjectUserRepository = Depends(get_project_user_repository)
+    project_user_repo: ProjectUserRepository = Depends(get_project_user_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
 ) -> CreateProjectUseCase:
-    return CreateProjectUseCase(project_repo, project_user_repo)
+    return CreateProjectUseCase(project_repo, project_user_repo, unit_of_work)
 
 def get_projects_by_tenant_use_case(
-    project_repo: ProjectRepository = Depends(get_project_repository)
+    project_repo: ProjectRepository = Depends(get_read_project_repository),
+    session_factory=Depends(get_read_session_factory)
 ) -> GetProjectsByTenantUseCase:
-    return GetProjectsByTenantUseCase(project_repo)
+    return GetProjectsByTenantUseCase(
+        project_repo, settings.PAGE_SIZE_MAX, list_read_flights,
+        _repository_opener(session_factory, ProjectRepositoryImpl)
+    )
+
+def get_check_project_access_use_case(
+    project_repo: ProjectRepository = Depends(get_project_repository)
+) -> CheckProjectAccessUseCase:
+    return CheckProjectAccessUseCase(project_repo, project_access_cache, settings.PROJECT_ACCESS_CACHE_NEGATIVE_TTL_SECONDS)
 
 def get_project_by_id_use_case(
     project_repo: ProjectRepository = Depends(get_project_repository)
@@ -61,37 +298,59 @@ def get_project_by_id_use_case(
     return GetProjectByIdUseCase(project_repo)
 
 def get_delete_project_use_case(
-    project_repo: ProjectRepository = Depends(get_project_repository)
+    project_repo: ProjectRepository = Depends(get_project_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
 ) -> DeleteProjectUseCase:
-    return DeleteProjectUseCase(project_repo)
+    return DeleteProjectUseCase(
+        project_repo, unit_of_work, settings.PROJECT_DELETE_SYNC_MAX_TASKS, project_access_cache
+    )
 
 def get_update_project_use_case(
-    project_repo: ProjectRepository = Depends(get_project_repository)
+    project_repo: ProjectRepository = Depends(get_project_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
 ) -> UpdateProjectUseCase:
-    return UpdateProjectUseCase(project_repo)
+    return UpdateProjectUseCase(project_repo, unit_of_work)
 
 # Task Use Case Dependencies
 def get_create_task_use_case(
-    task_repo: TaskRepository = Depends(get_task_repository)
+    task_repo: TaskRepository = Depends(get_task_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
 ) -> CreateTaskUseCase:
-    return CreateTaskUseCase(task_repo)
+    return CreateTaskUseCase(task_repo, unit_of_work)
+
+def get_bulk_create_tasks_use_case(
+    task_repo: TaskRepository = Depends(get_task_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
+) -> BulkCreateTasksUseCase:
+    return BulkCreateTasksUseCase(task_repo, unit_of_work, settings.TASK_BULK_MAX_ITEMS)
+
+def get_batch_update_tasks_use_case(
+    task_repo: TaskRepository = Depends(get_task_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
+) -> BatchUpdateTasksUseCase:
+    return BatchUpdateTasksUseCase(task_repo, unit_of_work, settings.TASK_BULK_MAX_ITEMS)
 
 def get_tasks_by_project_use_case(
-    task_repo: TaskRepository = Depends(get_task_repository)
+    task_repo: TaskRepository = Depends(get_read_task_repository),
+    session_factory=Depends(get_read_session_factory)
 ) -> GetTasksByProjectUseCase:
-    return GetTasksByProjectUseCase(task_repo)
+    return GetTasksByProjectUseCase(
+        task_repo, settings.PAGE_SIZE_MAX, list_read_flights, _repository_opener(session_factory, TaskRepositoryImpl)
+    )
 
 def get_update_task_use_case(
-    task_repo: TaskRepository = Depends(get_task_repository)
+    task_repo: TaskRepository = Depends(get_task_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
 ) -> UpdateTaskUseCase:
-    return UpdateTaskUseCase(task_repo)
+    return UpdateTaskUseCase(task_repo, unit_of_work)
 
 def get_delete_task_use_case(
-    task_repo: TaskRepository = Depends(get_task_repository)
+    task_repo: TaskRepository = Depends(get_task_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
 ) -> DeleteTaskUseCase:
-    return DeleteTaskUseCase(task_repo)
+    return DeleteTaskUseCase(task_repo, unit_of_work)
 
 def get_project_users_use_case(
-    project_user_repo: ProjectUserRepository = Depends(get_project_user_repository)
+    project_user_repo: ProjectUserRepository = Depends(get_read_project_user_repository)
 ) -> GetProjectUsersUseCase:
     return GetProjectUsersUseCase(project_user_repo)
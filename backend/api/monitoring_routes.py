@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from core.cache import principal_cache, project_access_cache, project_list_cache
+from domain.entities import User
+from infrastructure.database import pool_stats, query_log, read_engine
+from .dependencies import (
+    password_service, import_password_service, revocation_filter, login_throttle, project_purge_worker,
+    tenant_directory, list_read_flights
+)
+from .security import get_current_user
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Report in-process performance counters for this worker.
+
+    Counters are per process; aggregate across workers in the scraper.
+    They describe the whole process, not the caller's tenant, so only admins may read them.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required")
+    return {
+        "principal_cache": principal_cache.stats(),
+        "project_list_cache": project_list_cache.stats(),
+        "project_access_cache": project_access_cache.stats(),
+        "password_hashing": password_service.stats(),
+        "import_password_hashing": import_password_service.stats(),
+        "token_revocations": revocation_filter.stats(),
+        "tenant_directory": tenant_directory.stats(),
+        "login_throttle": login_throttle.stats(),
+        "project_purge": project_purge_worker.stats(),
+        "list_read_coalescing": list_read_flights.stats(),
+        "database_pool": pool_stats(),
+        "database_read_pool": pool_stats(read_engine) if read_engine is not None else None,
+        "sql": query_log.stats(),
+    }
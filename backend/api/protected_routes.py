@@ -1,26 +1,80 @@
+import hashlib
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
 import uuid
 from typing import List
 
-from application.dtos import ProjectCreateDTO, ProjectDTO, TaskCreateDTO, TaskDTO, TaskUpdateDTO
+from application.dtos import (
+    ProjectCreateDTO, ProjectDTO, TaskCreateDTO, TaskBulkCreateDTO, TaskDTO, TaskUpdateDTO, TaskBatchUpdateDTO,
+    TaskBatchUpdateResultDTO, UserRoleUpdateDTO
+)
 from application.use_cases.project_management import (
     CreateProjectUseCase, GetProjectsByTenantUseCase, GetProjectByIdUseCase, 
-    UpdateProjectUseCase, DeleteProjectUseCase, CreateTaskUseCase, 
-    GetTasksByProjectUseCase, UpdateTaskUseCase, DeleteTaskUseCase
+    UpdateProjectUseCase, DeleteProjectUseCase, CreateTaskUseCase, BulkCreateTasksUseCase,
+    BatchUpdateTasksUseCase, GetTasksByProjectUseCase, UpdateTaskUseCase, DeleteTaskUseCase,
+    TaskVersionConflictError, CheckProjectAccessUseCase
 )
+from application.pagination import Page, InvalidCursorError
 from application.use_cases.project_user_management import GetProjectUsersUseCase
+from application.use_cases.user_management import ChangeUserRoleUseCase
+from core.cache import project_list_cache
+from core.config import settings
 from .dependencies import (
     get_create_project_use_case, get_projects_by_tenant_use_case, get_project_by_id_use_case, 
-    get_update_project_use_case, get_delete_project_use_case, get_create_task_use_case, 
+    get_update_project_use_case, get_delete_project_use_case, get_create_task_use_case,
+    get_bulk_create_tasks_use_case, get_batch_update_tasks_use_case, get_check_project_access_use_case,
     get_tasks_by_project_use_case, get_update_task_use_case, get_delete_task_use_case,
-    get_project_users_use_case
+    get_project_users_use_case, get_change_user_role_use_case
 )
 from .security import get_current_user
 from domain.entities import User, UserDTO
 
 router = APIRouter()
 
+def set_page_headers(request: Request, response: Response, page: Page) -> None:
+    """Listings keep a plain list body; the next-page cursor and total travel in headers."""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+
+def invalid_cursor_exception() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+def task_etag(version: int) -> str:
+    return f'"{version}"'
+
+def parse_if_match(if_match: str | None) -> int | None:
+    """The task version an If-Match header requires; None when any version will do."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().strip('"'))
+    except ValueError:
+        # Weak or foreign tags can never match a strong ETag
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Task has been modified")
+
+# Per-tenant data, stored by the browser but revalidated with If-None-Match on every poll
+LIST_CACHE_CONTROL = "private, no-cache"
+
+def list_etag(*parts) -> str:
+    """A strong ETag for a listing, from its data version and everything else that shapes the page."""
+    return '"' + hashlib.sha256(repr(parts).encode()).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a proxy still matches
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL})
+
 # Project Endpoints
 @router.post("/projects/", response_model=ProjectDTO, status_code=status.HTTP_201_CREATED)
 async def create_project(
@@ -35,13 +89,42 @@ async def create_project(
     )
     return project
 
+project_list_adapter = TypeAdapter(List[ProjectDTO])
+
 @router.get("/projects/", response_model=List[ProjectDTO])
 async def get_projects(
+    request: Request,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1),
+    cursor: str | None = None,
+    include_total: bool = False,
+    if_none_match: str | None = Header(None),
     get_projects_use_case: GetProjectsByTenantUseCase = Depends(get_projects_by_tenant_use_case),
     current_user: User = Depends(get_current_user)
 ):
-    projects = await get_projects_use_case.execute(current_user.tenant_id)
-    return projects
+    # Read the version before the page, so a cached page is never older than its key
+    version = await get_projects_use_case.data_version(current_user.tenant_id)
+    cache_key = (current_user.tenant_id, version, limit, cursor, include_total)
+    etag = list_etag(*cache_key)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    cached = project_list_cache.get(cache_key)
+    if cached is None:
+        try:
+            page = await get_projects_use_case.execute(
+                current_user.tenant_id, limit, cursor, include_total, data_version=version
+            )
+        except InvalidCursorError:
+            raise invalid_cursor_exception()
+        body = project_list_adapter.dump_json(project_list_adapter.validate_python(page.items, from_attributes=True))
+        cached = Page(items=body, next_cursor=page.next_cursor, total=page.total)
+        project_list_cache.set(cache_key, cached, size=len(body))
+    # A hit skips the query, validation and JSON encoding; only the headers are built per request
+    response = Response(
+        content=cached.items, media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+    )
+    set_page_headers(request, response, cached)
+    return response
 
 @router.get("/projects/{project_id}", response_model=ProjectDTO)
 async def get_project(
@@ -118,60 +201,137 @@ async def get_project_users(
         )
 
 
+# User Endpoints
+@router.patch("/users/{user_id}/role", response_model=UserDTO)
+async def change_user_role(
+    user_id: uuid.UUID,
+    role_data: UserRoleUpdateDTO,
+    change_user_role_use_case: ChangeUserRoleUseCase = Depends(get_change_user_role_use_case),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can change user roles")
+
+    user = await change_user_role_use_case.execute(
+        user_id,
+        current_user.tenant_id,
+        role_data.role,
+        token_lifetime=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+
 # Task Endpoints
 @router.post("/projects/{project_id}/tasks/", response_model=TaskDTO, status_code=status.HTTP_201_CREATED)
 async def create_task(
     project_id: uuid.UUID,
     task_data: TaskCreateDTO,
     create_task_use_case: CreateTaskUseCase = Depends(get_create_task_use_case),
-    get_project_use_case: GetProjectByIdUseCase = Depends(get_project_by_id_use_case),
+    check_project_access: CheckProjectAccessUseCase = Depends(get_check_project_access_use_case),
     current_user: User = Depends(get_current_user)
 ):
-    project = await get_project_use_case.execute(project_id, current_user.tenant_id)
-    if not project:
+    if not await check_project_access.execute(project_id, current_user.tenant_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     task = await create_task_use_case.execute(task_data, project_id)
     return task
 
+@router.post("/projects/{project_id}/tasks/bulk", response_model=List[TaskDTO], status_code=status.HTTP_201_CREATED)
+async def bulk_create_tasks(
+    project_id: uuid.UUID,
+    bulk_data: TaskBulkCreateDTO,
+    bulk_create_tasks_use_case: BulkCreateTasksUseCase = Depends(get_bulk_create_tasks_use_case),
+    check_project_access: CheckProjectAccessUseCase = Depends(get_check_project_access_use_case),
+    current_user: User = Depends(get_current_user)
+):
+    if not await check_project_access.execute(project_id, current_user.tenant_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    try:
+        return await bulk_create_tasks_use_case.execute(bulk_data.tasks, project_id, current_user.tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 @router.get("/projects/{project_id}/tasks/", response_model=List[TaskDTO])
 async def get_tasks(
     project_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1),
+    cursor: str | None = None,
+    include_total: bool = False,
+    if_none_match: str | None = Header(None),
     get_tasks_use_case: GetTasksByProjectUseCase = Depends(get_tasks_by_project_use_case),
-    get_project_use_case: GetProjectByIdUseCase = Depends(get_project_by_id_use_case),
+    check_project_access: CheckProjectAccessUseCase = Depends(get_check_project_access_use_case),
     current_user: User = Depends(get_current_user)
 ):
-    project = await get_project_use_case.execute(project_id, current_user.tenant_id)
-    if not project:
+    if not await check_project_access.execute(project_id, current_user.tenant_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    # As with projects, the version is read first, so the ETag is never newer than the page
+    version = await get_tasks_use_case.data_version(project_id)
+    etag = list_etag(project_id, version, limit, cursor, include_total)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        page = await get_tasks_use_case.execute(project_id, limit, cursor, include_total, data_version=version)
+    except InvalidCursorError:
+        raise invalid_cursor_exception()
+    set_page_headers(request, response, page)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = LIST_CACHE_CONTROL
+    return page.items
+
+# Declared before /tasks/{task_id} so "batch" is not parsed as a task id
+@router.patch("/projects/{project_id}/tasks/batch", response_model=List[TaskBatchUpdateResultDTO])
+async def batch_update_tasks(
+    project_id: uuid.UUID,
+    batch_data: TaskBatchUpdateDTO,
+    batch_update_tasks_use_case: BatchUpdateTasksUseCase = Depends(get_batch_update_tasks_use_case),
+    check_project_access: CheckProjectAccessUseCase = Depends(get_check_project_access_use_case),
+    current_user: User = Depends(get_current_user)
+):
+    if not await check_project_access.execute(project_id, current_user.tenant_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    tasks = await get_tasks_use_case.execute(project_id)
-    return tasks
+    try:
+        return await batch_update_tasks_use_case.execute(batch_data.tasks, project_id, current_user.tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.patch("/projects/{project_id}/tasks/{task_id}", response_model=TaskDTO)
 async def update_task(
     project_id: uuid.UUID,
     task_id: uuid.UUID,
     task_data: TaskUpdateDTO,
+    response: Response,
+    if_match: str | None = Header(None),
     update_task_use_case: UpdateTaskUseCase = Depends(get_update_task_use_case),
-    get_project_use_case: GetProjectByIdUseCase = Depends(get_project_by_id_use_case),
+    check_project_access: CheckProjectAccessUseCase = Depends(get_check_project_access_use_case),
     current_user: User = Depends(get_current_user)
 ):
     # Verify project exists and user has access
-    project = await get_project_use_case.execute(project_id, current_user.tenant_id)
-    if not project:
+    if not await check_project_access.execute(project_id, current_user.tenant_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found or access denied"
         )
     
-    # Update the task
+    # Update the task; with If-Match, only if nobody changed it since the client read it
+    expected_version = parse_if_match(if_match)
     try:
-        task = await update_task_use_case.execute(task_id, task_data)
+        task = await update_task_use_case.execute(
+            task_id, task_data, project_id, current_user.tenant_id, expected_version
+        )
         if not task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
+        response.headers["ETag"] = task_etag(task.version)
         return task
+    except HTTPException:
+        raise
+    except TaskVersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -183,26 +343,19 @@ async def delete_task(
     project_id: uuid.UUID,
     task_id: uuid.UUID,
     delete_task_use_case: DeleteTaskUseCase = Depends(get_delete_task_use_case),
-    get_project_use_case: GetProjectByIdUseCase = Depends(get_project_by_id_use_case),
     current_user: User = Depends(get_current_user)
 ):
-    # Verify project exists and user has access
-    project = await get_project_use_case.execute(project_id, current_user.tenant_id)
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found or access denied"
-        )
-    
-    # Delete the task
+    # One statement checks the project and tenant; no separate project fetch
     try:
-        success = await delete_task_use_case.execute(task_id)
+        success = await delete_task_use_case.execute(task_id, project_id, current_user.tenant_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
+                detail="Task not found or access denied"
             )
         return {"status": "success", "message": "Task deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
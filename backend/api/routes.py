@@ -1,23 +1,47 @@
 import logging
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status, Form, Request
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from application.dtos import UserCreateDTO, UserDTO, TokenDTO, UserLoginDTO
+from application.dtos import UserCreateDTO, UserDTO, TokenDTO, UserLoginDTO, RefreshTokenRequestDTO
+from application.services import PasswordServiceBusyError, LoginThrottle
+from core.rate_limit import RateLimitExceededError
 from application.use_cases.user_management import RegisterUserUseCase, AuthenticateUserUseCase
-from .dependencies import get_register_user_use_case, get_authenticate_user_use_case
-from .security import create_access_token
+from application.use_cases.token_management import (
+    RevokeAccessTokenUseCase, IssueRefreshTokenUseCase, RefreshAccessTokenUseCase,
+    RevokeRefreshTokenUseCase, RefreshTokenReuseError
+)
+from domain.entities import User
+from .dependencies import (
+    get_register_user_use_case, get_authenticate_user_use_case, get_revoke_access_token_use_case,
+    get_issue_refresh_token_use_case, get_refresh_access_token_use_case, get_revoke_refresh_token_use_case,
+    get_login_throttle
+)
+from .security import create_user_access_token, decode_access_token, get_current_user, oauth2_scheme
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def password_service_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={
+            "error": "server_busy",
+            "message": "The server is handling too many sign-in requests. Please try again shortly."
+        },
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/token", response_model=TokenDTO)
 async def login_for_access_token(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
-    authenticate_user_use_case: AuthenticateUserUseCase = Depends(get_authenticate_user_use_case)
+    authenticate_user_use_case: AuthenticateUserUseCase = Depends(get_authenticate_user_use_case),
+    issue_refresh_token_use_case: IssueRefreshTokenUseCase = Depends(get_issue_refresh_token_use_case),
+    login_throttle: LoginThrottle = Depends(get_login_throttle)
 ):
     logger.info(f"Login attempt for username/email: {username} from {request.client.host}")
     
@@ -26,6 +50,9 @@ async def login_for_access_token(
     logger.debug(f"Form data: {dict(form_data)}")
     
     try:
+        # Throttle before any database or bcrypt work
+        await login_throttle.check_client(request.client.host, username)
+
         login_data = UserLoginDTO(email=username, password=password)
         logger.info(f"Created login DTO for email: {login_data.email}")
         
@@ -44,11 +71,10 @@ async def login_for_access_token(
         logger.info(f"User authenticated successfully: {user.email}")
         
         try:
-            access_token = create_access_token(
-                data={"sub": user.email, "tenant_id": str(user.tenant_id)}
-            )
+            access_token = create_user_access_token(user)
+            refresh_token = await issue_refresh_token_use_case.execute(user)
             logger.info("Access token generated successfully")
-            return {"access_token": access_token, "token_type": "bearer"}
+            return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
         except Exception as token_error:
             logger.error(f"Error generating access token: {str(token_error)}", exc_info=True)
             raise HTTPException(
@@ -62,6 +88,21 @@ async def login_for_access_token(
     except HTTPException as http_exc:
         # Re-raise HTTP exceptions as they are
         raise http_exc
+
+    except PasswordServiceBusyError:
+        logger.warning(f"Rejecting login for {username}: password service saturated")
+        raise password_service_busy_exception()
+
+    except RateLimitExceededError as e:
+        logger.warning(f"Login throttled for {username} from {request.client.host} ({e.scope})")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "error": "too_many_attempts",
+                "message": "Too many login attempts. Please wait a moment and try again."
+            },
+            headers={"Retry-After": e.retry_after_header},
+        )
         
     except Exception as e:
         logger.error(f"Unexpected error during login: {str(e)}", exc_info=True)
@@ -74,6 +115,60 @@ async def login_for_access_token(
         )
 
 
+@router.post("/token/refresh", response_model=TokenDTO)
+async def refresh_access_token(
+    refresh_request: RefreshTokenRequestDTO,
+    refresh_access_token_use_case: RefreshAccessTokenUseCase = Depends(get_refresh_access_token_use_case)
+):
+    """
+    Exchange a refresh token for a new access token and a rotated refresh token.
+
+    Costs one indexed lookup and no password hashing. Presenting a refresh
+    token that was already rotated revokes the whole session.
+    """
+    invalid_refresh_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={
+            "error": "invalid_refresh_token",
+            "message": "Your session has expired. Please log in again."
+        },
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        refreshed = await refresh_access_token_use_case.execute(refresh_request.refresh_token)
+    except RefreshTokenReuseError:
+        raise invalid_refresh_exception
+    if not refreshed:
+        raise invalid_refresh_exception
+
+    user, refresh_token = refreshed
+    access_token = create_user_access_token(user)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+@router.post("/logout")
+async def logout(
+    refresh_request: RefreshTokenRequestDTO | None = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user),
+    revoke_access_token_use_case: RevokeAccessTokenUseCase = Depends(get_revoke_access_token_use_case),
+    revoke_refresh_token_use_case: RevokeRefreshTokenUseCase = Depends(get_revoke_refresh_token_use_case)
+):
+    """
+    Revoke the presented access token on every worker, and the refresh
+    session too when its refresh token is sent in the body.
+    """
+    payload = decode_access_token(token)
+    jti = payload.get("jti")
+    if jti:
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc).replace(tzinfo=None)
+        await revoke_access_token_use_case.execute(jti, expires_at)
+    if refresh_request is not None:
+        await revoke_refresh_token_use_case.execute(refresh_request.refresh_token, current_user.id)
+    logger.info(f"User {current_user.email} logged out")
+    return {"status": "success", "message": "Logged out successfully"}
+
+
 @router.post("/register", response_model=UserDTO)
 async def register_user(
     request: Request,
@@ -119,6 +214,10 @@ async def register_user(
     except HTTPException as http_exc:
         logger.warning(f"HTTPException during registration: {str(http_exc)}")
         raise http_exc
+
+    except PasswordServiceBusyError:
+        logger.warning(f"Rejecting registration for {user_data.email}: password service saturated")
+        raise password_service_busy_exception()
         
     except Exception as e:
         error_msg = str(e).lower()
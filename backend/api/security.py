@@ -1,48 +1,110 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+import uuid
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
+from application.services import TokenRevocationFilter
+from core.cache import principal_cache, principal_cache_key
 from core.config import settings
 from domain.entities import User
-from domain.repositories import UserRepository
-from .dependencies import get_user_repository
+from domain.repositories import UserRepository, TokenRevocationRepository
+from .dependencies import get_user_repository, get_token_revocation_repository, get_revocation_filter
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/token")
 
+SELF_CONTAINED_TOKEN_MODE = "self_contained"
+
 class TokenData(BaseModel):
     email: str | None = None
     tenant_id: str | None = None
+    jti: str | None = None
+    user_id: uuid.UUID | None = None
+    username: str | None = None
+    role: str | None = None
+    token_version: int | None = None
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    user_repo: UserRepository = Depends(get_user_repository)
-) -> User:
-    credentials_exception = HTTPException(
+    @property
+    def is_self_contained(self) -> bool:
+        return (
+            self.user_id is not None
+            and self.username is not None
+            and self.role is not None
+            and self.token_version is not None
+        )
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        tenant_id: str = payload.get("tenant_id")
-        if email is None or tenant_id is None:
-            raise credentials_exception
-        token_data = TokenData(email=email, tenant_id=tenant_id)
     except JWTError:
-        raise credentials_exception
-    
+        raise credentials_exception()
+    if payload.get("sub") is None or payload.get("tenant_id") is None:
+        raise credentials_exception()
+    return payload
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    user_repo: UserRepository = Depends(get_user_repository),
+    revocation_repo: TokenRevocationRepository = Depends(get_token_revocation_repository),
+    revocation_filter: TokenRevocationFilter = Depends(get_revocation_filter)
+) -> User:
+    payload = decode_access_token(token)
+    try:
+        token_data = TokenData(
+            email=payload.get("sub"),
+            tenant_id=payload.get("tenant_id"),
+            jti=payload.get("jti"),
+            user_id=payload.get("uid"),
+            username=payload.get("username"),
+            role=payload.get("role"),
+            token_version=payload.get("ver"),
+        )
+    except ValueError:
+        raise credentials_exception()
+
+    if revocation_filter.refresh_due():
+        await revocation_filter.refresh(revocation_repo)
+    if revocation_filter.is_revoked(token_data.jti, token_data.user_id, token_data.token_version):
+        raise credentials_exception()
+
+    if token_data.is_self_contained:
+        # Everything the routes need is in the signed claims; no database read
+        return User(
+            id=token_data.user_id,
+            tenant_id=token_data.tenant_id,
+            username=token_data.username,
+            email=token_data.email,
+            hashed_password="",
+            role=token_data.role,
+            token_version=token_data.token_version,
+        )
+
+    cache_key = principal_cache_key(token_data.email, token_data.tenant_id)
+    user = principal_cache.get(cache_key)
+    # A role change on any worker raises the user's minimum token version in the
+    # revocation filter, which every worker refreshes; a cached principal below
+    # it is stale and is reloaded instead of serving the old role.
+    if user is not None and not revocation_filter.is_revoked(None, user.id, user.token_version):
+        return user
+
     user = await user_repo.get_by_email(email=token_data.email)
     if user is None:
-        raise credentials_exception
-    
+        raise credentials_exception()
+
     if str(user.tenant_id) != token_data.tenant_id:
-        raise credentials_exception
-        
+        raise credentials_exception()
+
+    principal_cache.set(cache_key, user)
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -52,6 +114,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_user_access_token(user: User, expires_delta: Optional[timedelta] = None) -> str:
+    """Issue an access token for a user in the configured ACCESS_TOKEN_MODE."""
+    claims = {"sub": user.email, "tenant_id": str(user.tenant_id)}
+    if settings.ACCESS_TOKEN_MODE == SELF_CONTAINED_TOKEN_MODE:
+        claims.update({
+            "uid": str(user.id),
+            "username": user.username,
+            "role": user.role,
+            "ver": user.token_version,
+        })
+    return create_access_token(data=claims, expires_delta=expires_delta)
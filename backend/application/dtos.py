@@ -1,4 +1,5 @@
 from datetime import datetime as Datetime
+from typing import Literal
 from pydantic import BaseModel, EmailStr, ConfigDict, field_serializer
 import uuid
 
@@ -23,9 +24,22 @@ class UserLoginDTO(BaseModel):
     email: EmailStr
     password: str
 
+class UserImportRowDTO(BaseModel):
+    username: str
+    email: EmailStr
+    password: str
+    role: Literal['admin', 'user'] = 'user'
+
+class UserRoleUpdateDTO(BaseModel):
+    role: Literal['admin', 'user']
+
 class TokenDTO(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+class RefreshTokenRequestDTO(BaseModel):
+    refresh_token: str
 
 # Project DTOs
 class ProjectCreateDTO(BaseModel):
@@ -47,6 +61,9 @@ class TaskCreateDTO(BaseModel):
     status: str
     assignee_id: uuid.UUID | None = None
 
+class TaskBulkCreateDTO(BaseModel):
+    tasks: list[TaskCreateDTO]
+
 class AssigneeDTO(BaseModel):
     id: uuid.UUID
     username: str
@@ -64,11 +81,13 @@ class TaskDTO(BaseModel):
     assignee_id: uuid.UUID | None = None
     assignee: AssigneeDTO | None = None
     created_at: Datetime
+    updated_at: Datetime
     due_date: Datetime | None = None
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
     
-    @field_serializer('created_at', 'due_date')
+    @field_serializer('created_at', 'updated_at', 'due_date')
     def serialize_dt(self, dt: Datetime | None) -> str | None:
         if dt is None:
             return None
@@ -79,3 +98,14 @@ class TaskUpdateDTO(BaseModel):
     description: str | None = None
     status: str | None = None
     assignee_id: uuid.UUID | None = None
+
+class TaskBatchUpdateItemDTO(TaskUpdateDTO):
+    id: uuid.UUID
+
+class TaskBatchUpdateDTO(BaseModel):
+    tasks: list[TaskBatchUpdateItemDTO]
+
+class TaskBatchUpdateResultDTO(BaseModel):
+    id: uuid.UUID
+    status: Literal["updated", "not_found"]
+    task: TaskDTO | None = None
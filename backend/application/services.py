@@ -1,5 +1,18 @@
+import asyncio
 import bcrypt
 import logging
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from core.metrics import Histogram
+from core.rate_limit import BucketPolicy, RateLimitBackend, RateLimitExceededError
+from domain.entities import Tenant, TokenRevocation
+from domain.repositories import TenantRepository, TokenRevocationRepository
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +29,426 @@ class PasswordService:
             return False
 
     @staticmethod
-    def get_password_hash(password: str) -> str:
+    def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
         try:
             # Generate a salt and hash the password
-            salt = bcrypt.gensalt()
+            salt = bcrypt.gensalt(rounds) if rounds is not None else bcrypt.gensalt()
             hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
             return hashed.decode('utf-8')  # Return as string for storage
         except Exception as e:
             logger.error(f"Password hashing failed: {str(e)}")
             raise ValueError("Failed to hash password")
+
+    @staticmethod
+    def get_rounds(hashed_password: str) -> Optional[int]:
+        """Read the cost factor from a modular crypt hash such as $2b$12$..."""
+        parts = hashed_password.split('$')
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+
+class PasswordServiceBusyError(Exception):
+    """Raised when the password hashing queue is full and the call is rejected."""
+
+
+class AsyncPasswordService:
+    """
+    Runs bcrypt work on a dedicated thread pool so it never blocks the event loop.
+
+    At most ``max_concurrency`` hashes run at once; up to ``max_queue`` more may
+    wait for a free worker. Anything beyond that fails fast with
+    PasswordServiceBusyError instead of piling up behind the pool. Background
+    callers that would rather wait for capacity pass ``wait_when_busy``.
+
+    Hashes below ``rehash_below`` rounds are upgraded on login. The floor is
+    fixed for the deployment, unlike ``rounds``, which each worker may
+    calibrate on its own, so workers never rehash each other's hashes back
+    and forth or lower a stored cost.
+    """
+
+    DEFAULT_ROUNDS = 12
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        rounds: int = DEFAULT_ROUNDS,
+        rehash_below: Optional[int] = None,
+        wait_when_busy: bool = False
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.wait_when_busy = wait_when_busy
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.rounds = rounds
+        self.rehash_below = rounds if rehash_below is None else rehash_below
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.wait_time_ms = Histogram()
+        self.hash_time_ms = Histogram()
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(PasswordService.verify_password, plain_password, hashed_password)
+
+    async def get_password_hash(self, password: str) -> str:
+        return await self._run(PasswordService.get_password_hash, password, self.rounds)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        stored_rounds = PasswordService.get_rounds(hashed_password)
+        return stored_rounds is None or stored_rounds < self.rehash_below
+
+    async def calibrate(self, target_ms: float, min_rounds: int, max_rounds: int) -> int:
+        """
+        Pick the highest cost whose hash time stays within target_ms on this host.
+
+        One hash is timed at min_rounds; each extra round doubles the work, so
+        the remaining costs are extrapolated instead of measured.
+        """
+        loop = asyncio.get_running_loop()
+
+        def measure() -> float:
+            started_at = time.perf_counter()
+            PasswordService.get_password_hash("calibration-password", min_rounds)
+            return (time.perf_counter() - started_at) * 1000
+
+        samples = [await loop.run_in_executor(self._executor, measure) for _ in range(2)]
+        base_ms = min(samples)
+        rounds = min_rounds
+        while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+            rounds += 1
+        self.rounds = rounds
+        logger.info(
+            f"bcrypt cost calibrated to {rounds} "
+            f"(~{base_ms * 2 ** (rounds - min_rounds):.0f} ms, target {target_ms} ms)"
+        )
+        return rounds
+
+    def _wait_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency + self.max_queue)
+            self._slots_loop = loop
+        return self._slots
+
+    async def _run(self, func, *args):
+        slots = None
+        if self.wait_when_busy:
+            slots = self._wait_slots()
+            await slots.acquire()
+        with self._lock:
+            if self._in_flight >= self.max_concurrency + self.max_queue:
+                self.rejected += 1
+                raise PasswordServiceBusyError("Password hashing capacity exhausted")
+            self._in_flight += 1
+
+        submitted_at = time.perf_counter()
+
+        def timed_call():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self.wait_time_ms.observe((started_at - submitted_at) * 1000)
+                    self.hash_time_ms.observe((finished_at - started_at) * 1000)
+
+        def release(_future):
+            with self._lock:
+                self._in_flight -= 1
+            if slots is not None:
+                self._slots_loop.call_soon_threadsafe(slots.release)
+
+        # The slot is released when the worker finishes, not when the caller
+        # stops waiting, so cancelled requests still count against the cap.
+        future = self._executor.submit(timed_call)
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "bcrypt_rounds": self.rounds,
+                "rehash_below_rounds": self.rehash_below,
+                "in_flight": self._in_flight,
+                "rejected": self.rejected,
+                "wait_time_ms": self.wait_time_ms.snapshot(),
+                "hash_time_ms": self.hash_time_ms.snapshot(),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class TokenRevocationFilter:
+    """
+    In-memory view of the token_revocations table.
+
+    Each worker reloads new rows at most every ``refresh_interval`` seconds, so a
+    logout or role change reaches every worker within that window without a
+    database read per request.
+    """
+
+    # Re-read rows this recent on every refresh to pick up late commits
+    REFRESH_OVERLAP = timedelta(seconds=30)
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._revoked_jtis: dict[str, datetime] = {}
+        self._min_versions: dict[uuid.UUID, tuple[int, datetime]] = {}
+        self._last_id = 0
+        self._next_refresh_at = 0.0
+        self.refreshes = 0
+
+    def refresh_due(self) -> bool:
+        return time.monotonic() >= self._next_refresh_at
+
+    async def refresh(self, repository: TokenRevocationRepository) -> None:
+        # Claim the refresh slot before awaiting so concurrent requests skip it
+        self._next_refresh_at = time.monotonic() + self.refresh_interval
+        now = datetime.utcnow()
+        try:
+            entries = await repository.get_active_since(self._last_id, now - self.REFRESH_OVERLAP)
+        except Exception as e:
+            logger.error(f"Failed to refresh token revocations: {str(e)}")
+            self._next_refresh_at = 0.0
+            raise
+        self.apply(entries)
+        self._prune(now)
+        self.refreshes += 1
+
+    def apply(self, entries: Iterable[TokenRevocation]) -> None:
+        for entry in entries:
+            if entry.jti:
+                self._revoked_jtis[entry.jti] = entry.expires_at
+            if entry.user_id is not None and entry.min_token_version is not None:
+                current = self._min_versions.get(entry.user_id)
+                if current is None or current[0] < entry.min_token_version:
+                    self._min_versions[entry.user_id] = (entry.min_token_version, entry.expires_at)
+            if entry.id is not None and entry.id > self._last_id:
+                self._last_id = entry.id
+
+    def is_revoked(
+        self,
+        jti: Optional[str],
+        user_id: Optional[uuid.UUID] = None,
+        token_version: Optional[int] = None
+    ) -> bool:
+        if jti is not None and jti in self._revoked_jtis:
+            return True
+        if user_id is not None and token_version is not None:
+            minimum = self._min_versions.get(user_id)
+            if minimum is not None and token_version < minimum[0]:
+                return True
+        return False
+
+    def _prune(self, now: datetime) -> None:
+        self._revoked_jtis = {jti: exp for jti, exp in self._revoked_jtis.items() if exp > now}
+        self._min_versions = {uid: entry for uid, entry in self._min_versions.items() if entry[1] > now}
+
+    def stats(self) -> dict:
+        return {
+            "revoked_tokens": len(self._revoked_jtis),
+            "revoked_users": len(self._min_versions),
+            "last_id": self._last_id,
+            "refreshes": self.refreshes,
+        }
+
+
+class TenantDirectory:
+    """
+    In-memory index of the tenants table by id and by domain.
+
+    Loaded when the application starts, then extended at most every
+    ``refresh_interval`` seconds with tenants created since the last load, so
+    a tenant registered on another worker resolves here without a database
+    read per request. Code that changes a tenant calls apply() or
+    invalidate() so this worker never serves the old row.
+    """
+
+    # Re-read tenants this recent on every refresh to pick up late commits
+    REFRESH_OVERLAP = timedelta(seconds=30)
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self.refreshes = 0
+        self.hits = 0
+        self.misses = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every tenant; the next refresh loads them all again."""
+        self._by_id: dict[uuid.UUID, Tenant] = {}
+        self._by_domain: dict[str, Tenant] = {}
+        self._entry_bytes: dict[uuid.UUID, int] = {}
+        self._loaded_through: Optional[datetime] = None
+        self._next_refresh_at = 0.0
+
+    def by_id(self, tenant_id: uuid.UUID) -> Optional[Tenant]:
+        return self._count(self._by_id.get(tenant_id))
+
+    def by_domain(self, domain: str) -> Optional[Tenant]:
+        return self._count(self._by_domain.get(domain))
+
+    def _count(self, tenant: Optional[Tenant]) -> Optional[Tenant]:
+        if tenant is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return tenant
+
+    def refresh_due(self) -> bool:
+        return time.monotonic() >= self._next_refresh_at
+
+    async def refresh(self, repository: TenantRepository) -> None:
+        """Load every tenant on the first call, afterwards only those created since the last one."""
+        # Claim the refresh slot before awaiting so concurrent requests skip it
+        self._next_refresh_at = time.monotonic() + self.refresh_interval
+        since = self._loaded_through - self.REFRESH_OVERLAP if self._loaded_through else None
+        try:
+            tenants = await repository.get_created_since(since)
+        except Exception as e:
+            logger.error(f"Failed to refresh tenant directory: {str(e)}")
+            self._next_refresh_at = 0.0
+            raise
+        self.apply(tenants)
+        self.refreshes += 1
+
+    def apply(self, tenants: Iterable[Tenant]) -> None:
+        for tenant in tenants:
+            self.invalidate(tenant.id)
+            self._by_id[tenant.id] = tenant
+            self._by_domain[tenant.domain] = tenant
+            self._entry_bytes[tenant.id] = self._sizeof(tenant)
+            if tenant.created_at and (self._loaded_through is None or tenant.created_at > self._loaded_through):
+                self._loaded_through = tenant.created_at
+
+    def invalidate(self, tenant_id: uuid.UUID) -> None:
+        tenant = self._by_id.pop(tenant_id, None)
+        if tenant is not None:
+            # The domain may have moved to this tenant's replacement already
+            if self._by_domain.get(tenant.domain) is tenant:
+                del self._by_domain[tenant.domain]
+            del self._entry_bytes[tenant_id]
+
+    @staticmethod
+    def _sizeof(tenant: Tenant) -> int:
+        # An estimate: the model, its field dict and the field values
+        fields = (tenant.id, tenant.name, tenant.domain, tenant.created_at)
+        return sys.getsizeof(tenant) + sys.getsizeof(tenant.__dict__) + sum(map(sys.getsizeof, fields))
+
+    def stats(self) -> dict:
+        index_bytes = sys.getsizeof(self._by_id) + sys.getsizeof(self._by_domain) + sys.getsizeof(self._entry_bytes)
+        return {
+            "tenants": len(self._by_id),
+            "memory_bytes": index_bytes + sum(self._entry_bytes.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
+
+
+class LoginThrottle:
+    """
+    Token-bucket throttling for login attempts by client IP, email and tenant.
+
+    IP and email are checked before any database or bcrypt work; the tenant
+    bucket is checked once the user is known, still before bcrypt, so one
+    tenant under attack cannot use up password hashing capacity for everyone.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        ip_policy: BucketPolicy,
+        email_policy: BucketPolicy,
+        tenant_policy: BucketPolicy,
+        enabled: bool = True
+    ):
+        self.backend = backend
+        self.ip_policy = ip_policy
+        self.email_policy = email_policy
+        self.tenant_policy = tenant_policy
+        self.enabled = enabled
+        self.rejected = {"ip": 0, "email": 0, "tenant": 0}
+
+    async def check_client(self, ip: str, email: str) -> None:
+        await self._consume("ip", ip, self.ip_policy)
+        await self._consume("email", email.strip().lower(), self.email_policy)
+
+    async def check_tenant(self, tenant_id: uuid.UUID) -> None:
+        await self._consume("tenant", str(tenant_id), self.tenant_policy)
+
+    async def _consume(self, scope: str, value: str, policy: BucketPolicy) -> None:
+        if not self.enabled:
+            return
+        result = await self.backend.consume(f"login:{scope}:{value}", policy)
+        if not result.allowed:
+            self.rejected[scope] += 1
+            raise RateLimitExceededError(scope, result.retry_after)
+
+    async def reset(self) -> None:
+        await self.backend.reset()
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "rejected": dict(self.rejected)}
+
+
+class ProjectPurgeWorker:
+    """
+    Background loop that removes projects marked deleted, one bounded batch per
+    transaction, so no request ever holds locks over a huge project's tasks.
+
+    ``use_case_factory`` is an async context manager yielding a
+    PurgeDeletedProjectsUseCase bound to a fresh session.
+    """
+
+    def __init__(self, use_case_factory, batch_pause: float, idle_interval: float):
+        self.use_case_factory = use_case_factory
+        self.batch_pause = batch_pause
+        self.idle_interval = idle_interval
+        self.purged_rows = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        async with self.use_case_factory() as use_case:
+            purged = await use_case.execute()
+        self.purged_rows += purged
+        return purged
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                purged = await self.run_once()
+            except Exception:
+                self.failures += 1
+                logger.exception("Project purge batch failed")
+                purged = 0
+            await asyncio.sleep(self.batch_pause if purged else self.idle_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {"running": self._task is not None, "purged_rows": self.purged_rows, "failures": self.failures}
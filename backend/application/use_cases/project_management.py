@@ -1,16 +1,24 @@
 import uuid
-from typing import List
-from datetime import datetime
+from typing import AsyncContextManager, Callable, List, Optional
+from datetime import datetime, timedelta
 
 from domain.entities import Project, Task
-from domain.repositories import ProjectRepository, TaskRepository
-from application.dtos import ProjectCreateDTO, ProjectDTO, TaskCreateDTO, TaskDTO, TaskUpdateDTO
+from domain.repositories import ProjectRepository, TaskRepository, UnitOfWork
+from core.single_flight import SingleFlight
+from core.tracing import traced_use_case
+from application.dtos import (
+    ProjectCreateDTO, ProjectDTO, TaskCreateDTO, TaskDTO, TaskUpdateDTO, TaskBatchUpdateItemDTO,
+    TaskBatchUpdateResultDTO
+)
+from application.pagination import Page, build_page, decode_cursor
 
 class CreateProjectUseCase:
-    def __init__(self, project_repository: ProjectRepository, project_user_repository):
+    def __init__(self, project_repository: ProjectRepository, project_user_repository, unit_of_work: UnitOfWork):
         self.project_repository = project_repository
         self.project_user_repository = project_user_repository
+        self.unit_of_work = unit_of_work
 
+    @traced_use_case
     async def execute(self, project_data: ProjectCreateDTO, tenant_id: uuid.UUID, user_id: uuid.UUID) -> Project:
         # Create the project
         project = Project(
@@ -26,53 +34,113 @@ class CreateProjectUseCase:
             user_id=user_id,
             role='owner'
         )
+        # Project and owner membership land in one commit
+        await self.unit_of_work.commit()
         
         return project
 
 class GetProjectsByTenantUseCase:
-    def __init__(self, project_repository: ProjectRepository):
+    def __init__(
+        self,
+        project_repository: ProjectRepository,
+        max_page_size: int,
+        single_flight: SingleFlight,
+        open_repository: Callable[[], AsyncContextManager[ProjectRepository]]
+    ):
         self.project_repository = project_repository
+        self.max_page_size = max_page_size
+        self.single_flight = single_flight
+        # A shared flight outlives whichever request started it, so it gets a session of its own
+        self.open_repository = open_repository
+
+    @traced_use_case
+    async def execute(
+        self, tenant_id: uuid.UUID, limit: int, cursor: Optional[str] = None, include_total: bool = False,
+        data_version: Optional[int] = None
+    ) -> Page[Project]:
+        """
+        Concurrent calls with the same arguments share one set of queries, run on a
+        repository from open_repository. Pass the data_version() read beforehand, so a
+        call never joins one that started before a write it has to see.
+        """
+        key = (type(self).__name__, tenant_id, data_version, limit, cursor, include_total)
+        return await self.single_flight.run(key, lambda: self._load(tenant_id, limit, cursor, include_total))
 
-    async def execute(self, tenant_id: uuid.UUID) -> List[Project]:
-        return await self.project_repository.get_by_tenant_id(tenant_id)
+    async def _load(self, tenant_id: uuid.UUID, limit: int, cursor: Optional[str], include_total: bool) -> Page[Project]:
+        limit = min(limit, self.max_page_size)
+        after = decode_cursor(cursor) if cursor else None
+        async with self.open_repository() as repository:
+            projects = await repository.get_by_tenant_id(tenant_id, limit=limit + 1, after=after)
+            total = await repository.count_by_tenant_id(tenant_id) if include_total else None
+        return build_page(projects, limit, total)
+
+    async def data_version(self, tenant_id: uuid.UUID) -> int:
+        """Changes whenever a page returned by execute() could change."""
+        return await self.project_repository.get_data_version(tenant_id)
 
 class GetProjectByIdUseCase:
     def __init__(self, project_repository: ProjectRepository):
         self.project_repository = project_repository
 
+    @traced_use_case
     async def execute(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> Project | None:
         return await self.project_repository.get_by_id(project_id, tenant_id)
 
+class CheckProjectAccessUseCase:
+    def __init__(self, project_repository: ProjectRepository, access_cache, negative_ttl: float):
+        self.project_repository = project_repository
+        self.access_cache = access_cache
+        self.negative_ttl = negative_ttl
+
+    @traced_use_case
+    async def execute(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        """
+        Whether the project belongs to the tenant, for routes that only need the
+        answer and not the project. Both answers are cached; a miss for less time.
+        """
+        key = (project_id, tenant_id)
+        allowed = self.access_cache.get(key)
+        if allowed is None:
+            allowed = await self.project_repository.exists(project_id, tenant_id)
+            self.access_cache.set(key, allowed, ttl=None if allowed else self.negative_ttl)
+        return allowed
+
 class UpdateProjectUseCase:
-    def __init__(self, project_repository: ProjectRepository):
+    def __init__(self, project_repository: ProjectRepository, unit_of_work: UnitOfWork):
         self.project_repository = project_repository
+        self.unit_of_work = unit_of_work
 
+    @traced_use_case
     async def execute(self, project_id: uuid.UUID, project_data: ProjectCreateDTO, tenant_id: uuid.UUID) -> Project | None:
-        # First get the existing project
-        project = await self.project_repository.get_by_id(project_id, tenant_id)
-        if not project:
+        # No read first: the tenant-scoped UPDATE returns nothing for a foreign or missing project
+        updated_project = await self.project_repository.update_fields(
+            project_id, tenant_id, project_data.model_dump(exclude_unset=True)
+        )
+        if not updated_project:
             return None
-        
-        # Update the project with new data
-        update_data = project_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            if hasattr(project, key):
-                setattr(project, key, value)
-        
-        # Save the updated project
-        updated_project = await self.project_repository.update(project)
+        await self.unit_of_work.commit()
         return updated_project
 
 import logging
 
 class DeleteProjectUseCase:
-    def __init__(self, project_repository: ProjectRepository):
+    def __init__(
+        self, project_repository: ProjectRepository, unit_of_work: UnitOfWork, sync_max_tasks: int, access_cache
+    ):
         self.project_repository = project_repository
+        self.unit_of_work = unit_of_work
+        self.sync_max_tasks = sync_max_tasks
+        self.access_cache = access_cache
         self.logger = logging.getLogger(__name__)
 
+    @traced_use_case
     async def execute(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
         """
         Delete a project by ID
+
+        A project with up to sync_max_tasks tasks is deleted right away, its tasks and
+        members through ON DELETE CASCADE. A larger one is only marked deleted, which
+        hides it immediately; ProjectPurgeWorker removes its rows in small batches.
         
         Args:
             project_id: The ID of the project to delete
@@ -83,8 +151,18 @@ class DeleteProjectUseCase:
         """
         try:
             self.logger.info(f"[DeleteProjectUseCase] Starting deletion of project {project_id} for tenant {tenant_id}")
-            result = await self.project_repository.delete(project_id, tenant_id)
+            task_count = await self.project_repository.count_tasks(
+                project_id, tenant_id, up_to=self.sync_max_tasks + 1
+            )
+            if task_count > self.sync_max_tasks:
+                self.logger.info(f"[DeleteProjectUseCase] Project {project_id} is large; purging it in the background")
+                result = await self.project_repository.mark_deleted(project_id, tenant_id)
+            else:
+                result = await self.project_repository.delete(project_id, tenant_id)
             if result:
+                await self.unit_of_work.commit()
+                # After the commit, so a concurrent check cannot cache the project again
+                self.access_cache.invalidate((project_id, tenant_id))
                 self.logger.info(f"[DeleteProjectUseCase] Successfully deleted project {project_id}")
             else:
                 self.logger.warning(f"[DeleteProjectUseCase] Project {project_id} not found or access denied")
@@ -93,10 +171,24 @@ class DeleteProjectUseCase:
             self.logger.error(f"[DeleteProjectUseCase] Error deleting project {project_id}: {str(e)}", exc_info=True)
             raise
 
+class PurgeDeletedProjectsUseCase:
+    def __init__(self, project_repository: ProjectRepository, unit_of_work: UnitOfWork, batch_size: int):
+        self.project_repository = project_repository
+        self.unit_of_work = unit_of_work
+        self.batch_size = batch_size
+
+    async def execute(self) -> int:
+        """Purge one bounded batch of a deleted project in its own short transaction; 0 when none is pending."""
+        purged = await self.project_repository.purge_deleted(self.batch_size)
+        await self.unit_of_work.commit()
+        return purged
+
 class CreateTaskUseCase:
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(self, task_repository: TaskRepository, unit_of_work: UnitOfWork):
         self.task_repository = task_repository
+        self.unit_of_work = unit_of_work
         
+    @traced_use_case
     async def execute(self, task_data: TaskCreateDTO, project_id: uuid.UUID) -> Task:
         # Create a new task with required fields
         task = Task(
@@ -109,76 +201,195 @@ class CreateTaskUseCase:
         
         try:
             await self.task_repository.add(task)
-            # Get the created task with all fields populated
-            created_task = await self.task_repository.get_by_id(task.id)
-            return created_task
+            await self.unit_of_work.commit()
+            # New tasks have no assignee, so there is nothing to load back
+            return task
         except Exception as e:
             logging.error(f"Failed to create task: {str(e)}")
             raise
 
+class BulkCreateTasksUseCase:
+    def __init__(
+        self, task_repository: TaskRepository, unit_of_work: UnitOfWork, max_batch_size: int
+    ):
+        self.task_repository = task_repository
+        self.unit_of_work = unit_of_work
+        self.max_batch_size = max_batch_size
+
+    @traced_use_case
+    async def execute(self, tasks_data: List[TaskCreateDTO], project_id: uuid.UUID, tenant_id: uuid.UUID) -> List[Task]:
+        """
+        Create a batch of tasks in one INSERT and one commit.
+
+        The caller has already checked that the project belongs to the tenant.
+        Assignees are resolved by the INSERT itself, which returns their details
+        for the response; one outside the tenant rolls the whole batch back.
+
+        Raises:
+            ValueError: If the batch is empty or too large, or an assignee is not in the tenant
+        """
+        if not tasks_data:
+            raise ValueError("At least one task is required")
+        if len(tasks_data) > self.max_batch_size:
+            raise ValueError(f"At most {self.max_batch_size} tasks can be created at once")
+
+        # Spacing created_at keeps the batch in request order in (created_at, id) listings
+        created_at = datetime.utcnow()
+        tasks = [
+            Task(
+                title=task_data.title,
+                description=task_data.description or "",
+                status=task_data.status or "todo",
+                project_id=project_id,
+                assignee_id=task_data.assignee_id,
+                created_at=created_at + timedelta(microseconds=position)
+            )
+            for position, task_data in enumerate(tasks_data)
+        ]
+        try:
+            await self.task_repository.add_many(tasks, tenant_id)
+        except ValueError:
+            await self.unit_of_work.rollback()
+            raise
+        await self.unit_of_work.commit()
+        return tasks
+
 class GetTasksByProjectUseCase:
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        max_page_size: int,
+        single_flight: SingleFlight,
+        open_repository: Callable[[], AsyncContextManager[TaskRepository]]
+    ):
         self.task_repository = task_repository
+        self.max_page_size = max_page_size
+        self.single_flight = single_flight
+        self.open_repository = open_repository
+
+    @traced_use_case
+    async def execute(
+        self, project_id: uuid.UUID, limit: int, cursor: Optional[str] = None, include_total: bool = False,
+        data_version: Optional[int] = None
+    ) -> Page[Task]:
+        """Coalesced like GetProjectsByTenantUseCase.execute; the caller has already checked project access."""
+        key = (type(self).__name__, project_id, data_version, limit, cursor, include_total)
+        return await self.single_flight.run(key, lambda: self._load(project_id, limit, cursor, include_total))
+
+    async def _load(self, project_id: uuid.UUID, limit: int, cursor: Optional[str], include_total: bool) -> Page[Task]:
+        limit = min(limit, self.max_page_size)
+        after = decode_cursor(cursor) if cursor else None
+        async with self.open_repository() as repository:
+            tasks = await repository.get_by_project_id(project_id, limit=limit + 1, after=after)
+            total = await repository.count_by_project_id(project_id) if include_total else None
+        return build_page(tasks, limit, total)
 
-    async def execute(self, project_id: uuid.UUID) -> List[Task]:
-        return await self.task_repository.get_by_project_id(project_id)
+    async def data_version(self, project_id: uuid.UUID) -> int:
+        """Changes whenever a page returned by execute() could change."""
+        return await self.task_repository.get_data_version(project_id)
+
+class TaskVersionConflictError(Exception):
+    """Raised when a task was changed since the version the client last read."""
 
 class UpdateTaskUseCase:
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(self, task_repository: TaskRepository, unit_of_work: UnitOfWork):
         self.task_repository = task_repository
+        self.unit_of_work = unit_of_work
 
-    async def execute(self, task_id: uuid.UUID, task_data: TaskUpdateDTO) -> Task | None:
-        # Get the existing task from the repository
-        task = await self.task_repository.get_by_id(task_id)
-        if not task:
-            return None
-        
-        # Create a new Task instance with the updated values
-        update_data = task_data.model_dump(exclude_unset=True)
-        
-        # Only update fields that were provided in the DTO
-        updated_task = Task(
-            id=task.id,
-            project_id=task.project_id,
-            title=update_data.get('title', task.title),
-            description=update_data.get('description', task.description),
-            status=update_data.get('status', task.status),
-            assignee_id=update_data.get('assignee_id', task.assignee_id),
-            created_at=task.created_at,
-            due_date=update_data.get('due_date', task.due_date) if 'due_date' in update_data else task.due_date
-        )
-        
+    @traced_use_case
+    async def execute(
+        self, task_id: uuid.UUID, task_data: TaskUpdateDTO, project_id: uuid.UUID, tenant_id: uuid.UUID,
+        expected_version: Optional[int] = None
+    ) -> Task | None:
+        """
+        Raises:
+            TaskVersionConflictError: If expected_version is given and the task is at another version
+            ValueError: If the update is invalid, e.g. an assignee from another tenant; nothing is written then
+        """
+        # Only the fields sent are written; the UPDATE returns the task with its assignee
         try:
-            # Update the task in the repository
-            await self.task_repository.update(updated_task)
-            
-            # Return the updated task
-            return await self.task_repository.get_by_id(task_id)
+            task = await self.task_repository.update_fields(
+                task_id, project_id, tenant_id, task_data.model_dump(exclude_unset=True), expected_version
+            )
+            if not task:
+                if expected_version is not None and await self._exists(task_id, project_id):
+                    raise TaskVersionConflictError(f"Task {task_id} was modified by another request")
+                return None
+            await self.unit_of_work.commit()
+            return task
+        except TaskVersionConflictError:
+            raise
         except Exception as e:
-            # Log the error for debugging
-            import logging
             logging.error(f"Error updating task {task_id}: {str(e)}")
+            await self.unit_of_work.rollback()
             raise ValueError(f"Failed to update task: {str(e)}")
 
+    async def _exists(self, task_id: uuid.UUID, project_id: uuid.UUID) -> bool:
+        # Only reached when the UPDATE matched nothing, to tell a stale version from a missing task
+        task = await self.task_repository.get_by_id(task_id)
+        return task is not None and task.project_id == project_id
+
+class BatchUpdateTasksUseCase:
+    def __init__(self, task_repository: TaskRepository, unit_of_work: UnitOfWork, max_batch_size: int):
+        self.task_repository = task_repository
+        self.unit_of_work = unit_of_work
+        self.max_batch_size = max_batch_size
+
+    @traced_use_case
+    async def execute(
+        self, items: List[TaskBatchUpdateItemDTO], project_id: uuid.UUID, tenant_id: uuid.UUID
+    ) -> List[TaskBatchUpdateResultDTO]:
+        """
+        Apply partial updates to many tasks of a project in one statement and one commit.
+
+        The caller has already checked that the project belongs to the tenant.
+        Results follow the request order; a task outside the project is reported
+        as not found and does not stop the rest of the batch.
+
+        Raises:
+            ValueError: If the batch is empty, too large or names a task twice, or a value is
+                invalid, e.g. an assignee from another tenant; nothing is written then
+        """
+        if not items:
+            raise ValueError("At least one task is required")
+        if len(items) > self.max_batch_size:
+            raise ValueError(f"At most {self.max_batch_size} tasks can be updated at once")
+        changes = {item.id: item.model_dump(exclude_unset=True, exclude={'id'}) for item in items}
+        if len(changes) != len(items):
+            raise ValueError("Each task can appear only once in a batch")
+
+        try:
+            updated = await self.task_repository.update_many(project_id, tenant_id, changes)
+        except ValueError:
+            await self.unit_of_work.rollback()
+            raise
+        await self.unit_of_work.commit()
+        return [
+            TaskBatchUpdateResultDTO(id=item.id, status="updated", task=updated[item.id])
+            if item.id in updated else TaskBatchUpdateResultDTO(id=item.id, status="not_found")
+            for item in items
+        ]
+
 class DeleteTaskUseCase:
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(self, task_repository: TaskRepository, unit_of_work: UnitOfWork):
         self.task_repository = task_repository
+        self.unit_of_work = unit_of_work
 
-    async def execute(self, task_id: uuid.UUID) -> bool:
+    @traced_use_case
+    async def execute(self, task_id: uuid.UUID, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
         """
-        Delete a task by ID
+        Delete a task of one of the tenant's projects
         
         Args:
             task_id: The ID of the task to delete
+            project_id: The project the task must belong to
+            tenant_id: The tenant the project must belong to
             
         Returns:
-            bool: True if the task was deleted, False if it didn't exist
+            bool: True if the task was deleted, False if it didn't exist or is not accessible
         """
-        # First check if task exists
-        task = await self.task_repository.get_by_id(task_id)
-        if not task:
+        # The ownership checks are part of the DELETE itself
+        if not await self.task_repository.delete_in_project(task_id, project_id, tenant_id):
             return False
-            
-        # Delete the task
-        await self.task_repository.delete(task_id)
+        await self.unit_of_work.commit()
         return True
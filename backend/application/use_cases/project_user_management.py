@@ -1,13 +1,15 @@
 from typing import List, Optional
 import uuid
-from domain.entities import User
+from domain.entities import UserDTO
 from domain.repositories import ProjectUserRepository
+from core.tracing import traced_use_case
 
 class GetProjectUsersUseCase:
     def __init__(self, project_user_repository: ProjectUserRepository):
         self.project_user_repository = project_user_repository
 
-    async def execute(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> List[User]:
+    @traced_use_case
+    async def execute(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> List[UserDTO]:
         """
         Get all users associated with a project
         
@@ -16,7 +18,7 @@ class GetProjectUsersUseCase:
             tenant_id: The ID of the tenant (for authorization)
             
         Returns:
-            List of User objects
+            List of UserDTO objects
         """
         try:
             users = await self.project_user_repository.get_users_by_project(project_id, tenant_id)
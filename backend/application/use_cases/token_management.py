@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from application.services import TokenRevocationFilter
+from domain.entities import TokenRevocation, RefreshToken, User
+from domain.repositories import TokenRevocationRepository, RefreshTokenRepository
+from core.tracing import traced_use_case
+
+logger = logging.getLogger(__name__)
+
+class RefreshTokenReuseError(Exception):
+    """Raised when an already rotated refresh token is presented again."""
+
+def hash_refresh_token(token: str) -> str:
+    # Refresh tokens are high-entropy random strings, so a fast hash is enough
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def _new_refresh_token(
+    user_id: uuid.UUID,
+    lifetime: timedelta,
+    session_expires_at: datetime,
+    family_id: Optional[uuid.UUID] = None
+) -> Tuple[str, RefreshToken]:
+    plain_token = secrets.token_urlsafe(48)
+    refresh_token = RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(plain_token),
+        expires_at=min(datetime.utcnow() + lifetime, session_expires_at),
+        session_expires_at=session_expires_at
+    )
+    if family_id is not None:
+        refresh_token.family_id = family_id
+    return plain_token, refresh_token
+
+class RevokeAccessTokenUseCase:
+    def __init__(self, revocation_repository: TokenRevocationRepository, revocation_filter: TokenRevocationFilter):
+        self.revocation_repository = revocation_repository
+        self.revocation_filter = revocation_filter
+
+    @traced_use_case
+    async def execute(self, jti: str, expires_at: datetime) -> None:
+        """
+        Revoke a single access token until it would have expired anyway.
+
+        Args:
+            jti: The token's unique id claim
+            expires_at: The token's expiry (naive UTC)
+        """
+        await self.revocation_repository.revoke_token(jti, expires_at)
+        # Apply locally right away; other workers pick it up on their next refresh
+        self.revocation_filter.apply([TokenRevocation(jti=jti, expires_at=expires_at)])
+        logger.info(f"Revoked access token {jti}")
+
+class RevokeUserTokensUseCase:
+    def __init__(self, revocation_repository: TokenRevocationRepository, revocation_filter: TokenRevocationFilter):
+        self.revocation_repository = revocation_repository
+        self.revocation_filter = revocation_filter
+
+    @traced_use_case
+    async def execute(self, user_id: uuid.UUID, min_token_version: int, token_lifetime: timedelta) -> None:
+        """
+        Revoke every access token of a user issued with a version below min_token_version.
+
+        Args:
+            user_id: The user whose tokens are revoked
+            min_token_version: The first token version that stays valid
+            token_lifetime: How long issued tokens can live, i.e. how long the entry is needed
+        """
+        expires_at = datetime.utcnow() + token_lifetime
+        await self.revocation_repository.revoke_user_tokens(user_id, min_token_version, expires_at)
+        self.revocation_filter.apply([TokenRevocation(
+            user_id=user_id,
+            min_token_version=min_token_version,
+            expires_at=expires_at
+        )])
+        logger.info(f"Revoked tokens below version {min_token_version} for user {user_id}")
+
+class IssueRefreshTokenUseCase:
+    def __init__(self, refresh_token_repository: RefreshTokenRepository, lifetime: timedelta, session_lifetime: timedelta):
+        self.refresh_token_repository = refresh_token_repository
+        self.lifetime = lifetime
+        self.session_lifetime = session_lifetime
+
+    @traced_use_case
+    async def execute(self, user: User) -> str:
+        """
+        Start a new refresh session for a freshly authenticated user.
+
+        Returns:
+            The plain refresh token; only its hash is stored
+        """
+        plain_token, refresh_token = _new_refresh_token(
+            user.id,
+            self.lifetime,
+            session_expires_at=datetime.utcnow() + self.session_lifetime
+        )
+        await self.refresh_token_repository.add(refresh_token)
+        return plain_token
+
+class RefreshAccessTokenUseCase:
+    def __init__(self, refresh_token_repository: RefreshTokenRepository, lifetime: timedelta):
+        self.refresh_token_repository = refresh_token_repository
+        self.lifetime = lifetime
+
+    @traced_use_case
+    async def execute(self, plain_token: str) -> Optional[Tuple[User, str]]:
+        """
+        Rotate a refresh token, sliding the session forward.
+
+        Args:
+            plain_token: The refresh token presented by the client
+
+        Returns:
+            The token's user and the replacement refresh token, or None if the
+            token is unknown or expired
+
+        Raises:
+            RefreshTokenReuseError: If the token was already rotated; the whole
+                token family is revoked
+        """
+        found = await self.refresh_token_repository.get_with_user(hash_refresh_token(plain_token))
+        if not found:
+            return None
+        refresh_token, user = found
+
+        if refresh_token.revoked_at is not None:
+            logger.warning(f"Refresh token reuse detected for user {user.email}, revoking family {refresh_token.family_id}")
+            await self.refresh_token_repository.revoke_family(refresh_token.family_id)
+            raise RefreshTokenReuseError("Refresh token has already been used")
+
+        if refresh_token.expires_at <= datetime.utcnow():
+            return None
+
+        new_plain_token, new_token = _new_refresh_token(
+            user.id,
+            self.lifetime,
+            session_expires_at=refresh_token.session_expires_at,
+            family_id=refresh_token.family_id
+        )
+        if not await self.refresh_token_repository.rotate(refresh_token.id, new_token):
+            logger.warning(f"Concurrent refresh token reuse for user {user.email}, revoking family {refresh_token.family_id}")
+            await self.refresh_token_repository.revoke_family(refresh_token.family_id)
+            raise RefreshTokenReuseError("Refresh token has already been used")
+
+        return user, new_plain_token
+
+class RevokeRefreshTokenUseCase:
+    def __init__(self, refresh_token_repository: RefreshTokenRepository):
+        self.refresh_token_repository = refresh_token_repository
+
+    @traced_use_case
+    async def execute(self, plain_token: str, user_id: uuid.UUID) -> bool:
+        """
+        End the refresh session a token belongs to.
+
+        Returns:
+            bool: True if a session of the given user was revoked
+        """
+        found = await self.refresh_token_repository.get_with_user(hash_refresh_token(plain_token))
+        if not found or found[1].id != user_id:
+            return False
+        await self.refresh_token_repository.revoke_family(found[0].family_id)
+        return True
@@ -1,15 +1,31 @@
+import asyncio
 import logging
+import uuid
+from datetime import timedelta
+from typing import AsyncIterator, Iterable, Optional, Tuple
+from pydantic import ValidationError
 from domain.entities import User, Tenant
-from domain.repositories import UserRepository, TenantRepository
-from application.services import PasswordService
-from application.dtos import UserCreateDTO, UserDTO, UserLoginDTO
+from domain.repositories import TenantRepository, UserRepository
+from core.tracing import traced_use_case
+from application.services import AsyncPasswordService, PasswordServiceBusyError, LoginThrottle, TenantDirectory
+from core.rate_limit import RateLimitExceededError
+from application.dtos import UserCreateDTO, UserDTO, UserLoginDTO, UserImportRowDTO
+from application.use_cases.token_management import RevokeUserTokensUseCase
 
 logger = logging.getLogger(__name__)
 
 class AuthenticateUserUseCase:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_service: AsyncPasswordService,
+        login_throttle: LoginThrottle | None = None
+    ):
         self.user_repository = user_repository
+        self.password_service = password_service
+        self.login_throttle = login_throttle
 
+    @traced_use_case
     async def execute(self, user_login_dto: UserLoginDTO) -> User | None:
         try:
             logger.info(f"Starting authentication for email: {user_login_dto.email}")
@@ -20,85 +36,98 @@ class AuthenticateUserUseCase:
                 logger.warning(f"Login attempt failed: No user found with email {user_login_dto.email}")
                 return None
             
+            if self.login_throttle is not None:
+                await self.login_throttle.check_tenant(user.tenant_id)
+
             logger.info(f"User found: {user.email}, checking password...")
             
             # Verify the password
-            is_password_valid = PasswordService.verify_password(user_login_dto.password, user.hashed_password)
+            is_password_valid = await self.password_service.verify_password(
+                user_login_dto.password, user.hashed_password
+            )
             if not is_password_valid:
                 logger.warning(f"Login attempt failed: Invalid password for user {user.email}")
                 return None
                 
             logger.info(f"Password verified for user: {user.email}")
+
+            if self.password_service.needs_rehash(user.hashed_password):
+                await self._rehash(user, user_login_dto.password)
             logger.info(f"User {user.email} authenticated successfully")
             
             # Log user details (excluding sensitive info)
             logger.debug(f"User details - ID: {user.id}, Email: {user.email}, Tenant ID: {user.tenant_id}")
             
             return user
-            
+
+        except PasswordServiceBusyError:
+            logger.warning(f"Password service saturated, rejecting login for {user_login_dto.email}")
+            raise
+        except RateLimitExceededError as e:
+            logger.warning(f"Login throttled for {user_login_dto.email} ({e.scope})")
+            raise
         except Exception as e:
             logger.error(f"Authentication error for email {user_login_dto.email}", exc_info=True)
             return None
 
+    async def _rehash(self, user: User, password: str) -> None:
+        # Upgrade the stored hash to the current cost; never fail the login over it
+        try:
+            user.hashed_password = await self.password_service.get_password_hash(password)
+            await self.user_repository.update_password_hash(user.id, user.hashed_password)
+            logger.info(f"Rehashed password for user {user.email} at cost {self.password_service.rounds}")
+        except Exception as e:
+            logger.warning(f"Could not rehash password for user {user.email}: {str(e)}")
+
 class RegisterUserUseCase:
-    def __init__(self, user_repository: UserRepository, tenant_repository: TenantRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_service: AsyncPasswordService,
+        tenant_repository: TenantRepository,
+        tenant_directory: TenantDirectory
+    ):
         self.user_repository = user_repository
+        self.password_service = password_service
         self.tenant_repository = tenant_repository
+        self.tenant_directory = tenant_directory
 
+    @traced_use_case
     async def execute(self, user_create_dto: UserCreateDTO) -> UserDTO:
         logger.info(f"Starting registration for user: {user_create_dto.email}")
         
         try:
-            # Check if user with this email already exists
-            logger.info(f"Checking if email {user_create_dto.email} is already registered")
-            existing_user = await self.user_repository.get_by_email(user_create_dto.email)
-            if existing_user:
-                error_msg = f"A user with email {user_create_dto.email} already exists"
-                logger.warning(error_msg)
-                raise ValueError(error_msg)
-
-            # Check if username is taken
-            logger.info(f"Checking if username {user_create_dto.username} is available")
-            existing_username = await self.user_repository.get_by_username(user_create_dto.username)
-            if existing_username:
-                error_msg = f"Username {user_create_dto.username} is already taken"
-                logger.warning(error_msg)
-                raise ValueError(error_msg)
-
-            # Check if tenant exists, if not create it
-            logger.info(f"Checking for existing tenant with domain: {user_create_dto.tenant_domain}")
-            tenant = await self.tenant_repository.get_by_domain(user_create_dto.tenant_domain)
-            
-            if not tenant:
-                logger.info(f"Creating new tenant: {user_create_dto.tenant_name} ({user_create_dto.tenant_domain})")
+            # Hash before touching the database so no transaction is held open during bcrypt
+            logger.info("Hashing password...")
+            hashed_password = await self.password_service.get_password_hash(user_create_dto.password)
+
+            if self.tenant_directory.refresh_due():
+                await self.tenant_directory.refresh(self.tenant_repository)
+            # A known domain skips the tenant insert and lookup; an unknown one may still
+            # exist if another worker created it since the last refresh
+            tenant = self.tenant_directory.by_domain(user_create_dto.tenant_domain)
+            tenant_exists = tenant is not None
+            if not tenant_exists:
                 tenant = Tenant(
                     name=user_create_dto.tenant_name,
                     domain=user_create_dto.tenant_domain
                 )
-                await self.tenant_repository.add(tenant)
-                role = 'admin'
-                logger.info(f"Created new tenant with ID: {tenant.id}")
-            else:
-                role = 'user'
-                logger.info(f"Using existing tenant ID: {tenant.id}")
-
-            # Create the new user
-            logger.info("Hashing password...")
-            hashed_password = PasswordService.get_password_hash(user_create_dto.password)
-            
-            logger.info("Creating user object...")
             new_user = User(
                 tenant_id=tenant.id,
                 username=user_create_dto.username,
                 email=user_create_dto.email,
                 hashed_password=hashed_password,
-                role=role
+                role='user'
             )
+
+            # The tenant is created if its domain is new, and its first user becomes admin.
+            # Duplicate emails and usernames are rejected by the unique constraints.
+            logger.info(f"Saving user and tenant {user_create_dto.tenant_domain} to database...")
+            await self.user_repository.add_with_tenant(new_user, tenant, owner_role='admin', tenant_exists=tenant_exists)
+            if not tenant_exists:
+                self.tenant_directory.apply([tenant])
             
-            logger.info("Saving user to database...")
-            await self.user_repository.add(new_user)
-            
-            logger.info(f"User {new_user.email} registered successfully with ID: {new_user.id}")
+            logger.info(f"User {new_user.email} registered successfully with ID: {new_user.id} as {new_user.role}")
             
             # Convert to DTO for response
             user_dto = UserDTO.model_validate(new_user)
@@ -107,3 +136,104 @@ class RegisterUserUseCase:
         except Exception as e:
             logger.error(f"Error during user registration: {str(e)}", exc_info=True)
             raise
+
+class ChangeUserRoleUseCase:
+    def __init__(self, user_repository: UserRepository, revoke_user_tokens_use_case: RevokeUserTokensUseCase):
+        self.user_repository = user_repository
+        self.revoke_user_tokens_use_case = revoke_user_tokens_use_case
+
+    @traced_use_case
+    async def execute(self, user_id: uuid.UUID, tenant_id: uuid.UUID, role: str, token_lifetime: timedelta) -> User | None:
+        """
+        Change a user's role and revoke access tokens that still carry the old one.
+
+        Args:
+            user_id: The user to update
+            tenant_id: The caller's tenant (for authorization)
+            role: The new role
+            token_lifetime: Access token lifetime, bounds how long the revocation is kept
+
+        Returns:
+            The updated user, or None if the user doesn't exist in the tenant
+        """
+        user = await self.user_repository.update_role(user_id, tenant_id, role)
+        if not user:
+            return None
+        await self.revoke_user_tokens_use_case.execute(user.id, user.token_version, token_lifetime)
+        logger.info(f"Changed role of user {user.email} to {role}")
+        return user
+
+class BulkProvisionUsersUseCase:
+    def __init__(self, user_repository: UserRepository, password_service: AsyncPasswordService, batch_size: int):
+        self.user_repository = user_repository
+        self.password_service = password_service
+        self.batch_size = batch_size
+
+    async def execute(
+        self,
+        rows: Iterable[Tuple[int, Optional[dict]]],
+        tenant_id: uuid.UUID
+    ) -> AsyncIterator[dict]:
+        """
+        Create users in a tenant from a stream of rows, one batch at a time.
+
+        Passwords of a batch are hashed in parallel on the password service's
+        pool, then the batch is written with a single multi-row INSERT.
+
+        Args:
+            rows: (row number, row data) pairs; None data marks an unparseable row
+            tenant_id: The tenant the users are created in
+
+        Yields:
+            One result per row: created, duplicate or invalid
+        """
+        batch = []
+        for row_number, data in rows:
+            if data is None:
+                yield {"row": row_number, "status": "invalid", "error": "Malformed row"}
+                continue
+            try:
+                batch.append((row_number, UserImportRowDTO.model_validate(data)))
+            except ValidationError as e:
+                errors = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                yield {"row": row_number, "status": "invalid", "error": errors}
+                continue
+
+            if len(batch) >= self.batch_size:
+                for result in await self._provision(batch, tenant_id):
+                    yield result
+                batch = []
+
+        if batch:
+            for result in await self._provision(batch, tenant_id):
+                yield result
+
+    async def _provision(self, batch: list, tenant_id: uuid.UUID) -> list[dict]:
+        hashes = await asyncio.gather(
+            *(self.password_service.get_password_hash(row.password) for _, row in batch)
+        )
+        users = [
+            User(
+                tenant_id=tenant_id,
+                username=row.username,
+                email=row.email,
+                hashed_password=hashed_password,
+                role=row.role
+            )
+            for (_, row), hashed_password in zip(batch, hashes)
+        ]
+        inserted_ids = await self.user_repository.add_many(users)
+        logger.info(f"Provisioned {len(inserted_ids)} of {len(users)} users in tenant {tenant_id}")
+
+        results = []
+        for (row_number, row), user in zip(batch, users):
+            if user.id in inserted_ids:
+                results.append({"row": row_number, "status": "created", "email": user.email, "id": str(user.id)})
+            else:
+                results.append({
+                    "row": row_number,
+                    "status": "duplicate",
+                    "email": user.email,
+                    "error": "Email or username already exists"
+                })
+        return results
@@ -0,0 +1,152 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from core.config import settings
+
+
+class TTLCache:
+    """A bounded in-process cache with per-entry expiry and LRU eviction.
+
+    Entries live for ``ttl`` seconds and the least recently used entry is
+    evicted once ``maxsize`` is reached. Hit/miss counters are kept so the
+    effectiveness of the cache can be checked through the metrics endpoint.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SizedLRUCache:
+    """An in-process LRU cache bounded by the total size of its values.
+
+    Meant for pre-serialized responses, whose sizes vary too much for an
+    entry count to bound memory. Entries never expire; callers put a version
+    in the key so stale entries stop being read and age out under LRU.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, tuple[int, Any]]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        self.invalidate(key)
+        self._data[key] = (size, value)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (evicted_size, _) = self._data.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Authenticated principals keyed by (email, tenant_id), see api.security.get_current_user.
+# invalidate() only reaches this process; other workers drop a principal once the
+# revocation filter reports its token_version as outdated.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def principal_cache_key(email: str, tenant_id) -> tuple[str, str]:
+    return (email, str(tenant_id))
+
+
+# Whether a project belongs to a tenant, keyed by (project_id, tenant_id); see
+# CheckProjectAccessUseCase. Misses are cached too, for a shorter time, so probing
+# unknown ids does not reach the database on every request. DeleteProjectUseCase
+# invalidates this process only; other workers stop admitting a deleted project once
+# its entry expires.
+project_access_cache = TTLCache(
+    maxsize=settings.PROJECT_ACCESS_CACHE_MAX_SIZE,
+    ttl=settings.PROJECT_ACCESS_CACHE_TTL_SECONDS
+)
+
+
+# Serialized GET /projects/ pages keyed by (tenant_id, data_version, limit, cursor, include_total).
+# Every project write bumps the tenant's data_version in the database, so each
+# worker stops serving an outdated page on its next request without any messaging.
+project_list_cache = SizedLRUCache(max_bytes=settings.PROJECT_LIST_CACHE_MAX_BYTES)
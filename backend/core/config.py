@@ -2,9 +2,92 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Optional read replica for read-only use cases; reads go to the primary when unset
+    DATABASE_READ_URL: str | None = None
+    # After a write, the tenant's reads stay on the primary for this long to see its own writes.
+    # Use the redis store when more than one worker serves the API.
+    READ_YOUR_WRITES_SECONDS: int = 5
+    READ_YOUR_WRITES_BACKEND: str = "memory"  # "memory" or "redis"
+    READ_YOUR_WRITES_REDIS_URL: str | None = None
+    # Logs every statement; for local debugging only, use the slow query log otherwise
+    DB_ECHO: bool = False
+    # Slow query log (infrastructure.query_log): statements over the threshold, plus a sampled fraction
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SQL_LOG_SAMPLE_RATE: float = 0.0
+    # Attach the plan to slow SELECTs; ANALYZE re-runs the statement on PostgreSQL
+    SLOW_QUERY_EXPLAIN: bool = False
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = False
+    # Connection pool (infrastructure.database); ignored for SQLite
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_PRE_PING: bool = True
+    # Recycle connections before the proxy/server idle timeout drops them
+    DB_POOL_RECYCLE_SECONDS: int = 1800
     SECRET_KEY: str = "a_very_secret_key_that_should_be_changed"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # "self_contained" tokens carry id/role/version claims; "lookup" tokens are resolved from the users table
+    ACCESS_TOKEN_MODE: str = "self_contained"
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 5
+    # Tenants created on other workers reach this one's tenant directory within this window
+    TENANT_DIRECTORY_REFRESH_SECONDS: int = 60
+    # Refresh tokens slide forward on every use, up to the absolute session limit
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REFRESH_SESSION_MAX_DAYS: int = 90
+
+    # Authenticated principal cache (api.security.get_current_user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # Project ownership checks for nested task routes (core.cache.project_access_cache).
+    # Other workers only see a project delete once their entry expires, so keep these short.
+    PROJECT_ACCESS_CACHE_TTL_SECONDS: int = 30
+    PROJECT_ACCESS_CACHE_NEGATIVE_TTL_SECONDS: int = 5
+    PROJECT_ACCESS_CACHE_MAX_SIZE: int = 100000
+
+    # Pre-serialized project list pages (core.cache.project_list_cache); 0 disables it
+    PROJECT_LIST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # bcrypt thread pool (application.services.AsyncPasswordService)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    # bcrypt cost: fixed when BCRYPT_ROUNDS is set, otherwise calibrated at startup to BCRYPT_TARGET_MS.
+    # Logins rehash only hashes below BCRYPT_ROUNDS, or BCRYPT_MIN_ROUNDS when calibrating.
+    BCRYPT_ROUNDS: int | None = None
+    BCRYPT_TARGET_MS: int = 250
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 15
+
+    # Project and task listings (keyset pagination); larger requested limits are clamped
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 500
+
+    # Largest batch accepted by POST /projects/{project_id}/tasks/bulk and PATCH .../tasks/batch
+    TASK_BULK_MAX_ITEMS: int = 1000
+
+    # Projects with more tasks than this are hidden at once and purged in the background
+    PROJECT_DELETE_SYNC_MAX_TASKS: int = 5000
+    PROJECT_PURGE_ENABLED: bool = True
+    PROJECT_PURGE_BATCH_SIZE: int = 1000
+    # Pause between purge batches, giving autovacuum and replicas room to keep up
+    PROJECT_PURGE_BATCH_PAUSE_SECONDS: float = 0.5
+    PROJECT_PURGE_IDLE_SECONDS: float = 30.0
+
+    # Bulk user import hashes on its own pool so logins keep their capacity
+    USER_IMPORT_HASH_WORKERS: int = 4
+    USER_IMPORT_BATCH_SIZE: int = 500
+
+    # Login throttling (application.services.LoginThrottle); bucket size and refill per minute
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "redis"
+    LOGIN_RATE_LIMIT_REDIS_URL: str | None = None
+    LOGIN_RATE_LIMIT_IP_BURST: int = 30
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: int = 20
+    LOGIN_RATE_LIMIT_EMAIL_BURST: int = 10
+    LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE: int = 5
+    LOGIN_RATE_LIMIT_TENANT_BURST: int = 200
+    LOGIN_RATE_LIMIT_TENANT_PER_MINUTE: int = 600
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,43 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class PrimaryPinStore(ABC):
+    """
+    Remembers which users wrote recently, so their reads stay on the primary
+    until the replica has caught up. Swap in a shared store to pin across workers.
+    """
+
+    @abstractmethod
+    async def pin(self, key: str, seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    async def is_pinned(self, key: str) -> bool:
+        pass
+
+
+class InMemoryPrimaryPinStore(PrimaryPinStore):
+    """Per-process pins; only correct when a single worker serves the API."""
+
+    def __init__(self, max_keys: int = 100000):
+        self._pins: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+
+    async def pin(self, key: str, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._pins) >= self.max_keys:
+                self._pins = {k: until for k, until in self._pins.items() if until > now}
+            self._pins[key] = now + seconds
+
+    async def is_pinned(self, key: str) -> bool:
+        with self._lock:
+            pinned_until = self._pins.get(key)
+        return pinned_until is not None and pinned_until > time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pins.clear()
@@ -0,0 +1,88 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a rate-limited action is attempted with an empty bucket."""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {scope}")
+        self.scope = scope
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """Token bucket holding up to ``capacity`` tokens, refilled at ``refill_per_second``."""
+    capacity: float
+    refill_per_second: float
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets; swap in a shared backend to limit across workers."""
+
+    @abstractmethod
+    async def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> RateLimitResult:
+        pass
+
+    @abstractmethod
+    async def reset(self) -> None:
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process token buckets spread over independently locked shards.
+
+    Each check touches a single shard and a single bucket, so it is O(1).
+    Every shard holds at most ``max_keys_per_shard`` buckets and drops the
+    least recently used one when full; a dropped bucket simply starts full.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10000):
+        self._shards = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self.max_keys_per_shard = max_keys_per_shard
+
+    async def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> RateLimitResult:
+        index = hash(key) % len(self._shards)
+        shard = self._shards[index]
+        now = time.monotonic()
+        with self._locks[index]:
+            tokens, updated_at = shard.get(key, (policy.capacity, now))
+            tokens = min(policy.capacity, tokens + (now - updated_at) * policy.refill_per_second)
+            if tokens >= cost:
+                result = RateLimitResult(allowed=True)
+                tokens -= cost
+            else:
+                result = RateLimitResult(
+                    allowed=False,
+                    retry_after=(cost - tokens) / policy.refill_per_second
+                )
+            shard[key] = (tokens, now)
+            shard.move_to_end(key)
+            if len(shard) > self.max_keys_per_shard:
+                shard.popitem(last=False)
+        return result
+
+    async def reset(self) -> None:
+        for index, shard in enumerate(self._shards):
+            with self._locks[index]:
+                shard.clear()
+
+    def size(self) -> int:
+        return sum(len(shard) for shard in self._shards)
@@ -0,0 +1,40 @@
+import functools
+from contextvars import ContextVar, Token
+from typing import Optional
+
+# Attribution for SQL instrumentation: which request and use case issued a statement
+_request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+_use_case: ContextVar[Optional[str]] = ContextVar("use_case", default=None)
+
+
+def bind_request_scope(scope: dict) -> Token:
+    return _request_scope.set(scope)
+
+
+def reset_request_scope(token: Token) -> None:
+    _request_scope.reset(token)
+
+
+def current_route() -> Optional[str]:
+    """'METHOD /path/template' of the current request, once routing has matched it."""
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    path = getattr(scope.get("route"), "path", None) or scope.get("path")
+    return f"{scope.get('method')} {path}"
+
+
+def current_use_case() -> Optional[str]:
+    return _use_case.get()
+
+
+def traced_use_case(execute):
+    """Mark a use case's coroutine execute() as the current use case while it runs."""
+    @functools.wraps(execute)
+    async def wrapper(self, *args, **kwargs):
+        token = _use_case.set(type(self).__name__)
+        try:
+            return await execute(self, *args, **kwargs)
+        finally:
+            _use_case.reset(token)
+    return wrapper
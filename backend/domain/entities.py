@@ -20,6 +20,7 @@ class User(BaseModel):
     email: str
     hashed_password: str
     role: str  # e.g., 'admin', 'user'
+    token_version: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     model_config = ConfigDict(from_attributes=True)
@@ -35,6 +36,32 @@ class UserDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TokenRevocation(BaseModel):
+    """Either a single revoked token (jti) or every token of a user below min_token_version."""
+    id: Optional[int] = None
+    jti: Optional[str] = None
+    user_id: Optional[uuid.UUID] = None
+    min_token_version: Optional[int] = None
+    expires_at: datetime
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RefreshToken(BaseModel):
+    """A hashed refresh token; rotated tokens share a family_id for reuse detection."""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    user_id: uuid.UUID
+    family_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    token_hash: str
+    expires_at: datetime
+    session_expires_at: datetime
+    revoked_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class Project(BaseModel):
     id: uuid.UUID = Field(default_factory=uuid.uuid4)
     tenant_id: uuid.UUID
@@ -71,7 +98,9 @@ class Task(BaseModel):
     assignee_id: Optional[uuid.UUID] = None
     assignee: Optional[Assignee] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
     due_date: Optional[datetime] = None
+    version: int = 1
     
     model_config = ConfigDict(from_attributes=True)
     
@@ -1,14 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import uuid
+from datetime import datetime
 
-from .entities import User, Tenant, Project, Task, ProjectUser
+from .entities import User, UserDTO, Tenant, Project, Task, ProjectUser, TokenRevocation, RefreshToken
+
+class UnitOfWork(ABC):
+    """
+    Transaction boundary for a use case. Project, task and membership
+    repositories only flush; the use case commits once through this.
+    """
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
 
-class TenantRepository(ABC):
     @abstractmethod
-    async def add(self, tenant: Tenant) -> None:
+    async def rollback(self) -> None:
         pass
 
+class TenantRepository(ABC):
     @abstractmethod
     async def get_by_id(self, tenant_id: uuid.UUID) -> Optional[Tenant]:
         pass
@@ -17,11 +27,24 @@ class TenantRepository(ABC):
     async def get_by_domain(self, domain: str) -> Optional[Tenant]:
         pass
 
+    @abstractmethod
+    async def get_created_since(self, since: Optional[datetime]) -> List[Tenant]:
+        """Tenants created at or after since; all of them when since is None."""
+        pass
+
 class UserRepository(ABC):
     @abstractmethod
     async def add(self, user: User) -> None:
         pass
 
+    @abstractmethod
+    async def add_with_tenant(self, user: User, tenant: Tenant, owner_role: str, tenant_exists: bool = False) -> None:
+        pass
+
+    @abstractmethod
+    async def add_many(self, users: List[User]) -> Set[uuid.UUID]:
+        pass
+
     @abstractmethod
     async def get_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         pass
@@ -34,6 +57,14 @@ class UserRepository(ABC):
     async def get_by_email(self, email: str) -> Optional[User]:
         pass
 
+    @abstractmethod
+    async def update_password_hash(self, user_id: uuid.UUID, hashed_password: str) -> None:
+        pass
+
+    @abstractmethod
+    async def update_role(self, user_id: uuid.UUID, tenant_id: uuid.UUID, role: str) -> Optional[User]:
+        pass
+
 class ProjectRepository(ABC):
     @abstractmethod
     async def add(self, project: Project) -> None:
@@ -44,15 +75,51 @@ class ProjectRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_tenant_id(self, tenant_id: uuid.UUID) -> List[Project]:
+    async def get_by_tenant_id(
+        self, tenant_id: uuid.UUID, limit: Optional[int] = None, after: Optional[Tuple[datetime, uuid.UUID]] = None
+    ) -> List[Project]:
+        """Projects ordered by (created_at, id), starting after the given key."""
+        pass
+
+    @abstractmethod
+    async def count_by_tenant_id(self, tenant_id: uuid.UUID) -> int:
         pass
 
     @abstractmethod
     async def update(self, project: Project) -> None:
         pass
+
+    @abstractmethod
+    async def update_fields(
+        self, project_id: uuid.UUID, tenant_id: uuid.UUID, changes: Dict[str, Any]
+    ) -> Optional[Project]:
+        """Apply changes to the tenant's project; None when it does not exist."""
+        pass
         
     @abstractmethod
-    async def delete(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> None:
+    async def delete(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def exists(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_data_version(self, tenant_id: uuid.UUID) -> int:
+        """A counter bumped by every write to the tenant's projects."""
+        pass
+
+    @abstractmethod
+    async def count_tasks(self, project_id: uuid.UUID, tenant_id: uuid.UUID, up_to: int) -> int:
+        pass
+
+    @abstractmethod
+    async def mark_deleted(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        """Hide the project at once; its rows are removed later by purge_deleted."""
+        pass
+
+    @abstractmethod
+    async def purge_deleted(self, batch_size: int) -> int:
         pass
 
 class TaskRepository(ABC):
@@ -60,22 +127,65 @@ class TaskRepository(ABC):
     async def add(self, task: Task) -> None:
         pass
 
+    @abstractmethod
+    async def add_many(self, tasks: List[Task], tenant_id: uuid.UUID) -> None:
+        """Insert the tasks and fill in their assignees; raises ValueError for an assignee outside the tenant."""
+        pass
+
     @abstractmethod
     async def get_by_id(self, task_id: uuid.UUID) -> Optional[Task]:
         pass
 
     @abstractmethod
-    async def get_by_project_id(self, project_id: uuid.UUID) -> List[Task]:
+    async def get_by_project_id(
+        self, project_id: uuid.UUID, limit: Optional[int] = None, after: Optional[Tuple[datetime, uuid.UUID]] = None
+    ) -> List[Task]:
+        """Tasks ordered by (created_at, id), starting after the given key."""
+        pass
+
+    @abstractmethod
+    async def count_by_project_id(self, project_id: uuid.UUID) -> int:
+        pass
+
+    @abstractmethod
+    async def get_data_version(self, project_id: uuid.UUID) -> int:
+        """A counter bumped by every write to the project's tasks."""
         pass
 
     @abstractmethod
     async def update(self, task: Task) -> None:
         pass
 
+    @abstractmethod
+    async def update_fields(
+        self, task_id: uuid.UUID, project_id: uuid.UUID, tenant_id: uuid.UUID, changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """
+        Apply changes to the project's task; None when it does not exist or is not at expected_version.
+        Raises ValueError for an assignee outside the tenant.
+        """
+        pass
+
+    @abstractmethod
+    async def update_many(
+        self, project_id: uuid.UUID, tenant_id: uuid.UUID, changes: Dict[uuid.UUID, Dict[str, Any]]
+    ) -> Dict[uuid.UUID, Task]:
+        """
+        Apply per-task changes in one statement; returns the updated tasks of the project by id.
+        Raises ValueError for an assignee outside the tenant.
+        """
+        pass
+
     @abstractmethod
     async def delete(self, task_id: uuid.UUID) -> None:
         pass
 
+    @abstractmethod
+    async def delete_in_project(self, task_id: uuid.UUID, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        """Delete the task if it belongs to the tenant's project; False otherwise."""
+        pass
+
 
 class ProjectUserRepository(ABC):
     @abstractmethod
@@ -87,7 +197,7 @@ class ProjectUserRepository(ABC):
         pass
         
     @abstractmethod
-    async def get_users_by_project(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> List[User]:
+    async def get_users_by_project(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> List[UserDTO]:
         pass
         
     @abstractmethod
@@ -97,3 +207,35 @@ class ProjectUserRepository(ABC):
     @abstractmethod
     async def get_project_user_role(self, project_id: uuid.UUID, user_id: uuid.UUID) -> Optional[str]:
         pass
+
+
+class TokenRevocationRepository(ABC):
+    @abstractmethod
+    async def revoke_token(self, jti: str, expires_at: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def revoke_user_tokens(self, user_id: uuid.UUID, min_token_version: int, expires_at: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def get_active_since(self, last_id: int, created_since: datetime) -> List[TokenRevocation]:
+        pass
+
+
+class RefreshTokenRepository(ABC):
+    @abstractmethod
+    async def add(self, refresh_token: RefreshToken) -> None:
+        pass
+
+    @abstractmethod
+    async def get_with_user(self, token_hash: str) -> Optional[Tuple[RefreshToken, User]]:
+        pass
+
+    @abstractmethod
+    async def rotate(self, old_token_id: uuid.UUID, new_token: RefreshToken) -> bool:
+        pass
+
+    @abstractmethod
+    async def revoke_family(self, family_id: uuid.UUID) -> None:
+        pass
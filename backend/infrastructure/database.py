@@ -1,13 +1,101 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
 import os
 
+from core.config import settings
+from core.metrics import Histogram
+from infrastructure.query_log import QueryLog
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time_ms = Histogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_time_ms.observe((time.perf_counter() - start) * 1000)
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeouts": self.timeouts,
+            "wait_time_ms": self.wait_time_ms.snapshot(),
+        }
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        # SQLite uses its own single-file pools; queue pool sizing does not apply
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+def enable_sqlite_foreign_keys(sync_engine) -> None:
+    """SQLite ignores foreign keys, and so ON DELETE CASCADE, unless each connection opts in."""
+    @event.listens_for(sync_engine, "connect")
+    def _enable(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def enable_sqlite_transactions(sync_engine) -> None:
+    """
+    Have SQLite transactions start with SQLAlchemy's, not the driver's guess.
+
+    The sqlite3 module only opens a transaction before a statement starting with
+    INSERT, UPDATE, DELETE or REPLACE, so a WITH ... UPDATE ran in autocommit
+    and survived a rollback.
+    """
+    @event.listens_for(sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(sync_engine, "begin")
+    def _begin(conn):
+        # A single shared connection (StaticPool) may already be inside one
+        if not conn.connection.driver_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN")
+
+query_log = QueryLog(
+    slow_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SQL_LOG_SAMPLE_RATE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    explain_analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE
+)
+
+engine = create_async_engine(DATABASE_URL, echo=settings.DB_ECHO, **_engine_options(DATABASE_URL))
+query_log.attach(engine.sync_engine)
+if DATABASE_URL.startswith("sqlite"):
+    enable_sqlite_foreign_keys(engine.sync_engine)
+    enable_sqlite_transactions(engine.sync_engine)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -15,6 +103,33 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+DATABASE_READ_URL = settings.DATABASE_READ_URL
+
+# Replica engine for read-only use cases; None when reads stay on the primary
+read_engine = (
+    create_async_engine(DATABASE_READ_URL, echo=settings.DB_ECHO, **_engine_options(DATABASE_READ_URL))
+    if DATABASE_READ_URL else None
+)
+if read_engine is not None:
+    query_log.attach(read_engine.sync_engine)
+
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if read_engine is not None else None
+
+def pool_stats(target_engine=None) -> dict:
+    """Live connection pool counters for the metrics endpoint."""
+    pool = (target_engine or engine).pool
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        return pool.stats()
+    return {"pool_class": type(pool).__name__, "status": pool.status()}
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+def get_session_factory():
+    """Session factory for work that outlives the request, such as streamed responses."""
+    return AsyncSessionLocal
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Table
+from sqlalchemy import Column, String, DateTime, ForeignKey, Table, Integer, BigInteger, Index
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -12,6 +12,8 @@ class TenantModel(Base):
     name = Column(String, nullable=False)
     domain = Column(String, unique=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped with every project write; versions the cached project lists of the tenant
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     users = relationship("UserModel", back_populates="tenant")
     projects = relationship("ProjectModel", back_populates="tenant")
@@ -24,8 +26,13 @@ class UserModel(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     role = Column(String, nullable=False)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_users_tenant_id", "tenant_id"),
+    )
+
     tenant = relationship("TenantModel", back_populates="users")
     assigned_tasks = relationship("TaskModel", back_populates="assignee")
     projects = relationship("ProjectUserModel", back_populates="user")
@@ -38,21 +45,42 @@ class ProjectModel(Base):
     description = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set when a large project is deleted; its rows are purged in the background
+    deleted_at = Column(DateTime)
+    # Bumped with every task write; versions the project's task listings for ETags
+    tasks_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Tenant listings, ordered for keyset pagination
+        Index("ix_projects_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        # The purge worker's queue; stays tiny because only pending purges are indexed
+        Index("ix_projects_deleted_at", "deleted_at", postgresql_where=deleted_at.isnot(None)),
+    )
 
     tenant = relationship("TenantModel", back_populates="projects")
-    tasks = relationship("TaskModel", back_populates="project", cascade="all, delete-orphan")
-    users = relationship("ProjectUserModel", back_populates="project", cascade="all, delete-orphan")
+    # The foreign keys cascade, so the ORM leaves child rows to the database
+    tasks = relationship("TaskModel", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    users = relationship("ProjectUserModel", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
 
 class TaskModel(Base):
     __tablename__ = "tasks"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     title = Column(String, nullable=False)
     description = Column(String)
     status = Column(String, nullable=False)
     assignee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     due_date = Column(DateTime)
+    # Bumped by every update; compared against If-Match for optimistic concurrency
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        # Project listings, ordered for keyset pagination
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_tasks_assignee_id", "assignee_id"),
+    )
 
     project = relationship("ProjectModel", back_populates="tasks")
     assignee = relationship("UserModel", back_populates="assigned_tasks")
@@ -61,10 +89,40 @@ class TaskModel(Base):
 class ProjectUserModel(Base):
     __tablename__ = "project_users"
     
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), primary_key=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
     role = Column(String, nullable=False, default="member")
     joined_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # The primary key leads with project_id; this serves user -> projects lookups
+        Index("ix_project_users_user_id", "user_id"),
+    )
     
     project = relationship("ProjectModel", back_populates="users")
     user = relationship("UserModel", back_populates="projects")
+
+
+class TokenRevocationModel(Base):
+    __tablename__ = "token_revocations"
+
+    # Monotonic id so workers can load new revocations incrementally
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    jti = Column(String, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
+    min_token_version = Column(Integer)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RefreshTokenModel(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash = Column(String, unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    session_expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,24 +1,24 @@
 from typing import List, Optional
 import uuid
-from sqlalchemy import select, and_, delete
+from sqlalchemy import select, insert, and_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from domain.entities import User, ProjectUser, Project
+from domain.entities import UserDTO, ProjectUser, Project
 from domain.repositories import ProjectUserRepository
-from infrastructure.models import UserModel, ProjectUserModel
+from infrastructure.models import UserModel, ProjectModel, ProjectUserModel
+from infrastructure.row_mapping import PROJECT_COLUMNS, USER_DTO_COLUMNS, project_from_row, user_dto_from_row
 
 class ProjectUserRepositoryImpl(ProjectUserRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def add_user_to_project(self, project_id: uuid.UUID, user_id: uuid.UUID, role: str = 'member') -> None:
-        project_user = ProjectUserModel(
+        stmt = insert(ProjectUserModel).values(
             project_id=project_id,
             user_id=user_id,
             role=role
         )
-        self.session.add(project_user)
-        await self.session.commit()
+        await self.session.execute(stmt)
 
     async def remove_user_from_project(self, project_id: uuid.UUID, user_id: uuid.UUID) -> None:
         stmt = delete(ProjectUserModel).where(
@@ -28,11 +28,11 @@ class ProjectUserRepositoryImpl(ProjectUserRepository):
             )
         )
         await self.session.execute(stmt)
-        await self.session.commit()
 
-    async def get_users_by_project(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> List[User]:
+    async def get_users_by_project(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> List[UserDTO]:
+        # Only the public columns: member listings never load password hashes
         stmt = (
-            select(UserModel)
+            select(*USER_DTO_COLUMNS)
             .join(ProjectUserModel, UserModel.id == ProjectUserModel.user_id)
             .where(
                 and_(
@@ -42,21 +42,17 @@ class ProjectUserRepositoryImpl(ProjectUserRepository):
             )
         )
         result = await self.session.execute(stmt)
-        users = result.scalars().all()
-        return [User.model_validate(user.__dict__) for user in users]
+        return [user_dto_from_row(row) for row in result]
 
     async def get_projects_by_user(self, user_id: uuid.UUID) -> List[Project]:
-        from infrastructure.models import ProjectModel  # Import here to avoid circular imports
-        
         stmt = (
-            select(ProjectModel)
+            select(*PROJECT_COLUMNS)
             .join(ProjectUserModel, ProjectModel.id == ProjectUserModel.project_id)
-            .where(ProjectUserModel.user_id == user_id)
+            .where(ProjectUserModel.user_id == user_id, ProjectModel.deleted_at.is_(None))
         )
         
         result = await self.session.execute(stmt)
-        projects = result.scalars().all()
-        return [Project.model_validate(project.__dict__) for project in projects] if projects else []
+        return [project_from_row(row) for row in result]
 
     async def get_project_user_role(self, project_id: uuid.UUID, user_id: uuid.UUID) -> Optional[str]:
         stmt = select(ProjectUserModel.role).where(
@@ -0,0 +1,113 @@
+import logging
+import random
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.metrics import Histogram
+from core.tracing import current_route, current_use_case
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_STATEMENT_CHARS = 2000
+
+class QueryLog:
+    """
+    Times every statement through cursor events and logs only the slow ones,
+    plus a random sample of the rest, tagged with the route and use case.
+
+    Parameters are never logged; they can hold password hashes and tokens.
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float,
+        sample_rate: float = 0.0,
+        explain: bool = False,
+        explain_analyze: bool = False
+    ):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.sample_rate = sample_rate
+        self.explain = explain
+        self.explain_analyze = explain_analyze
+        self.query_time_ms = Histogram()
+        self.slow_count = 0
+        self.sampled_count = 0
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_log_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_log_start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.query_time_ms.observe(elapsed_ms)
+
+        if elapsed_ms >= self.slow_threshold_ms:
+            self.slow_count += 1
+            plan = self._explain(conn, statement, parameters) if self.explain else None
+            logger.warning(
+                "Slow query %.1f ms route=%s use_case=%s: %s%s",
+                elapsed_ms, current_route(), current_use_case(),
+                statement[:MAX_LOGGED_STATEMENT_CHARS],
+                f"\nPlan:\n{plan}" if plan else ""
+            )
+        elif self.sample_rate and random.random() < self.sample_rate:
+            self.sampled_count += 1
+            logger.info(
+                "Sampled query %.1f ms route=%s use_case=%s: %s",
+                elapsed_ms, current_route(), current_use_case(),
+                statement[:MAX_LOGGED_STATEMENT_CHARS]
+            )
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[str]:
+        # ANALYZE runs the statement again, so plans are only taken for plain reads
+        if not statement.lstrip()[:6].upper() == "SELECT":
+            return None
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if self.explain_analyze else "EXPLAIN "
+        elif dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            return None
+
+        # A raw DBAPI cursor keeps the EXPLAIN itself out of these events; the
+        # savepoint keeps a failed EXPLAIN from aborting the caller's transaction.
+        use_savepoint = dialect == "postgresql"
+        cursor = conn.connection.cursor()
+        try:
+            if use_savepoint:
+                cursor.execute("SAVEPOINT query_log_explain")
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+            if use_savepoint:
+                cursor.execute("RELEASE SAVEPOINT query_log_explain")
+        except Exception as e:
+            logger.debug(f"EXPLAIN failed for slow query: {e}")
+            if use_savepoint:
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+                except Exception:
+                    pass
+            return None
+        finally:
+            cursor.close()
+        return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+    def stats(self) -> dict:
+        return {
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "sample_rate": self.sample_rate,
+            "slow": self.slow_count,
+            "sampled": self.sampled_count,
+            "query_time_ms": self.query_time_ms.snapshot(),
+        }
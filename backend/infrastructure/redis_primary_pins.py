@@ -0,0 +1,19 @@
+from core.primary_pins import PrimaryPinStore
+
+
+class RedisPrimaryPinStore(PrimaryPinStore):
+    """Pins shared by every worker through Redis keys that expire on their own. Requires the ``redis`` package."""
+
+    def __init__(self, url: str, key_prefix: str = "pms:primary-pin:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The redis package is required for the redis primary pin store") from e
+        self._client = redis.from_url(url)
+        self.key_prefix = key_prefix
+
+    async def pin(self, key: str, seconds: float) -> None:
+        await self._client.set(self.key_prefix + key, 1, px=max(1, int(seconds * 1000)))
+
+    async def is_pinned(self, key: str) -> bool:
+        return bool(await self._client.exists(self.key_prefix + key))
@@ -0,0 +1,49 @@
+from core.rate_limit import BucketPolicy, RateLimitBackend, RateLimitResult
+
+# Refill and consume atomically on the Redis server, using its clock so all workers agree
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Token buckets shared by every worker through Redis. Requires the ``redis`` package."""
+
+    def __init__(self, url: str, key_prefix: str = "pms:ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The redis package is required for the redis rate limit backend") from e
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+        self.key_prefix = key_prefix
+
+    async def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> RateLimitResult:
+        allowed, retry_after = await self._script(
+            keys=[self.key_prefix + key],
+            args=[policy.capacity, policy.refill_per_second, cost]
+        )
+        return RateLimitResult(allowed=bool(int(allowed)), retry_after=float(retry_after))
+
+    async def reset(self) -> None:
+        async for key in self._client.scan_iter(match=self.key_prefix + "*"):
+            await self._client.delete(key)
@@ -1,30 +1,46 @@
 import logging
-from typing import List, Optional, Dict, Any
+import re
+from typing import List, Optional, Dict, Any, Set, Tuple
 import uuid
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import select, insert, update, delete, and_, func, tuple_, values, column, case, literal, Boolean
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 
-from domain.entities import User, Tenant, Project, Task
+from core.cache import principal_cache, principal_cache_key
+from domain.entities import User, Tenant, Project, Task, Assignee
 from domain.repositories import UserRepository, TenantRepository, ProjectRepository, TaskRepository
 from infrastructure.models import UserModel, TenantModel, ProjectModel, TaskModel, ProjectUserModel
+from infrastructure.row_mapping import (
+    PROJECT_COLUMNS, TASK_COLUMNS, ASSIGNEE_COLUMNS, USER_COLUMNS,
+    TENANT_COLUMNS, tenant_assignee_columns, project_from_row, task_from_row, tenant_from_row, user_from_row
+)
+
+logger = logging.getLogger(__name__)
+
+def _dialect_insert(session: AsyncSession, model):
+    """An INSERT construct supporting ON CONFLICT for the session's database."""
+    if session.bind.dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+def _keyset_page(stmt, model, limit: Optional[int], after: Optional[Tuple[datetime, uuid.UUID]]):
+    """Order by (created_at, id) and seek past `after`, so each page is one index range scan."""
+    stmt = stmt.order_by(model.created_at, model.id)
+    if after is not None:
+        stmt = stmt.where(tuple_(model.created_at, model.id) > tuple_(*after))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+_DUPLICATE_USERNAME = re.compile(r"users\.username|users_username|\(username\)")
+_DUPLICATE_EMAIL = re.compile(r"users\.email|users_email|\(email\)")
 
 class TenantRepositoryImpl(TenantRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def add(self, tenant: Tenant) -> None:
-        tenant_dict = tenant.model_dump()
-        tenant_model = TenantModel(**tenant_dict)
-        self.session.add(tenant_model)
-        await self.session.commit()
-        # Refresh the model to get the generated ID
-        await self.session.refresh(tenant_model)
-        # Update the original tenant with the database-generated values
-        tenant.id = tenant_model.id
-        tenant.created_at = tenant_model.created_at
-
     async def get_by_id(self, tenant_id: uuid.UUID) -> Optional[Tenant]:
         result = await self.session.get(TenantModel, tenant_id)
         if not result:
@@ -39,6 +55,13 @@ class TenantRepositoryImpl(TenantRepository):
             return None
         return Tenant.model_validate(tenant.__dict__)
 
+    async def get_created_since(self, since: Optional[datetime]) -> List[Tenant]:
+        stmt = select(*TENANT_COLUMNS)
+        if since is not None:
+            stmt = stmt.where(TenantModel.created_at >= since)
+        result = await self.session.execute(stmt)
+        return [tenant_from_row(row) for row in result]
+
 class UserRepositoryImpl(UserRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -53,238 +76,519 @@ class UserRepositoryImpl(UserRepository):
         # Update the original user with the database-generated values
         user.id = user_model.id
         user.created_at = user_model.created_at
+        principal_cache.invalidate(principal_cache_key(user.email, user.tenant_id))
+
+    async def add_with_tenant(self, user: User, tenant: Tenant, owner_role: str, tenant_exists: bool = False) -> None:
+        """
+        Insert the tenant unless its domain is taken, then the user, in one transaction.
+        With tenant_exists, the caller already resolved the tenant and only the user is inserted.
+
+        Uniqueness is left to the database constraints: a duplicate email or
+        username surfaces as ValueError, with nothing written.
+        """
+        try:
+            if not tenant_exists:
+                tenant_stmt = (
+                    _dialect_insert(self.session, TenantModel)
+                    .values(**tenant.model_dump())
+                    .on_conflict_do_nothing(index_elements=[TenantModel.domain])
+                    .returning(TenantModel.id, TenantModel.created_at)
+                )
+                created = (await self.session.execute(tenant_stmt)).one_or_none()
+                if created:
+                    tenant.id, tenant.created_at = created
+                    user.role = owner_role
+                else:
+                    existing = await self.session.execute(
+                        select(TenantModel.id, TenantModel.name, TenantModel.created_at)
+                        .where(TenantModel.domain == tenant.domain)
+                    )
+                    tenant.id, tenant.name, tenant.created_at = existing.one()
+            user.tenant_id = tenant.id
+
+            user_stmt = (
+                _dialect_insert(self.session, UserModel)
+                .values(**user.model_dump())
+                .returning(UserModel.id, UserModel.created_at)
+            )
+            user.id, user.created_at = (await self.session.execute(user_stmt)).one()
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            message = str(e.orig)
+            if _DUPLICATE_USERNAME.search(message):
+                raise ValueError(f"Username {user.username} is already taken") from e
+            if _DUPLICATE_EMAIL.search(message):
+                raise ValueError(f"A user with email {user.email} already exists") from e
+            raise
+        principal_cache.invalidate(principal_cache_key(user.email, user.tenant_id))
+
+    async def add_many(self, users: List[User]) -> Set[uuid.UUID]:
+        """
+        Insert users with one multi-row statement, skipping any that collide with
+        an existing email or username.
+
+        Returns:
+            The ids of the users that were inserted
+        """
+        if not users:
+            return set()
+        stmt = (
+            _dialect_insert(self.session, UserModel)
+            .values([user.model_dump() for user in users])
+            .on_conflict_do_nothing()
+            .returning(UserModel.id)
+        )
+        result = await self.session.execute(stmt)
+        inserted_ids = set(result.scalars().all())
+        await self.session.commit()
+        return inserted_ids
+
+    async def _get_one(self, *criteria) -> Optional[User]:
+        result = await self.session.execute(select(*USER_COLUMNS).where(*criteria))
+        row = result.one_or_none()
+        return user_from_row(row) if row else None
 
     async def get_by_id(self, user_id: uuid.UUID) -> Optional[User]:
-        result = await self.session.get(UserModel, user_id)
-        if not result:
-            return None
-        return User.model_validate(result.__dict__)
+        return await self._get_one(UserModel.id == user_id)
 
     async def get_by_username(self, username: str) -> Optional[User]:
-        stmt = select(UserModel).where(UserModel.username == username)
-        result = await self.session.execute(stmt)
-        user = result.scalar_one_or_none()
+        return await self._get_one(UserModel.username == username)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        user = await self._get_one(UserModel.email == email)
         if not user:
+            logger.debug(f"[UserRepository] No user found with email: {email}")
+        return user
+
+    async def update_password_hash(self, user_id: uuid.UUID, hashed_password: str) -> None:
+        stmt = (
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(hashed_password=hashed_password)
+            .returning(UserModel.email, UserModel.tenant_id)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        await self.session.commit()
+        if row:
+            principal_cache.invalidate(principal_cache_key(row.email, row.tenant_id))
+
+    async def update_role(self, user_id: uuid.UUID, tenant_id: uuid.UUID, role: str) -> Optional[User]:
+        # Bumping token_version invalidates self-contained tokens carrying the old role
+        stmt = (
+            update(UserModel)
+            .where(UserModel.id == user_id, UserModel.tenant_id == tenant_id)
+            .values(role=role, token_version=UserModel.token_version + 1)
+            .returning(UserModel)
+        )
+        result = await self.session.execute(stmt)
+        user_model = result.scalar_one_or_none()
+        if not user_model:
             return None
-        return User.model_validate(user.__dict__)
+        user = User.model_validate(user_model)
+        await self.session.commit()
+        principal_cache.invalidate(principal_cache_key(user.email, user.tenant_id))
+        return user
 
-    async def get_by_email(self, email: str) -> Optional[User]:
-        logger = logging.getLogger(__name__)
-        logger.info(f"[UserRepository] Looking up user with email: {email}")
-        try:
-            stmt = select(UserModel).where(UserModel.email == email)
-            logger.debug(f"[UserRepository] Executing query: {stmt}")
-            
-            result = await self.session.execute(stmt)
-            user = result.scalar_one_or_none()
-            
-            if not user:
-                logger.warning(f"[UserRepository] No user found with email: {email}")
-                return None
-                
-            logger.info(f"[UserRepository] Found user: {user.email}, ID: {user.id}")
-            logger.debug(f"[UserRepository] User data: {user.__dict__}")
-            
-            user_dict = user.__dict__.copy()
-            # Remove SQLAlchemy instance state before validation
-            user_dict.pop('_sa_instance_state', None)
-            
-            try:
-                validated_user = User.model_validate(user_dict)
-                logger.debug(f"[UserRepository] Successfully validated user: {validated_user}")
-                return validated_user
-            except Exception as validation_error:
-                logger.error(f"[UserRepository] Validation error for user {email}: {str(validation_error)}")
-                logger.debug(f"[UserRepository] User dict that failed validation: {user_dict}")
-                raise
-                
-        except Exception as e:
-            logger.error(f"[UserRepository] Error looking up user with email {email}: {str(e)}", exc_info=True)
-            raise
+# Projects marked deleted are invisible to the API while their rows are purged
+_live_project = ProjectModel.deleted_at.is_(None)
 
 class ProjectRepositoryImpl(ProjectRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def _bump_data_version(self, tenant_id: uuid.UUID) -> None:
+        # Commits with the project write, so no worker can cache the new list under the old version
+        stmt = (
+            update(TenantModel)
+            .where(TenantModel.id == tenant_id)
+            .values(data_version=TenantModel.data_version + 1)
+        )
+        await self.session.execute(stmt)
+
+    async def get_data_version(self, tenant_id: uuid.UUID) -> int:
+        stmt = select(TenantModel.data_version).where(TenantModel.id == tenant_id)
+        return (await self.session.execute(stmt)).scalar_one_or_none() or 0
+
     async def add(self, project: Project) -> None:
         # Exclude updated_at as it's managed by SQLAlchemy's onupdate
         project_dict = project.model_dump(exclude={'updated_at'})
-        project_model = ProjectModel(**project_dict)
-        self.session.add(project_model)
-        await self.session.commit()
-        await self.session.refresh(project_model)
-        project.id = project_model.id
-        project.created_at = project_model.created_at
-        project.updated_at = project_model.updated_at
+        stmt = (
+            insert(ProjectModel)
+            .values(**project_dict)
+            .returning(ProjectModel.created_at, ProjectModel.updated_at)
+        )
+        result = await self.session.execute(stmt)
+        project.created_at, project.updated_at = result.one()
+        await self._bump_data_version(project.tenant_id)
 
     async def get_by_id(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> Optional[Project]:
-        stmt = select(ProjectModel).where(
+        stmt = select(*PROJECT_COLUMNS).where(
             ProjectModel.id == project_id,
-            ProjectModel.tenant_id == tenant_id
+            ProjectModel.tenant_id == tenant_id,
+            _live_project
         )
         result = await self.session.execute(stmt)
-        project = result.scalar_one_or_none()
-        if not project:
-            return None
-        # Convert SQLAlchemy model to dict and ensure all fields are included
-        project_dict = {c.name: getattr(project, c.name) for c in project.__table__.columns}
-        return Project.model_validate(project_dict)
+        row = result.one_or_none()
+        return project_from_row(row) if row else None
+
+    async def exists(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        stmt = select(ProjectModel.id).where(
+            ProjectModel.id == project_id, ProjectModel.tenant_id == tenant_id, _live_project
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none() is not None
 
-    async def get_by_tenant_id(self, tenant_id: uuid.UUID) -> List[Project]:
-        stmt = select(ProjectModel).where(ProjectModel.tenant_id == tenant_id)
+    async def get_by_tenant_id(
+        self, tenant_id: uuid.UUID, limit: Optional[int] = None, after: Optional[Tuple[datetime, uuid.UUID]] = None
+    ) -> List[Project]:
+        stmt = select(*PROJECT_COLUMNS).where(ProjectModel.tenant_id == tenant_id, _live_project)
+        stmt = _keyset_page(stmt, ProjectModel, limit, after)
         result = await self.session.execute(stmt)
-        projects = result.scalars().all()
-        # Convert SQLAlchemy models to dicts and ensure all fields are included
-        return [Project.model_validate({c.name: getattr(p, c.name) for c in p.__table__.columns}) for p in projects]
+        return [project_from_row(row) for row in result]
+
+    async def count_by_tenant_id(self, tenant_id: uuid.UUID) -> int:
+        stmt = select(func.count()).select_from(ProjectModel).where(ProjectModel.tenant_id == tenant_id, _live_project)
+        return (await self.session.execute(stmt)).scalar_one()
 
     async def update(self, project: Project) -> Project:
-        # First get the existing project to ensure it exists and get the current values
-        stmt = select(ProjectModel).where(
-            ProjectModel.id == project.id,
-            ProjectModel.tenant_id == project.tenant_id
+        project_dict = project.model_dump(
+            exclude_unset=True, exclude={'id', 'tenant_id', 'created_at', 'updated_at'}
+        )
+        # The updated_at field is automatically updated by SQLAlchemy's onupdate
+        stmt = (
+            update(ProjectModel)
+            .where(
+                ProjectModel.id == project.id,
+                ProjectModel.tenant_id == project.tenant_id,
+                _live_project
+            )
+            .values(**project_dict)
+            .returning(ProjectModel.created_at, ProjectModel.updated_at)
         )
         result = await self.session.execute(stmt)
-        project_model = result.scalar_one_or_none()
-        
-        if not project_model:
+        row = result.one_or_none()
+        if row is None:
             raise ValueError(f"Project with ID {project.id} not found or access denied")
-        
-        # Update the project model with the new values
-        project_dict = project.model_dump(exclude_unset=True, exclude={'updated_at'})
-        for key, value in project_dict.items():
-            if key != 'id' and key != 'tenant_id' and key != 'created_at':
-                setattr(project_model, key, value)
-        
-        # The updated_at field is automatically updated by SQLAlchemy's onupdate
-        
-        await self.session.commit()
-        await self.session.refresh(project_model)
-        
-        # Update the original project with any database-generated values
-        project.updated_at = project_model.updated_at
-        project.created_at = project_model.created_at
-        
+        await self._bump_data_version(project.tenant_id)
+
+        # Update the original project with the database-generated values
+        project.created_at, project.updated_at = row
         return project
 
+    async def update_fields(
+        self, project_id: uuid.UUID, tenant_id: uuid.UUID, changes: Dict[str, Any]
+    ) -> Optional[Project]:
+        # One tenant-scoped statement; no row means missing or another tenant's project
+        if not changes:
+            return await self.get_by_id(project_id, tenant_id)
+        stmt = (
+            update(ProjectModel)
+            .where(ProjectModel.id == project_id, ProjectModel.tenant_id == tenant_id, _live_project)
+            .values(**changes)
+            .returning(*PROJECT_COLUMNS)
+        )
+        row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        await self._bump_data_version(tenant_id)
+        return project_from_row(row)
+
     async def delete(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
-        logger = logging.getLogger(__name__)
-        logger.info(f"Attempting to delete project {project_id} for tenant {tenant_id}")
-        
-        try:
-            # First, verify the project exists and belongs to the tenant
-            stmt = select(ProjectModel).where(
-                ProjectModel.id == project_id,
-                ProjectModel.tenant_id == tenant_id
-            )
-            
-            logger.debug(f"Executing query: {stmt}")
-            result = await self.session.execute(stmt)
-            project = result.scalar_one_or_none()
-            
-            if not project:
-                logger.warning(f"Project {project_id} not found or not accessible by tenant {tenant_id}")
-                return False
-                
-            logger.info(f"Found project {project_id}, proceeding with deletion")
-            
-            # Delete related tasks
-            delete_tasks = delete(TaskModel).where(TaskModel.project_id == project_id)
-            await self.session.execute(delete_tasks)
-            logger.info(f"Deleted tasks for project {project_id}")
-            
-            # Delete project-user associations
-            delete_project_users = delete(ProjectUserModel).where(
-                ProjectUserModel.project_id == project_id
-            )
-            await self.session.execute(delete_project_users)
-            logger.info(f"Deleted project-user associations for project {project_id}")
-            
-            # Finally, delete the project itself
-            await self.session.delete(project)
-            await self.session.commit()
-            
-            logger.info(f"Successfully deleted project {project_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error deleting project {project_id}: {str(e)}", exc_info=True)
-            await self.session.rollback()
-            raise
+        # Tasks and memberships go with it through ON DELETE CASCADE
+        stmt = (
+            delete(ProjectModel)
+            .where(ProjectModel.id == project_id, ProjectModel.tenant_id == tenant_id, _live_project)
+            .returning(ProjectModel.id)
+        )
+        return await self._bump_if_found(stmt, tenant_id)
+
+    async def count_tasks(self, project_id: uuid.UUID, tenant_id: uuid.UUID, up_to: int) -> int:
+        """
+        Count the tenant's project's tasks, stopping at up_to so huge projects cost no more
+        than small ones. Another tenant's project counts as empty.
+        """
+        capped = (
+            select(TaskModel.id)
+            .join(ProjectModel, ProjectModel.id == TaskModel.project_id)
+            .where(TaskModel.project_id == project_id, ProjectModel.tenant_id == tenant_id, _live_project)
+            .limit(up_to)
+            .subquery()
+        )
+        return (await self.session.execute(select(func.count()).select_from(capped))).scalar_one()
+
+    async def mark_deleted(self, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        stmt = (
+            update(ProjectModel)
+            .where(ProjectModel.id == project_id, ProjectModel.tenant_id == tenant_id, _live_project)
+            .values(deleted_at=datetime.utcnow())
+            .returning(ProjectModel.id)
+        )
+        return await self._bump_if_found(stmt, tenant_id)
+
+    async def _bump_if_found(self, stmt, tenant_id: uuid.UUID) -> bool:
+        found = (await self.session.execute(stmt)).scalar_one_or_none() is not None
+        if found:
+            await self._bump_data_version(tenant_id)
+        return found
+
+    async def purge_deleted(self, batch_size: int) -> int:
+        """
+        Delete up to batch_size tasks of the oldest project marked deleted, or the
+        project itself once it has none left. Returns the number of rows deleted.
+        """
+        stmt = select(ProjectModel.id).where(ProjectModel.deleted_at.isnot(None)).order_by(ProjectModel.deleted_at)
+        project_id = (await self.session.execute(stmt.limit(1))).scalar_one_or_none()
+        if project_id is None:
+            return 0
+        # SKIP LOCKED lets purge workers in several processes share one project
+        batch = (
+            select(TaskModel.id)
+            .where(TaskModel.project_id == project_id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(delete(TaskModel).where(TaskModel.id.in_(batch)))
+        if result.rowcount:
+            return result.rowcount
+        result = await self.session.execute(delete(ProjectModel).where(ProjectModel.id == project_id))
+        logger.info(f"Purged deleted project {project_id}")
+        return result.rowcount
 
 class TaskRepositoryImpl(TaskRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def add(self, task: Task) -> None:
-        task_dict = task.model_dump()
-        task_model = TaskModel(**task_dict)
-        self.session.add(task_model)
-        await self.session.commit()
-        await self.session.refresh(task_model)
-        task.id = task_model.id
-        task.created_at = task_model.created_at
-
-    async def get_by_id(self, task_id: uuid.UUID) -> Optional[Task]:
+    async def _bump_tasks_version(self, project_id: uuid.UUID) -> None:
+        # Commits with the task write, so no listing is tagged with a version older than its rows
         stmt = (
-            select(TaskModel)
-            .options(selectinload(TaskModel.assignee))
-            .where(TaskModel.id == task_id)
+            update(ProjectModel)
+            .where(ProjectModel.id == project_id)
+            # Keeps onupdate from touching updated_at; the project itself did not change
+            .values(tasks_version=ProjectModel.tasks_version + 1, updated_at=ProjectModel.updated_at)
         )
+        await self.session.execute(stmt)
+
+    async def get_data_version(self, project_id: uuid.UUID) -> int:
+        stmt = select(ProjectModel.tasks_version).where(ProjectModel.id == project_id)
+        return (await self.session.execute(stmt)).scalar_one_or_none() or 0
+
+    async def add(self, task: Task) -> None:
+        task_dict = task.model_dump(exclude={'assignee'})
+        stmt = insert(TaskModel).values(**task_dict).returning(TaskModel.created_at)
         result = await self.session.execute(stmt)
-        task = result.scalar_one_or_none()
-        if not task:
-            return None
-        
-        task_dict = task.__dict__.copy()
-        if task.assignee:
-            task_dict['assignee'] = task.assignee.__dict__
-        return Task.model_validate(task_dict)
+        task.created_at = result.scalar_one()
+        await self._bump_tasks_version(task.project_id)
+
+    async def add_many(self, tasks: List[Task], tenant_id: uuid.UUID) -> None:
+        """
+        Insert all tasks with one multi-row INSERT ... RETURNING.
 
-    async def get_by_project_id(self, project_id: uuid.UUID) -> List[Task]:
+        The assignee of each task is resolved in the same statement, scoped to the tenant.
+
+        Raises:
+            ValueError: If an assignee does not exist or belongs to another tenant
+        """
+        if not tasks:
+            return
         stmt = (
-            select(TaskModel)
-            .options(selectinload(TaskModel.assignee))
-            .where(TaskModel.project_id == project_id)
+            insert(TaskModel)
+            .values([task.model_dump(exclude={'assignee'}) for task in tasks])
+            .returning(TaskModel.id, TaskModel.created_at, *tenant_assignee_columns(tenant_id))
         )
-        result = await self.session.execute(stmt)
-        tasks = result.scalars().all()
-        
-        task_list = []
+        try:
+            result = await self.session.execute(stmt)
+        except IntegrityError as e:
+            raise ValueError("Invalid assignee: user not found or access denied") from e
+        # RETURNING order is not guaranteed to follow the VALUES order
+        returned = {row.id: row for row in result}
+        for project_id in {task.project_id for task in tasks}:
+            await self._bump_tasks_version(project_id)
         for task in tasks:
-            task_dict = task.__dict__.copy()
-            if task.assignee:
-                task_dict['assignee'] = task.assignee.__dict__
-            task_list.append(Task.model_validate(task_dict))
-            
-        return task_list
+            row = returned[task.id]
+            task.created_at = row.created_at
+            if task.assignee_id is None:
+                continue
+            if row.assignee_username is None:
+                raise ValueError("Invalid assignee: user not found or access denied")
+            task.assignee = Assignee.model_construct(
+                id=task.assignee_id, username=row.assignee_username, email=row.assignee_email
+            )
+
+    @staticmethod
+    def _select_with_assignee(tenant_id: Optional[uuid.UUID] = None):
+        """With tenant_id, an assignee from another tenant is left out of the join."""
+        on = UserModel.id == TaskModel.assignee_id
+        if tenant_id is not None:
+            on = and_(on, UserModel.tenant_id == tenant_id)
+        return select(*TASK_COLUMNS, *ASSIGNEE_COLUMNS).outerjoin(UserModel, on)
+
+    @staticmethod
+    def _check_assignees(rows, changes: Dict[uuid.UUID, Dict[str, Any]]) -> None:
+        """
+        Reject rows whose assignee was set by this write but came back without a tenant
+        assignee column, i.e. a user of another tenant.
+        """
+        for row in rows:
+            if row.assignee_username is None and changes[row.id].get("assignee_id") is not None:
+                raise ValueError("Invalid assignee: user not found or access denied")
+
+    async def get_by_id(self, task_id: uuid.UUID) -> Optional[Task]:
+        stmt = self._select_with_assignee().where(TaskModel.id == task_id)
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return task_from_row(row) if row else None
+
+    async def get_by_project_id(
+        self, project_id: uuid.UUID, limit: Optional[int] = None, after: Optional[Tuple[datetime, uuid.UUID]] = None
+    ) -> List[Task]:
+        stmt = self._select_with_assignee().where(TaskModel.project_id == project_id)
+        stmt = _keyset_page(stmt, TaskModel, limit, after)
+        result = await self.session.execute(stmt)
+        return [task_from_row(row) for row in result]
+
+    async def count_by_project_id(self, project_id: uuid.UUID) -> int:
+        stmt = select(func.count()).select_from(TaskModel).where(TaskModel.project_id == project_id)
+        return (await self.session.execute(stmt)).scalar_one()
 
     async def update(self, task: Task) -> None:
-        # Get the task model from the database
-        task_model = await self.session.get(TaskModel, task.id)
-        if not task_model:
-            raise ValueError(f"Task with ID {task.id} not found")
-            
-        # Convert task to dict and update the model
-        task_dict = task.model_dump(exclude_unset=True)
-        for key, value in task_dict.items():
-            # Skip internal attributes
-            if not key.startswith('_'):
-                setattr(task_model, key, value)
-                
+        task_dict = task.model_dump(exclude_unset=True, exclude={'id', 'assignee', 'version', 'updated_at'})
+        task_dict['version'] = TaskModel.version + 1
+
         # Handle assignee separately if present
-        if hasattr(task, 'assignee') and task.assignee is not None:
-            if not hasattr(task, 'assignee_id') or task.assignee_id is None:
-                task_model.assignee_id = task.assignee.id
-        
-        # Commit the changes
-        self.session.add(task_model)
-        await self.session.commit()
-        await self.session.refresh(task_model)
+        if task.assignee is not None and task.assignee_id is None:
+            task_dict['assignee_id'] = task.assignee.id
+
+        stmt = (
+            update(TaskModel)
+            .where(TaskModel.id == task.id)
+            .values(**task_dict)
+            .returning(TaskModel.project_id)
+        )
+        result = await self.session.execute(stmt)
+        project_id = result.scalar_one_or_none()
+        if project_id is None:
+            raise ValueError(f"Task with ID {task.id} not found")
+        await self._bump_tasks_version(project_id)
+
+    async def update_fields(
+        self, task_id: uuid.UUID, project_id: uuid.UUID, tenant_id: uuid.UUID, changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """
+        A single UPDATE ... RETURNING that bumps the version and also returns the tenant's assignee.
+        With expected_version, a task at any other version is left alone and None is returned.
+
+        Raises:
+            ValueError: If the assignee is unknown or belongs to another tenant; the caller
+                rolls back the statement
+        """
+        criteria = [TaskModel.id == task_id, TaskModel.project_id == project_id]
+        if expected_version is not None:
+            criteria.append(TaskModel.version == expected_version)
+        if not changes:
+            stmt = self._select_with_assignee(tenant_id).where(*criteria)
+        else:
+            stmt = (
+                update(TaskModel)
+                .where(*criteria)
+                .values(**changes, version=TaskModel.version + 1)
+                .returning(*TASK_COLUMNS, *tenant_assignee_columns(tenant_id))
+            )
+        try:
+            row = (await self.session.execute(stmt)).one_or_none()
+        except IntegrityError as e:
+            raise ValueError("Invalid task update: a value violates a constraint") from e
+        if row is None:
+            return None
+        self._check_assignees([row], {task_id: changes})
+        if changes:
+            await self._bump_tasks_version(project_id)
+        return task_from_row(row)
+
+    async def update_many(
+        self, project_id: uuid.UUID, tenant_id: uuid.UUID, changes: Dict[uuid.UUID, Dict[str, Any]]
+    ) -> Dict[uuid.UUID, Task]:
+        """
+        Apply partial updates to many tasks of a project with one UPDATE ... FROM (VALUES ...) RETURNING.
+
+        Each VALUES row carries a new value and a "set" flag per field, so tasks in the
+        batch can change different fields. Tasks outside the project are left out of the result.
+        Assignees are returned only from the tenant's users.
+
+        Raises:
+            ValueError: If a value violates a constraint, or an assignee is unknown or belongs
+                to another tenant; the caller rolls back the statement
+        """
+        fields = sorted({name for task_changes in changes.values() for name in task_changes})
+        if not fields:
+            stmt = self._select_with_assignee(tenant_id).where(
+                TaskModel.id.in_(changes), TaskModel.project_id == project_id
+            )
+        else:
+            # Prefixed names keep the VALUES columns from clashing with tasks' own in RETURNING
+            table = TaskModel.__table__
+            value_columns = [column("task_id", table.c.id.type)]
+            for name in fields:
+                value_columns += [column(f"new_{name}", table.c[name].type), column(f"set_{name}", Boolean)]
+            # Typed binds, even for None, stop Postgres typing an all-NULL VALUES column as text
+            rows = [
+                (task_id, *(
+                    part for name in fields
+                    for part in (literal(task_changes.get(name), table.c[name].type), name in task_changes)
+                ))
+                for task_id, task_changes in changes.items()
+            ]
+            batch = values(*value_columns, name="changes").data(rows).cte("changes")
+            stmt = (
+                update(TaskModel)
+                .where(TaskModel.id == batch.c.task_id, TaskModel.project_id == project_id)
+                .values({
+                    **{
+                        table.c[name]: case((batch.c[f"set_{name}"], batch.c[f"new_{name}"]), else_=table.c[name])
+                        for name in fields
+                    },
+                    table.c.version: table.c.version + 1,
+                })
+                .returning(*TASK_COLUMNS, *tenant_assignee_columns(tenant_id))
+            )
+        try:
+            rows = (await self.session.execute(stmt)).all()
+        except IntegrityError as e:
+            raise ValueError("Invalid task update: a value violates a constraint") from e
+        self._check_assignees(rows, changes)
+        if fields and rows:
+            await self._bump_tasks_version(project_id)
+        return {task.id: task for task in map(task_from_row, rows)}
+
+    async def delete_in_project(self, task_id: uuid.UUID, project_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        """
+        One DELETE scoped to the project and, through it, the tenant.
+        A missing task and another tenant's task cost the same single statement.
+        """
+        tenant_project = select(ProjectModel.id).where(
+            ProjectModel.id == project_id, ProjectModel.tenant_id == tenant_id, _live_project
+        )
+        stmt = (
+            delete(TaskModel)
+            .where(
+                TaskModel.id == task_id,
+                TaskModel.project_id == project_id,
+                TaskModel.project_id.in_(tenant_project)
+            )
+            .returning(TaskModel.id)
+        )
+        if (await self.session.execute(stmt)).scalar_one_or_none() is None:
+            return False
+        await self._bump_tasks_version(project_id)
+        return True
 
     async def delete(self, task_id: uuid.UUID) -> bool:
         task = await self.session.get(TaskModel, task_id)
         if task:
+            project_id = task.project_id
             await self.session.delete(task)
-            await self.session.commit()
+            await self.session.flush()
+            await self._bump_tasks_version(project_id)
             return True
         return False
@@ -0,0 +1,85 @@
+"""
+Read path from Core rows straight to entities.
+
+Repositories select only the columns an entity or DTO needs and map each row
+with model_construct. The rows come from our own schema, so they skip Pydantic
+validation, and no ORM instances are built or added to the identity map.
+"""
+from sqlalchemy import literal_column, select
+from sqlalchemy.engine import Row
+
+from domain.entities import Assignee, Project, Task, Tenant, User, UserDTO
+from infrastructure.models import ProjectModel, TaskModel, TenantModel, UserModel
+
+TENANT_COLUMNS = (TenantModel.id, TenantModel.name, TenantModel.domain, TenantModel.created_at)
+
+PROJECT_COLUMNS = (
+    ProjectModel.id, ProjectModel.tenant_id, ProjectModel.name, ProjectModel.description,
+    ProjectModel.created_at, ProjectModel.updated_at,
+)
+
+TASK_COLUMNS = (
+    TaskModel.id, TaskModel.project_id, TaskModel.title, TaskModel.description, TaskModel.status,
+    TaskModel.assignee_id, TaskModel.created_at, TaskModel.updated_at, TaskModel.due_date, TaskModel.version,
+)
+
+# Selected through an outer join on tasks.assignee_id, replacing a second query per listing
+ASSIGNEE_COLUMNS = (
+    UserModel.username.label("assignee_username"),
+    UserModel.email.label("assignee_email"),
+)
+
+
+# SQLAlchemy does not correlate subqueries in INSERT ... RETURNING and would add tasks to
+# their FROM list, so the row being written is referenced by its qualified column name
+_RETURNED_ASSIGNEE_ID = literal_column(f"{TaskModel.__tablename__}.{TaskModel.assignee_id.key}")
+
+
+def _assignee_subquery(column, name: str, *criteria):
+    stmt = select(column).where(UserModel.id == _RETURNED_ASSIGNEE_ID, *criteria)
+    return stmt.scalar_subquery().label(name)
+
+
+def tenant_assignee_columns(tenant_id):
+    """
+    The assignee columns for INSERT/UPDATE ... RETURNING, which cannot join. Limited to
+    the tenant's users; anyone else comes back NULL, so a write never reveals them.
+    """
+    return (
+        _assignee_subquery(UserModel.username, "assignee_username", UserModel.tenant_id == tenant_id),
+        _assignee_subquery(UserModel.email, "assignee_email", UserModel.tenant_id == tenant_id),
+    )
+
+USER_COLUMNS = (
+    UserModel.id, UserModel.tenant_id, UserModel.username, UserModel.email, UserModel.hashed_password,
+    UserModel.role, UserModel.token_version, UserModel.created_at,
+)
+
+USER_DTO_COLUMNS = (UserModel.id, UserModel.username, UserModel.email, UserModel.role, UserModel.tenant_id)
+
+
+def tenant_from_row(row: Row) -> Tenant:
+    return Tenant.model_construct(**row._mapping)
+
+
+def project_from_row(row: Row) -> Project:
+    return Project.model_construct(**row._mapping)
+
+
+def task_from_row(row: Row) -> Task:
+    values = dict(row._mapping)
+    username = values.pop("assignee_username", None)
+    email = values.pop("assignee_email", None)
+    if username is not None:
+        values["assignee"] = Assignee.model_construct(id=values["assignee_id"], username=username, email=email)
+    else:
+        values["assignee"] = None
+    return Task.model_construct(**values)
+
+
+def user_from_row(row: Row) -> User:
+    return User.model_construct(**row._mapping)
+
+
+def user_dto_from_row(row: Row) -> UserDTO:
+    return UserDTO.model_construct(**row._mapping)
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+import uuid
+from sqlalchemy import select, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.entities import TokenRevocation, RefreshToken, User
+from domain.repositories import TokenRevocationRepository, RefreshTokenRepository
+from infrastructure.models import TokenRevocationModel, RefreshTokenModel, UserModel
+
+class TokenRevocationRepositoryImpl(TokenRevocationRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def revoke_token(self, jti: str, expires_at: datetime) -> None:
+        self.session.add(TokenRevocationModel(jti=jti, expires_at=expires_at))
+        await self.session.commit()
+
+    async def revoke_user_tokens(self, user_id: uuid.UUID, min_token_version: int, expires_at: datetime) -> None:
+        self.session.add(TokenRevocationModel(
+            user_id=user_id,
+            min_token_version=min_token_version,
+            expires_at=expires_at
+        ))
+        await self.session.commit()
+
+    async def get_active_since(self, last_id: int, created_since: datetime) -> List[TokenRevocation]:
+        # Rows committed out of id order by concurrent transactions are caught by the created_since overlap
+        stmt = (
+            select(TokenRevocationModel)
+            .where(
+                or_(TokenRevocationModel.id > last_id, TokenRevocationModel.created_at >= created_since),
+                TokenRevocationModel.expires_at > datetime.utcnow()
+            )
+            .order_by(TokenRevocationModel.id)
+        )
+        result = await self.session.execute(stmt)
+        return [TokenRevocation.model_validate(row) for row in result.scalars().all()]
+
+class RefreshTokenRepositoryImpl(RefreshTokenRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, refresh_token: RefreshToken) -> None:
+        self.session.add(RefreshTokenModel(**refresh_token.model_dump()))
+        await self.session.commit()
+
+    async def get_with_user(self, token_hash: str) -> Optional[Tuple[RefreshToken, User]]:
+        # Single indexed lookup on token_hash, joined to the owning user
+        stmt = (
+            select(RefreshTokenModel, UserModel)
+            .join(UserModel, UserModel.id == RefreshTokenModel.user_id)
+            .where(RefreshTokenModel.token_hash == token_hash)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        if not row:
+            return None
+        token_model, user_model = row
+        return RefreshToken.model_validate(token_model), User.model_validate(user_model)
+
+    async def rotate(self, old_token_id: uuid.UUID, new_token: RefreshToken) -> bool:
+        # Conditional update: a concurrent rotation of the same token loses and is treated as reuse
+        stmt = (
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.id == old_token_id, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+        result = await self.session.execute(stmt)
+        if result.rowcount != 1:
+            await self.session.rollback()
+            return False
+        self.session.add(RefreshTokenModel(**new_token.model_dump()))
+        await self.session.commit()
+        return True
+
+    async def revoke_family(self, family_id: uuid.UUID) -> None:
+        stmt = (
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.family_id == family_id, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
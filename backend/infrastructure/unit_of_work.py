@@ -0,0 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.repositories import UnitOfWork
+
+class SqlAlchemyUnitOfWork(UnitOfWork):
+    """Commits the request session shared by the use case's repositories."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -7,7 +7,13 @@ import time
 import json
 from contextlib import asynccontextmanager
 
-from api import routes as api_routes, protected_routes
+from api import routes as api_routes, protected_routes, monitoring_routes, admin_routes
+from api.dependencies import (
+    password_service, import_password_service, read_replica_enabled, pin_to_primary, project_purge_worker,
+    load_tenant_directory
+)
+from core.config import settings
+from core.tracing import bind_request_scope, reset_request_scope
 
 # Configure logging
 logging.basicConfig(
@@ -26,9 +32,24 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up application...")
+    if settings.BCRYPT_ROUNDS is None:
+        await password_service.calibrate(
+            settings.BCRYPT_TARGET_MS, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+        )
+        import_password_service.rounds = password_service.rounds
+    try:
+        await load_tenant_directory()
+    except Exception:
+        # Not fatal: the directory loads on the first request that resolves a tenant
+        logger.warning("Tenant directory was not preloaded")
+    if settings.PROJECT_PURGE_ENABLED:
+        project_purge_worker.start()
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    await project_purge_worker.stop()
+    password_service.shutdown()
+    import_password_service.shutdown()
 
 app = FastAPI(
     title="Project Management System",
@@ -60,6 +81,28 @@ async def log_requests(request: Request, call_next):
     
     return response
 
+# Lets the slow query log attribute statements to the matched route
+@app.middleware("http")
+async def bind_request_context(request: Request, call_next):
+    token = bind_request_scope(request.scope)
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_scope(token)
+
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+@app.middleware("http")
+async def pin_reads_after_writes(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        read_replica_enabled()
+        and request.method not in READ_ONLY_METHODS
+        and response.status_code < 400
+    ):
+        await pin_to_primary(request)
+    return response
+
 origins = [
     "http://localhost:3000",
 ]
@@ -70,10 +113,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination headers set by the project and task listings
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Link", "ETag"],
 )
 
 app.include_router(api_routes.router, prefix="/api", tags=["Authentication"])
 app.include_router(protected_routes.router, prefix="/api", tags=["Protected"])
+app.include_router(monitoring_routes.router, prefix="/api", tags=["Monitoring"])
+app.include_router(admin_routes.router, prefix="/api", tags=["Admin"])
 
 @app.get("/")
 def read_root():
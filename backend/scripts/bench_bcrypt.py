@@ -0,0 +1,65 @@
+"""
+Report login latency percentiles for each bcrypt cost.
+
+Every simulated login is one password verification through AsyncPasswordService,
+so the numbers include time spent waiting for a free hashing thread.
+
+    python scripts/bench_bcrypt.py --min-rounds 10 --max-rounds 13 --logins 100 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import platform
+import statistics
+import sys
+import time
+if platform.system() == 'Windows':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from application.services import AsyncPasswordService, PasswordService
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+async def bench_cost(rounds, logins, concurrency, workers):
+    service = AsyncPasswordService(max_concurrency=workers, max_queue=logins, rounds=rounds)
+    hashed = PasswordService.get_password_hash("benchmark-password", rounds)
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def login():
+        async with gate:
+            started_at = time.perf_counter()
+            await service.verify_password("benchmark-password", hashed)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started_at
+    service.shutdown()
+    return latencies, logins / elapsed
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=13)
+    parser.add_argument("--logins", type=int, default=50, help="logins per cost")
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous login requests")
+    parser.add_argument("--workers", type=int, default=4, help="hashing threads")
+    args = parser.parse_args()
+
+    print(f"{args.logins} logins per cost, {args.concurrency} concurrent, {args.workers} hashing threads")
+    print(f"{'cost':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'logins/s':>9}")
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        latencies, throughput = await bench_cost(rounds, args.logins, args.concurrency, args.workers)
+        print(
+            f"{rounds:>4} {percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} "
+            f"{percentile(latencies, 99):>9.1f} {statistics.mean(latencies):>9.1f} {throughput:>9.1f}"
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Report per-row cost of listing projects, tasks and users: ORM instances with
+Pydantic validation versus projected Core rows mapped with model_construct.
+
+Runs against an in-memory SQLite database seeded with --rows rows per entity.
+
+    python scripts/bench_row_mapping.py --rows 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+if platform.system() == 'Windows':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from domain.entities import Project, Task, User
+from infrastructure.models import Base, TenantModel, UserModel, ProjectModel, TaskModel
+from infrastructure.repositories import ProjectRepositoryImpl, TaskRepositoryImpl
+from infrastructure.row_mapping import USER_COLUMNS, user_from_row
+
+async def seed(engine, rows):
+    now = datetime.utcnow()
+    tenant_id, project_id = uuid.uuid4(), uuid.uuid4()
+    users = [
+        {
+            "id": uuid.uuid4(), "tenant_id": tenant_id, "username": f"user-{n}", "email": f"user-{n}@bench.test",
+            "hashed_password": "x" * 60, "role": "user", "token_version": 0, "created_at": now
+        }
+        for n in range(rows)
+    ]
+    projects = [
+        {"id": project_id if n == 0 else uuid.uuid4(), "tenant_id": tenant_id, "name": f"Project {n}",
+         "description": "benchmark", "created_at": now, "updated_at": now}
+        for n in range(rows)
+    ]
+    tasks = [
+        {"id": uuid.uuid4(), "project_id": project_id, "title": f"Task {n}", "description": "benchmark",
+         "status": "todo", "assignee_id": users[n % len(users)]["id"] if n % 2 else None,
+         "created_at": now, "due_date": None}
+        for n in range(rows)
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(TenantModel), [{"id": tenant_id, "name": "Bench", "domain": "bench", "created_at": now}])
+        for model, values in ((UserModel, users), (ProjectModel, projects), (TaskModel, tasks)):
+            await conn.execute(insert(model), values)
+    return tenant_id, project_id
+
+# The read paths as they were before projected rows: full ORM instances, then model_validate
+
+async def orm_projects(session, tenant_id, project_id):
+    result = await session.execute(select(ProjectModel).where(ProjectModel.tenant_id == tenant_id))
+    return [Project.model_validate({c.name: getattr(p, c.name) for c in p.__table__.columns}) for p in result.scalars()]
+
+async def orm_tasks(session, tenant_id, project_id):
+    result = await session.execute(
+        select(TaskModel).options(selectinload(TaskModel.assignee)).where(TaskModel.project_id == project_id)
+    )
+    tasks = []
+    for task in result.scalars():
+        task_dict = task.__dict__.copy()
+        if task.assignee:
+            task_dict['assignee'] = task.assignee.__dict__
+        tasks.append(Task.model_validate(task_dict))
+    return tasks
+
+async def orm_users(session, tenant_id, project_id):
+    result = await session.execute(select(UserModel).where(UserModel.tenant_id == tenant_id))
+    return [User.model_validate(user.__dict__) for user in result.scalars()]
+
+async def row_projects(session, tenant_id, project_id):
+    return await ProjectRepositoryImpl(session).get_by_tenant_id(tenant_id)
+
+async def row_tasks(session, tenant_id, project_id):
+    return await TaskRepositoryImpl(session).get_by_project_id(project_id)
+
+async def row_users(session, tenant_id, project_id):
+    result = await session.execute(select(*USER_COLUMNS).where(UserModel.tenant_id == tenant_id))
+    return [user_from_row(row) for row in result]
+
+PATHS = (
+    ("projects", orm_projects, row_projects),
+    ("tasks", orm_tasks, row_tasks),
+    ("users", orm_users, row_users),
+)
+
+async def per_row_us(engine, read, ids, repeat):
+    samples = []
+    for _ in range(repeat):
+        # A fresh session per run, as per request, so the identity map starts empty
+        async with AsyncSession(engine) as session:
+            started_at = time.perf_counter()
+            entities = await read(session, *ids)
+            samples.append((time.perf_counter() - started_at) * 1e6 / len(entities))
+    return statistics.median(samples)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="rows per entity")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per path; the median is reported")
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    ids = await seed(engine, args.rows)
+
+    print(f"{args.rows} rows per list, median of {args.repeat} runs")
+    print(f"{'list':>8} {'orm us/row':>11} {'rows us/row':>12} {'speedup':>8}")
+    for name, orm_read, row_read in PATHS:
+        before = await per_row_us(engine, orm_read, ids, args.repeat)
+        after = await per_row_us(engine, row_read, ids, args.repeat)
+        print(f"{name:>8} {before:>11.2f} {after:>12.2f} {before / after:>7.1f}x")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
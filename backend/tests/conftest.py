@@ -18,7 +18,8 @@ from sqlalchemy.pool import StaticPool
 os.environ['TESTING'] = '1'
 from main import app
 from core.config import settings
-from infrastructure.database import get_db, AsyncSessionLocal
+from infrastructure.database import get_db, get_session_factory, AsyncSessionLocal, enable_sqlite_foreign_keys, enable_sqlite_transactions
+from api.dependencies import login_throttle, tenant_directory
 from infrastructure.models import Base, UserModel, ProjectModel, TaskModel, ProjectUserModel, TenantModel
 from application.dtos import UserCreateDTO
 
@@ -57,6 +58,8 @@ engine = create_async_engine(
     poolclass=StaticPool,
     echo=True
 )
+enable_sqlite_foreign_keys(engine.sync_engine)
+enable_sqlite_transactions(engine.sync_engine)
 
 # Create async session factory
 async_session_factory = async_sessionmaker(
@@ -167,6 +170,11 @@ async def db_session():
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     
+    # Start every test with full login buckets
+    await login_throttle.reset()
+    # Tenants are recreated with new ids for every test
+    tenant_directory.clear()
+
     # Create a new session for testing
     session = async_session_factory()
     try:
@@ -185,6 +193,7 @@ async def db_session():
         # Store the original dependency
         original_dependency = app.dependency_overrides.get(get_db, None)
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_session_factory] = lambda: async_session_factory
         
         yield session, test_user, test_project, test_task
         
@@ -194,6 +203,7 @@ async def db_session():
             app.dependency_overrides[get_db] = original_dependency
         else:
             app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_session_factory, None)
         
     finally:
         await session.close()
@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi import status
 from sqlalchemy import select
@@ -163,3 +164,322 @@ async def test_login_with_invalid_credentials(client):
     else:
         # If not JSON, check for error message in text
         assert any(msg in response.text.lower() for msg in ["no user found", "invalid", "incorrect"]) or "Incorrect email or password" in response.text
+
+# Test that repeated protected calls reuse the cached principal
+async def test_principal_cache_hit_on_repeat_request(auth_client, test_project):
+    from core.cache import principal_cache
+    principal_cache.clear()
+    misses_before = principal_cache.misses
+    hits_before = principal_cache.hits
+
+    response = await auth_client.get("/api/projects/")
+    assert response.status_code == status.HTTP_200_OK
+    response = await auth_client.get(f"/api/projects/{test_project.id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    assert principal_cache.misses - misses_before == 1
+    assert principal_cache.hits - hits_before == 1
+
+    # The counters are exposed through the metrics endpoint
+    response = await auth_client.get("/api/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["principal_cache"]["hits"] >= 2
+
+async def _login(client, email, password="testpass123"):
+    response = await client.post(
+        "/api/token",
+        data={"username": email, "password": password, "grant_type": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["access_token"]
+
+# Test that login tokens carry the principal and are honoured without a user lookup
+async def test_self_contained_token_claims(client, test_user):
+    from jose import jwt
+    from core.config import settings
+
+    token = await _login(client, test_user.email)
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    assert claims["uid"] == str(test_user.id)
+    assert claims["role"] == test_user.role
+    assert claims["ver"] == 0
+    assert "jti" in claims
+
+    response = await client.get("/api/projects/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK
+
+# Test that a logged-out token is rejected
+async def test_logout_revokes_token(client, test_user):
+    token = await _login(client, test_user.email)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/api/logout", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.get("/api/projects/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+# Test that changing a role revokes tokens issued with the old role
+async def test_role_change_revokes_old_tokens(client, test_user, db_session):
+    session, _, _, _ = db_session
+    token = await _login(client, test_user.email)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.patch(f"/api/users/{test_user.id}/role", json={"role": "user"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["role"] == "user"
+
+    response = await client.get("/api/projects/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    new_token = await _login(client, test_user.email)
+    response = await client.get("/api/projects/", headers={"Authorization": f"Bearer {new_token}"})
+    assert response.status_code == status.HTTP_200_OK
+
+# Test that a refresh token yields a new access token and is rotated
+async def test_refresh_token_rotation_and_reuse_detection(client, test_user):
+    response = await client.post(
+        "/api/token",
+        data={"username": test_user.email, "password": "testpass123", "grant_type": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    first_refresh = response.json()["refresh_token"]
+    assert first_refresh
+
+    response = await client.post("/api/token/refresh", json={"refresh_token": first_refresh})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    second_refresh = data["refresh_token"]
+    assert second_refresh != first_refresh
+
+    response = await client.get("/api/projects/", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert response.status_code == status.HTTP_200_OK
+
+    # Replaying the rotated token revokes the whole session
+    response = await client.post("/api/token/refresh", json={"refresh_token": first_refresh})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await client.post("/api/token/refresh", json={"refresh_token": second_refresh})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+async def test_refresh_with_unknown_token(client):
+    response = await client.post("/api/token/refresh", json={"refresh_token": "not-a-real-token"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+# Test that repeated login attempts for one email are throttled before bcrypt
+async def test_login_throttled_per_email(client, test_user):
+    from api.dependencies import login_throttle
+    from core.config import settings
+
+    form_data = {"username": test_user.email, "password": "wrongpassword", "grant_type": "password"}
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    for _ in range(settings.LOGIN_RATE_LIMIT_EMAIL_BURST):
+        response = await client.post("/api/token", data=form_data, headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.post("/api/token", data=form_data, headers=headers)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+    assert login_throttle.stats()["rejected"]["email"] >= 1
+
+# Test that a hash with an outdated cost is upgraded on successful login
+async def test_login_rehashes_outdated_cost(client, test_user, db_session, monkeypatch):
+    from sqlalchemy import update
+    from api.dependencies import password_service
+    from application.services import PasswordService
+    session, _, _, _ = db_session
+    user_id, email = test_user.id, test_user.email
+    await session.execute(
+        update(UserModel).where(UserModel.id == user_id)
+        .values(hashed_password=PasswordService.get_password_hash("testpass123", 4))
+    )
+    await session.commit()
+    monkeypatch.setattr(password_service, "rounds", 5)
+    monkeypatch.setattr(password_service, "rehash_below", 5)
+
+    await _login(client, email)
+
+    result = await session.execute(select(UserModel.hashed_password).where(UserModel.id == user_id))
+    assert result.scalar_one().startswith("$2b$05$")
+    # The upgraded hash still verifies
+    await _login(client, email)
+
+# Test that a worker calibrated below the stored cost does not downgrade the hash
+async def test_login_keeps_higher_stored_cost(client, test_user, db_session, monkeypatch):
+    from api.dependencies import password_service
+    session, _, _, _ = db_session
+    user_id, email = test_user.id, test_user.email
+    result = await session.execute(select(UserModel.hashed_password).where(UserModel.id == user_id))
+    stored_hash = result.scalar_one()
+    monkeypatch.setattr(password_service, "rounds", 4)
+    monkeypatch.setattr(password_service, "rehash_below", 4)
+
+    await _login(client, email)
+
+    result = await session.execute(select(UserModel.hashed_password).where(UserModel.id == user_id))
+    assert result.scalar_one() == stored_hash
+
+# Test that duplicate registrations map to the friendly errors
+async def test_register_duplicate_email_and_username(client, test_user):
+    # Read the fixture values up front; the failed insert rolls back the shared session
+    existing_email, existing_username = test_user.email, test_user.username
+    user_data = {
+        "email": existing_email,
+        "password": "testpass123",
+        "username": "someoneelse",
+        "tenant_name": "Another Tenant",
+        "tenant_domain": "another-tenant.local"
+    }
+    response = await client.post("/api/register", json=user_data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "already registered" in response.json()["detail"]
+
+    user_data.update({"email": "someoneelse@example.com", "username": existing_username})
+    response = await client.post("/api/register", json=user_data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "already taken" in response.json()["detail"]
+
+# Test that joining an existing tenant domain creates a regular user
+async def test_register_into_existing_tenant(client, db_session):
+    session, test_user, _, _ = db_session
+    user_data = {
+        "email": "member@example.com",
+        "password": "testpass123",
+        "username": "member",
+        "tenant_name": "Test Tenant",
+        "tenant_domain": "test-tenant.local"
+    }
+    response = await client.post("/api/register", json=user_data)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["role"] == "user"
+    assert data["tenant_id"] == str(test_user.tenant_id)
+
+# Test bulk user import from CSV with per-row results
+async def test_import_users_csv(auth_client, db_session, monkeypatch):
+    from api.dependencies import import_password_service
+    session, test_user, _, _ = db_session
+    tenant_id, existing_email = test_user.tenant_id, test_user.email
+    monkeypatch.setattr(import_password_service, "rounds", 4)
+
+    csv_body = (
+        "username,email,password,role\n"
+        "alice,alice@example.com,alicepass1,\n"
+        "bob,bob@example.com,bobpass12,admin\n"
+        f"dupe,{existing_email},dupepass1,user\n"
+        "broken,not-an-email,pass12345,user\n"
+    )
+    response = await auth_client.post(
+        "/api/admin/users/import", content=csv_body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = {r["row"]: r for r in map(json.loads, response.text.splitlines())}
+    assert [results[row]["status"] for row in (1, 2, 3, 4)] == ["created", "created", "duplicate", "invalid"]
+
+    result = await session.execute(
+        select(UserModel.email, UserModel.role, UserModel.tenant_id)
+        .where(UserModel.email.in_(["alice@example.com", "bob@example.com"]))
+        .order_by(UserModel.email)
+    )
+    assert result.all() == [("alice@example.com", "user", tenant_id), ("bob@example.com", "admin", tenant_id)]
+
+# Test bulk user import from NDJSON and content-type validation
+async def test_import_users_ndjson(auth_client, monkeypatch):
+    from api.dependencies import import_password_service
+    monkeypatch.setattr(import_password_service, "rounds", 4)
+
+    body = '{"username": "carol", "email": "carol@example.com", "password": "carolpass"}\n{oops\n'
+    response = await auth_client.post(
+        "/api/admin/users/import", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    statuses = sorted((r["row"], r["status"]) for r in map(json.loads, response.text.splitlines()))
+    assert statuses == [(1, "created"), (2, "invalid")]
+
+    response = await auth_client.post(
+        "/api/admin/users/import", content=body, headers={"Content-Type": "text/plain"}
+    )
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+# Test that a role change made on another worker evicts the cached principal
+async def test_principal_cache_honours_revoked_token_version(client, test_user, monkeypatch):
+    from datetime import datetime, timedelta
+    from core.cache import principal_cache, principal_cache_key
+    from core.config import settings
+    from api.dependencies import revocation_filter
+    from domain.entities import TokenRevocation
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_MODE", "lookup")
+    user_id, email, tenant_id = test_user.id, test_user.email, test_user.tenant_id
+    token = await _login(client, email)
+    headers = {"Authorization": f"Bearer {token}"}
+    principal_cache.clear()
+
+    response = await client.get("/api/projects/", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    cached = principal_cache.get(principal_cache_key(email, tenant_id))
+    # Simulate a stale entry carrying a role another worker has since changed
+    principal_cache.set(principal_cache_key(email, tenant_id), cached.model_copy(update={"role": "stale"}))
+
+    monkeypatch.setattr(revocation_filter, "refresh_due", lambda: False)
+    revocation_filter.apply([TokenRevocation(
+        user_id=user_id, min_token_version=cached.token_version + 1,
+        expires_at=datetime.utcnow() + timedelta(minutes=5)
+    )])
+    try:
+        response = await client.get("/api/projects/", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert principal_cache.get(principal_cache_key(email, tenant_id)).role != "stale"
+    finally:
+        revocation_filter._min_versions.pop(user_id, None)
+
+# Test that registering into a known tenant resolves it from the tenant directory
+async def test_register_resolves_tenant_from_directory(client, db_session):
+    from sqlalchemy import event
+    from api.dependencies import tenant_directory
+    from tests.conftest import engine
+
+    user_data = {
+        "email": "first@example.com",
+        "password": "testpass123",
+        "username": "first",
+        "tenant_name": "Directory Tenant",
+        "tenant_domain": "directory-tenant.local"
+    }
+    response = await client.post("/api/register", json=user_data)
+    assert response.status_code == status.HTTP_200_OK
+    tenant_id = response.json()["tenant_id"]
+    assert str(tenant_directory.by_domain("directory-tenant.local").id) == tenant_id
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    user_data.update({"email": "second@example.com", "username": "second"})
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.post("/api/register", json=user_data)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["tenant_id"] == tenant_id
+    assert response.json()["role"] == "user"
+    assert not [s for s in statements if "tenants" in s]
+
+# Test that process-wide metrics are only served to admins
+async def test_metrics_require_admin(client, test_user):
+    user_data = {
+        "email": "member@example.com",
+        "password": "testpass123",
+        "username": "member",
+        "tenant_name": "Test Tenant",
+        "tenant_domain": "test-tenant.local"
+    }
+    response = await client.post("/api/register", json=user_data)
+    assert response.json()["role"] == "user"
+
+    token = await _login(client, user_data["email"])
+    response = await client.get("/api/metrics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -187,3 +187,184 @@ async def test_create_project_same_name(auth_client, test_project):
     assert response.status_code == status.HTTP_201_CREATED  # Duplicate names are allowed
     data = response.json()
     assert data["name"] == test_project.name
+
+# Test that reads go to the replica until the client writes, then stay on the primary
+async def test_read_replica_routing_pins_after_write(auth_client, test_user, monkeypatch):
+    import api.dependencies as dependencies
+    from tests.conftest import async_session_factory, create_test_token
+
+    tenant_id = str(test_user.tenant_id)
+    response = await auth_client.post("/api/register", json={
+        "email": "colleague@example.com", "password": "testpass123", "username": "colleague",
+        "tenant_name": "Test Tenant", "tenant_domain": "test-tenant.local"
+    })
+    colleague_token = create_test_token(response.json()["id"], "colleague@example.com", tenant_id)
+
+    replica_sessions = []
+
+    def replica_session_factory():
+        session = async_session_factory()
+        replica_sessions.append(session)
+        return session
+
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", replica_session_factory)
+    dependencies.primary_pins.clear()
+
+    response = await auth_client.get("/api/projects/")
+    assert response.status_code == status.HTTP_200_OK
+    # The request session and the listing's own session both come from the replica
+    replica_reads = len(replica_sessions)
+    assert replica_reads == 2
+
+    response = await auth_client.post("/api/projects/", json={"name": "Pinned Project"})
+    assert response.status_code == status.HTTP_201_CREATED
+    # Pins live on the server; the client is not asked to store anything
+    assert not response.cookies
+
+    # The writer is pinned, so the read sees its write on the primary
+    response = await auth_client.get("/api/projects/")
+    assert response.status_code == status.HTTP_200_OK
+    assert "Pinned Project" in [p["name"] for p in response.json()]
+    assert len(replica_sessions) == replica_reads
+
+    # Other users of the tenant still read from the replica
+    response = await auth_client.get("/api/projects/", headers={"Authorization": f"Bearer {colleague_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(replica_sessions) > replica_reads
+
+# Test that creating a project writes project and owner membership without read-backs
+async def test_create_project_single_commit(auth_client):
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    def record_commit(conn):
+        statements.append("COMMIT")
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    event.listen(engine.sync_engine, "commit", record_commit)
+    try:
+        response = await auth_client.post("/api/projects/", json={"name": "Round Trips"})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+        event.remove(engine.sync_engine, "commit", record_commit)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    # Authentication may read the user; the write path itself is two INSERTs, the
+    # tenant data version bump and one commit
+    assert statements.count("INSERT") == 2
+    assert statements.count("COMMIT") == 1
+    assert statements[-4:] == ["INSERT", "UPDATE", "INSERT", "COMMIT"]
+
+# Test that deleting a project removes its tasks and memberships through the foreign keys
+async def test_delete_project_cascades(auth_client, db_session):
+    from infrastructure.models import TaskModel
+
+    session, _, _, _ = db_session
+    response = await auth_client.post("/api/projects/", json={"name": "Cascade"})
+    project_id = uuid.UUID(response.json()["id"])
+    await auth_client.post(f"/api/projects/{project_id}/tasks/", json={"title": "Child", "status": "todo"})
+
+    response = await auth_client.delete(f"/api/projects/{project_id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    for model in (TaskModel, ProjectUserModel):
+        result = await session.execute(select(model).where(model.project_id == project_id))
+        assert result.first() is None
+
+# Test that a large project is hidden at once and purged in bounded batches
+async def test_delete_large_project_purges_in_background(auth_client, db_session, monkeypatch):
+    from core.config import settings
+    from application.use_cases.project_management import PurgeDeletedProjectsUseCase
+    from infrastructure.models import TaskModel
+    from infrastructure.repositories import ProjectRepositoryImpl
+    from infrastructure.unit_of_work import SqlAlchemyUnitOfWork
+
+    session, _, _, _ = db_session
+    monkeypatch.setattr(settings, "PROJECT_DELETE_SYNC_MAX_TASKS", 2)
+    response = await auth_client.post("/api/projects/", json={"name": "Large"})
+    project_id = uuid.UUID(response.json()["id"])
+    tasks = [{"title": f"Task {n}", "status": "todo"} for n in range(5)]
+    await auth_client.post(f"/api/projects/{project_id}/tasks/bulk", json={"tasks": tasks})
+
+    response = await auth_client.delete(f"/api/projects/{project_id}")
+    assert response.status_code == status.HTTP_200_OK
+    response = await auth_client.get(f"/api/projects/{project_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert str(project_id) not in [p["id"] for p in (await auth_client.get("/api/projects/")).json()]
+
+    # The rows are still there until the purge runs
+    result = await session.execute(select(TaskModel.id).where(TaskModel.project_id == project_id))
+    assert len(result.all()) == 5
+
+    purge = PurgeDeletedProjectsUseCase(ProjectRepositoryImpl(session), SqlAlchemyUnitOfWork(session), batch_size=2)
+    batches = []
+    while purged := await purge.execute():
+        batches.append(purged)
+    assert batches == [2, 2, 1, 1]
+
+    result = await session.execute(select(ProjectModel).where(ProjectModel.id == project_id))
+    assert result.scalar_one_or_none() is None
+
+# Test that project list pages are served pre-serialized until a project write bumps the version
+async def test_list_projects_cached_until_write(auth_client, test_project):
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    response = await auth_client.get("/api/projects/", params={"include_total": True})
+    assert response.status_code == status.HTTP_200_OK
+    first = response.json()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await auth_client.get("/api/projects/", params={"include_total": True})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.json() == first
+    assert response.headers["X-Total-Count"] == str(len(first))
+    # Only the tenant's data version is read
+    assert not [s for s in statements if "FROM projects" in s]
+
+    response = await auth_client.post("/api/projects/", json={"name": "Fresh"})
+    response = await auth_client.get("/api/projects/", params={"include_total": True})
+    assert "Fresh" in [p["name"] for p in response.json()]
+    assert response.headers["X-Total-Count"] == str(len(first) + 1)
+
+# Test that an unchanged project list answers If-None-Match with 304
+async def test_list_projects_not_modified(auth_client, test_project):
+    response = await auth_client.get("/api/projects/")
+    etag = response.headers["ETag"]
+
+    response = await auth_client.get("/api/projects/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    # Another page shape is another representation
+    response = await auth_client.get("/api/projects/?include_total=true", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+    await auth_client.patch(f"/api/projects/{test_project.id}", json={"name": "Renamed"})
+    response = await auth_client.get("/api/projects/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["name"] == "Renamed"
+
+# Test that task counts are only reported for the caller's tenant's projects
+async def test_count_tasks_scoped_to_tenant(db_session, test_project, test_task):
+    from infrastructure.repositories import ProjectRepositoryImpl
+
+    session, test_user, _, _ = db_session
+    repository = ProjectRepositoryImpl(session)
+    assert await repository.count_tasks(test_project.id, test_user.tenant_id, up_to=10) == 1
+    assert await repository.count_tasks(test_project.id, uuid.uuid4(), up_to=10) == 0
@@ -279,3 +279,311 @@ async def test_task_validation(auth_client, test_project):
         }
     )
     assert response.status_code == status.HTTP_201_CREATED
+
+# Test paging through a project's tasks with the keyset cursor
+async def test_list_tasks_paginates(auth_client, test_task, test_project):
+    for n in range(4):
+        response = await auth_client.post(
+            f"/api/projects/{test_project.id}/tasks/", json={"title": f"Paged {n}", "status": "todo"}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    seen = []
+    params = {"limit": 2, "include_total": "true"}
+    while True:
+        response = await auth_client.get(f"/api/projects/{test_project.id}/tasks/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page) <= 2
+        assert response.headers["X-Total-Count"] == "5"
+        seen.extend(t["id"] for t in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert len(seen) == len(set(seen)) == 5
+    assert str(test_task.id) in seen
+
+    response = await auth_client.get(f"/api/projects/{test_project.id}/tasks/", params={"cursor": "bogus"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+# Test that listed tasks carry their assignee from the joined row
+async def test_list_tasks_includes_assignee(auth_client, test_task, test_project, test_user):
+    response = await auth_client.patch(
+        f"/api/projects/{test_project.id}/tasks/{test_task.id}", json={"assignee_id": str(test_user.id)}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await auth_client.get(f"/api/projects/{test_project.id}/tasks/")
+    assert response.status_code == status.HTTP_200_OK
+    task = next(t for t in response.json() if t["id"] == str(test_task.id))
+    assert task["assignee"] == {"id": str(test_user.id), "username": test_user.username, "email": test_user.email}
+
+# Test creating a batch of tasks with one INSERT and one commit
+async def test_bulk_create_tasks(auth_client, test_project, test_user):
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    payload = {"tasks": [
+        {"title": f"Bulk {n}", "status": "todo", "assignee_id": str(test_user.id) if n % 2 else None}
+        for n in range(10)
+    ]}
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await auth_client.post(f"/api/projects/{test_project.id}/tasks/bulk", json=payload)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    assert statements.count("INSERT") == 1
+    data = response.json()
+    assert [t["title"] for t in data] == [f"Bulk {n}" for n in range(10)]
+    assert data[1]["assignee"]["id"] == str(test_user.id)
+    assert data[0]["assignee"] is None
+
+    response = await auth_client.get(f"/api/projects/{test_project.id}/tasks/", params={"limit": 500})
+    titles = [t["title"] for t in response.json()]
+    assert [t for t in titles if t.startswith("Bulk")] == [f"Bulk {n}" for n in range(10)]
+
+# Test that a bulk batch with an unknown assignee writes nothing
+async def test_bulk_create_tasks_rejects_unknown_assignee(auth_client, test_project):
+    # The 400 rolls back the shared session, which expires the fixture
+    project_id = test_project.id
+    payload = {"tasks": [
+        {"title": "Valid", "status": "todo"},
+        {"title": "Orphan", "status": "todo", "assignee_id": str(uuid.uuid4())},
+    ]}
+    response = await auth_client.post(f"/api/projects/{project_id}/tasks/bulk", json=payload)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await auth_client.get(f"/api/projects/{project_id}/tasks/")
+    assert "Valid" not in [t["title"] for t in response.json()]
+
+# Test that a task can only be updated through its own project
+async def test_update_task_scoped_to_project(auth_client, test_task, test_project):
+    task_id, project_id = test_task.id, test_project.id
+    response = await auth_client.post("/api/projects/", json={"name": "Other Project"})
+    other_project_id = response.json()["id"]
+
+    response = await auth_client.patch(f"/api/projects/{other_project_id}/tasks/{task_id}", json={"title": "Moved"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await auth_client.patch(f"/api/projects/{project_id}/tasks/{task_id}", json={"status": "done"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "done"
+    assert response.json()["title"] != "Moved"
+
+# Test updating a batch of tasks with one UPDATE and per-item results
+async def test_batch_update_tasks(auth_client, test_project, test_user):
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    project_id = test_project.id
+    response = await auth_client.post(
+        f"/api/projects/{project_id}/tasks/bulk",
+        json={"tasks": [{"title": f"Card {n}", "status": "todo"} for n in range(3)]}
+    )
+    ids = [t["id"] for t in response.json()]
+    missing_id = str(uuid.uuid4())
+    payload = {"tasks": [
+        {"id": ids[0], "status": "done"},
+        {"id": missing_id, "status": "done"},
+        {"id": ids[1], "title": "Renamed", "assignee_id": str(test_user.id)},
+    ]}
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await auth_client.patch(f"/api/projects/{project_id}/tasks/batch", json=payload)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert statements.count("WITH") == 1
+    results = response.json()
+    assert [(r["id"], r["status"]) for r in results] == [
+        (ids[0], "updated"), (missing_id, "not_found"), (ids[1], "updated")
+    ]
+    assert results[0]["task"]["status"] == "done"
+    assert results[0]["task"]["title"] == "Card 0"
+    assert results[2]["task"]["title"] == "Renamed"
+    assert results[2]["task"]["status"] == "todo"
+    assert results[2]["task"]["assignee"]["id"] == str(test_user.id)
+
+    response = await auth_client.get(f"/api/projects/{project_id}/tasks/", params={"limit": 500})
+    tasks = {t["id"]: t for t in response.json()}
+    assert tasks[ids[2]]["status"] == "todo"
+    assert tasks[ids[2]]["title"] == "Card 2"
+
+# Test that a batch naming the same task twice is rejected
+async def test_batch_update_tasks_rejects_duplicates(auth_client, test_task, test_project):
+    task_id, project_id = str(test_task.id), test_project.id
+    payload = {"tasks": [{"id": task_id, "status": "done"}, {"id": task_id, "status": "todo"}]}
+    response = await auth_client.patch(f"/api/projects/{project_id}/tasks/batch", json=payload)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+async def _register_foreign_user(client) -> str:
+    """A user of another tenant, to assign where the caller's tenant has no access."""
+    response = await client.post("/api/register", json={
+        "email": "victim@tenant-b.example.com", "password": "testpass123", "username": "victim",
+        "tenant_name": "Tenant B", "tenant_domain": "tenant-b.test"
+    })
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["id"]
+
+# Test that a batch cannot assign a user of another tenant or reveal their details
+async def test_batch_update_tasks_rejects_foreign_assignee(auth_client, test_task, test_project):
+    task_id, project_id = str(test_task.id), test_project.id
+    foreign_user_id = await _register_foreign_user(auth_client)
+
+    payload = {"tasks": [{"id": task_id, "status": "done", "assignee_id": foreign_user_id}]}
+    response = await auth_client.patch(f"/api/projects/{project_id}/tasks/batch", json=payload)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "victim" not in response.text, response.text
+
+    response = await auth_client.get(f"/api/projects/{project_id}/tasks/")
+    task = next(t for t in response.json() if t["id"] == task_id)
+    assert task["assignee_id"] != foreign_user_id
+    assert task["status"] != "done"
+
+# Test that a single task update cannot assign a user of another tenant or reveal their details
+async def test_update_task_rejects_foreign_assignee(auth_client, test_task, test_project):
+    task_id, project_id = test_task.id, test_project.id
+    foreign_user_id = await _register_foreign_user(auth_client)
+
+    url = f"/api/projects/{project_id}/tasks/{task_id}"
+    response = await auth_client.patch(url, json={"status": "done", "assignee_id": foreign_user_id})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "victim" not in response.text
+
+    response = await auth_client.get(f"/api/projects/{project_id}/tasks/")
+    task = next(t for t in response.json() if t["id"] == str(task_id))
+    assert task["assignee_id"] != foreign_user_id
+    assert task["status"] != "done"
+
+# Test that If-Match guards a task update against lost updates
+async def test_update_task_if_match(auth_client, test_task, test_project):
+    task_id, project_id = test_task.id, test_project.id
+    url = f"/api/projects/{project_id}/tasks/{task_id}"
+
+    response = await auth_client.patch(url, json={"status": "in_progress"}, headers={"If-Match": '"1"'})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+
+    # A second client still holding version 1 must not overwrite the change
+    response = await auth_client.patch(url, json={"status": "done"}, headers={"If-Match": '"1"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    response = await auth_client.patch(url, json={"status": "done"}, headers={"If-Match": '"2"'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["version"] == 3
+
+    response = await auth_client.patch(
+        f"/api/projects/{project_id}/tasks/{uuid.uuid4()}", json={"status": "done"}, headers={"If-Match": '"1"'}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+# Test that a task can only be deleted through its own project, in one statement
+async def test_delete_task_scoped_to_project(auth_client, test_task, test_project):
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    task_id, project_id = test_task.id, test_project.id
+    response = await auth_client.post("/api/projects/", json={"name": "Other Project"})
+    other_project_id = response.json()["id"]
+
+    response = await auth_client.delete(f"/api/projects/{other_project_id}/tasks/{task_id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await auth_client.delete(f"/api/projects/{project_id}/tasks/{task_id}")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == status.HTTP_200_OK
+    assert [s for s in statements if s in ("SELECT", "DELETE")] == ["DELETE"]
+
+# Test that nested task routes check project ownership from cache until the project is deleted
+async def test_project_access_cached(auth_client, test_task, test_project):
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    project_id = test_project.id
+    response = await auth_client.get(f"/api/projects/{project_id}/tasks/")
+    assert response.status_code == status.HTTP_200_OK
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await auth_client.get(f"/api/projects/{project_id}/tasks/")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == status.HTTP_200_OK
+    # Only the listing's tasks_version is read from projects, not the ownership
+    assert not [s for s in statements if "projects.tenant_id" in s]
+
+    response = await auth_client.get(f"/api/projects/{uuid.uuid4()}/tasks/")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await auth_client.delete(f"/api/projects/{project_id}")
+    assert response.status_code == status.HTTP_200_OK
+    response = await auth_client.get(f"/api/projects/{project_id}/tasks/")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+# Test that an unchanged task list answers If-None-Match with 304 without reading any task
+async def test_list_tasks_not_modified(auth_client, test_task, test_project):
+    from sqlalchemy import event
+    from tests.conftest import engine
+
+    task_id, project_id = test_task.id, test_project.id
+    url = f"/api/projects/{project_id}/tasks/"
+    response = await auth_client.get(url)
+    etag = response.headers["ETag"]
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await auth_client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert not [s for s in statements if "FROM tasks" in s]
+
+    # An update, an insert and a delete each change the tag
+    response = await auth_client.patch(f"{url}{task_id}", json={"status": "done"})
+    assert response.json()["updated_at"] >= response.json()["created_at"]
+    etags = {etag}
+    for write in (
+        lambda: auth_client.patch(f"{url}{task_id}", json={"status": "in_progress"}),
+        lambda: auth_client.post(url, json={"title": "Another", "status": "todo", "project_id": str(project_id)}),
+        lambda: auth_client.delete(f"{url}{task_id}"),
+    ):
+        await write()
+        response = await auth_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] not in etags
+        etags.add(response.headers["ETag"])
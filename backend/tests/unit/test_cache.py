@@ -0,0 +1,56 @@
+import time
+
+from core.cache import SizedLRUCache, TTLCache
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=5)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert cache.get("key") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+def test_sized_lru_cache_evicts_to_stay_within_budget():
+    cache = SizedLRUCache(max_bytes=10)
+    cache.set("a", b"aaaa", size=4)
+    cache.set("b", b"bbbb", size=4)
+    cache.get("a")
+    cache.set("c", b"cccc", size=4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.stats()["size_bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sized_lru_cache_skips_values_over_budget():
+    cache = SizedLRUCache(max_bytes=10)
+    cache.set("a", b"a" * 11, size=11)
+    assert cache.get("a") is None
+    assert cache.stats()["size_bytes"] == 0
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infrastructure.database import InstrumentedAsyncQueuePool
+
+
+async def test_pool_reports_checkouts_and_timeouts():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 1
+            assert stats["idle"] == 0
+
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 0
+        assert stats["idle"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["wait_time_ms"]["count"] == 2
+        assert stats["wait_time_ms"]["max"] >= 50
+    finally:
+        await engine.dispose()
@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from application.pagination import InvalidCursorError, build_page, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips():
+    created_at, item_id = datetime(2026, 1, 1, 12, 30, 5, 123456), uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, item_id)) == (created_at, item_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!", encode_cursor(datetime(2026, 1, 1), uuid.uuid4())[:-4]])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_build_page_uses_extra_row_as_has_more_signal():
+    rows = [SimpleNamespace(id=uuid.uuid4(), created_at=datetime(2026, 1, 1, 0, 0, i)) for i in range(3)]
+
+    page = build_page(rows, limit=2, total=3)
+    assert page.items == rows[:2]
+    assert decode_cursor(page.next_cursor) == (rows[1].created_at, rows[1].id)
+    assert page.total == 3
+
+    last_page = build_page(rows[2:], limit=2)
+    assert last_page.items == rows[2:]
+    assert last_page.next_cursor is None
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+
+from application.services import AsyncPasswordService, PasswordService, PasswordServiceBusyError
+
+
+async def test_hash_and_verify_off_the_event_loop():
+    service = AsyncPasswordService(max_concurrency=2, max_queue=2)
+    try:
+        hashed = await service.get_password_hash("s3cret-pass")
+        assert await service.verify_password("s3cret-pass", hashed)
+        assert not await service.verify_password("wrong-pass", hashed)
+
+        stats = service.stats()
+        assert stats["hash_time_ms"]["count"] == 3
+        assert stats["wait_time_ms"]["count"] == 3
+        assert stats["in_flight"] == 0
+    finally:
+        service.shutdown()
+
+
+async def test_rejects_when_queue_is_full():
+    service = AsyncPasswordService(max_concurrency=1, max_queue=1)
+    release = threading.Event()
+
+    def blocking_call():
+        release.wait(timeout=5)
+        return True
+
+    try:
+        running = asyncio.ensure_future(service._run(blocking_call))
+        queued = asyncio.ensure_future(service._run(blocking_call))
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordServiceBusyError):
+            await service.verify_password("password", "hash")
+        assert service.stats()["rejected"] == 1
+
+        release.set()
+        assert await running and await queued
+    finally:
+        service.shutdown()
+
+
+async def test_calibrate_picks_cost_within_target():
+    service = AsyncPasswordService(max_concurrency=1, max_queue=1)
+    try:
+        rounds = await service.calibrate(target_ms=10_000, min_rounds=4, max_rounds=6)
+        assert rounds == 6
+        rounds = await service.calibrate(target_ms=0, min_rounds=4, max_rounds=6)
+        assert rounds == 4
+        assert service.rounds == 4
+    finally:
+        service.shutdown()
+
+
+async def test_needs_rehash_compares_cost():
+    service = AsyncPasswordService(max_concurrency=1, max_queue=1, rounds=5)
+    try:
+        current = await service.get_password_hash("password")
+        assert current.startswith("$2b$05$")
+        assert not service.needs_rehash(current)
+        assert service.needs_rehash(PasswordService.get_password_hash("password", 4))
+    finally:
+        service.shutdown()
+
+
+async def test_needs_rehash_only_below_deployment_floor():
+    service = AsyncPasswordService(max_concurrency=1, max_queue=1, rounds=6, rehash_below=5)
+    try:
+        # A worker calibrated lower than the stored cost must not downgrade it
+        await service.calibrate(target_ms=0, min_rounds=5, max_rounds=6)
+        assert service.rounds == 5
+        assert not service.needs_rehash(PasswordService.get_password_hash("password", 6))
+        assert not service.needs_rehash(PasswordService.get_password_hash("password", 5))
+        assert service.needs_rehash(PasswordService.get_password_hash("password", 4))
+    finally:
+        service.shutdown()
+
+
+async def test_waits_for_capacity_when_configured():
+    service = AsyncPasswordService(max_concurrency=1, max_queue=1, wait_when_busy=True)
+    release = threading.Event()
+
+    def blocking_call():
+        release.wait(timeout=5)
+        return True
+
+    try:
+        calls = [asyncio.ensure_future(service._run(blocking_call)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        assert service.stats()["in_flight"] == 2
+        assert service.stats()["rejected"] == 0
+
+        release.set()
+        assert all(await asyncio.gather(*calls))
+    finally:
+        service.shutdown()
@@ -0,0 +1,15 @@
+import time
+
+from core.primary_pins import InMemoryPrimaryPinStore
+
+
+async def test_pin_expires(monkeypatch):
+    store = InMemoryPrimaryPinStore()
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    await store.pin("tenant:a", 5)
+    assert await store.is_pinned("tenant:a")
+    assert not await store.is_pinned("tenant:b")
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert not await store.is_pinned("tenant:a")
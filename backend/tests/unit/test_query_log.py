@@ -0,0 +1,54 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.tracing import traced_use_case
+from infrastructure.query_log import QueryLog
+
+
+class ListThingsUseCase:
+    def __init__(self, engine):
+        self.engine = engine
+
+    @traced_use_case
+    async def execute(self):
+        async with self.engine.connect() as conn:
+            await conn.execute(text("CREATE TABLE things (id INTEGER PRIMARY KEY, name TEXT)"))
+            return (await conn.execute(text("SELECT name FROM things WHERE name = :name"), {"name": "x"})).all()
+
+
+async def test_slow_queries_are_logged_with_use_case_and_plan(caplog):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    query_log = QueryLog(slow_threshold_ms=0, explain=True)
+    query_log.attach(engine.sync_engine)
+    try:
+        with caplog.at_level(logging.WARNING, logger="infrastructure.query_log"):
+            await ListThingsUseCase(engine).execute()
+    finally:
+        await engine.dispose()
+
+    select_logs = [r.getMessage() for r in caplog.records if "SELECT name FROM things" in r.getMessage()]
+    assert len(select_logs) == 1
+    assert "use_case=ListThingsUseCase" in select_logs[0]
+    assert "Plan:" in select_logs[0] and "things" in select_logs[0].split("Plan:")[1]
+    # Parameters are never logged
+    assert "'x'" not in select_logs[0]
+    assert query_log.stats()["slow"] == query_log.stats()["query_time_ms"]["count"]
+
+
+async def test_fast_queries_are_only_sampled(caplog):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    query_log = QueryLog(slow_threshold_ms=10_000, sample_rate=1.0)
+    query_log.attach(engine.sync_engine)
+    try:
+        with caplog.at_level(logging.INFO, logger="infrastructure.query_log"):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    stats = query_log.stats()
+    assert stats["slow"] == 0
+    assert stats["sampled"] == stats["query_time_ms"]["count"] >= 1
+    assert any("Sampled query" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,50 @@
+import time
+import uuid
+
+import pytest
+
+from application.services import LoginThrottle
+from core.rate_limit import BucketPolicy, InMemoryRateLimitBackend, RateLimitExceededError
+
+
+async def test_token_bucket_refills_over_time(monkeypatch):
+    backend = InMemoryRateLimitBackend(shards=4)
+    policy = BucketPolicy(capacity=2, refill_per_second=1)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    assert (await backend.consume("key", policy)).allowed
+    assert (await backend.consume("key", policy)).allowed
+    blocked = await backend.consume("key", policy)
+    assert not blocked.allowed
+    assert blocked.retry_after == pytest.approx(1.0)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 1)
+    assert (await backend.consume("key", policy)).allowed
+
+
+async def test_shards_are_bounded():
+    backend = InMemoryRateLimitBackend(shards=1, max_keys_per_shard=3)
+    policy = BucketPolicy(capacity=1, refill_per_second=1)
+    for i in range(10):
+        await backend.consume(f"key-{i}", policy)
+    assert backend.size() == 3
+
+
+async def test_login_throttle_scopes():
+    throttle = LoginThrottle(
+        backend=InMemoryRateLimitBackend(),
+        ip_policy=BucketPolicy(capacity=100, refill_per_second=1),
+        email_policy=BucketPolicy(capacity=1, refill_per_second=0.01),
+        tenant_policy=BucketPolicy(capacity=1, refill_per_second=0.01),
+    )
+    await throttle.check_client("10.0.0.1", "User@Example.com")
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await throttle.check_client("10.0.0.2", "user@example.com")
+    assert exc_info.value.scope == "email"
+
+    tenant_id = uuid.uuid4()
+    await throttle.check_tenant(tenant_id)
+    with pytest.raises(RateLimitExceededError):
+        await throttle.check_tenant(tenant_id)
+    assert throttle.stats()["rejected"] == {"ip": 0, "email": 1, "tenant": 1}
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from core.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def load(value):
+        calls.append(value)
+        await release.wait()
+        return [value]
+
+    waiters = [asyncio.ensure_future(flights.run("key", lambda: load(1))) for _ in range(5)]
+    other = asyncio.ensure_future(flights.run("other", lambda: load(2)))
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, other)
+
+    assert calls == [1, 2]
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] == [2]
+    stats = flights.stats()
+    assert (stats["executed"], stats["coalesced"], stats["in_flight"]) == (2, 4, 0)
+
+    # Nothing is kept once the call has finished
+    assert await flights.run("key", lambda: load(3)) == [3]
+
+
+async def test_errors_reach_every_caller_and_cancellation_does_not():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise ValueError("boom")
+
+    first = asyncio.ensure_future(flights.run("key", fail))
+    second = asyncio.ensure_future(flights.run("key", fail))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(ValueError):
+        await second
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert flights.stats()["in_flight"] == 0
+
+
+async def test_cancelled_first_caller_does_not_break_coalesced_listing():
+    import uuid
+    from contextlib import asynccontextmanager
+
+    from application.use_cases.project_management import GetTasksByProjectUseCase
+
+    flights = SingleFlight()
+    release = asyncio.Event()
+    sessions = []
+
+    class FlightRepository:
+        def __init__(self, session):
+            self.session = session
+
+        async def get_by_project_id(self, project_id, limit, after):
+            await release.wait()
+            assert self.session["open"], "queried a closed session"
+            return []
+
+    @asynccontextmanager
+    async def open_repository():
+        session = {"open": True}
+        sessions.append(session)
+        try:
+            yield FlightRepository(session)
+        finally:
+            session["open"] = False
+
+    def use_case():
+        # Each request has its own request-scoped repository, which the flight must not use
+        return GetTasksByProjectUseCase(object(), 50, flights, open_repository)
+
+    project_id = uuid.uuid4()
+    first = asyncio.ensure_future(use_case().execute(project_id, 10, data_version=1))
+    second = asyncio.ensure_future(use_case().execute(project_id, 10, data_version=1))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    page = await second
+    assert page.items == []
+    assert first.cancelled()
+    assert len(sessions) == 1 and not sessions[0]["open"]
+    assert flights.stats()["coalesced"] == 1
@@ -0,0 +1,57 @@
+import time
+from datetime import datetime, timedelta
+
+from application.services import TenantDirectory
+from domain.entities import Tenant
+
+
+class FakeTenantRepository:
+    def __init__(self, tenants):
+        self.tenants = tenants
+        self.calls = []
+
+    async def get_created_since(self, since):
+        self.calls.append(since)
+        return [t for t in self.tenants if since is None or t.created_at >= since]
+
+
+async def test_tenant_directory_loads_then_refreshes_incrementally(monkeypatch):
+    started = datetime(2026, 1, 1)
+    acme = Tenant(name="Acme", domain="acme.test", created_at=started)
+    repository = FakeTenantRepository([acme])
+    directory = TenantDirectory(refresh_interval=60)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    await directory.refresh(repository)
+    assert directory.by_domain("acme.test") is acme
+    assert directory.by_id(acme.id) is acme
+    assert not directory.refresh_due()
+
+    globex = Tenant(name="Globex", domain="globex.test", created_at=started + timedelta(minutes=5))
+    repository.tenants.append(globex)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert directory.refresh_due()
+    await directory.refresh(repository)
+    assert repository.calls == [None, started - TenantDirectory.REFRESH_OVERLAP]
+    assert directory.by_domain("globex.test") is globex
+    assert directory.stats()["tenants"] == 2
+
+
+def test_tenant_directory_invalidate_and_footprint():
+    directory = TenantDirectory(refresh_interval=60)
+    tenant = Tenant(name="Acme", domain="acme.test")
+    directory.apply([tenant])
+    assert directory.stats()["memory_bytes"] > 0
+
+    renamed = tenant.model_copy(update={"domain": "acme.example"})
+    directory.apply([renamed])
+    assert directory.by_domain("acme.test") is None
+    assert directory.by_domain("acme.example") is renamed
+
+    directory.invalidate(tenant.id)
+    assert directory.by_id(tenant.id) is None
+    stats = directory.stats()
+    assert stats["tenants"] == 0
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
@@ -58,4 +58,23 @@ api.interceptors.response.use(
   }
 );
 
+/**
+ * Fetch every page of a paginated listing by following the X-Next-Cursor header
+ * @param {string} url - The listing endpoint
+ * @param {Object} params - Extra query parameters, e.g. limit
+ * @returns {Promise<Array>} - Items from all pages
+ */
+export const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const response = await api.get(url, { params: cursor ? { ...params, cursor } : params });
+    if (Array.isArray(response.data)) {
+      items.push(...response.data);
+    }
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return items;
+};
+
 export default api;
@@ -1,4 +1,4 @@
-import api from './api';
+import api, { getAllPages } from './api';
 
 /**
  * Get all projects for the current user
@@ -6,8 +6,8 @@ import api from './api';
  */
 export const getProjects = async () => {
   try {
-    const response = await api.get('/projects/');
-    return Array.isArray(response.data) ? response.data : [];
+    // The listing is paginated; follow X-Next-Cursor until the last page
+    return await getAllPages('/projects/');
   } catch (error) {
     console.error('Error fetching projects:', error);
     throw enhanceError(error, 'fetch projects');
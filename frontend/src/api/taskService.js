@@ -1,4 +1,4 @@
-import api from './api';
+import api, { getAllPages } from './api';
 
 /**
  * Get all tasks for a project
@@ -7,8 +7,8 @@ import api from './api';
  */
 export const getTasks = async (projectId) => {
   try {
-    const response = await api.get(`/projects/${projectId}/tasks/`);
-    return response.data || [];
+    // The listing is paginated; follow X-Next-Cursor until the last page
+    return await getAllPages(`/projects/${projectId}/tasks/`);
   } catch (error) {
     console.error(`Error fetching tasks for project ${projectId}:`, error);
     throw enhanceError(error, 'fetch tasks');